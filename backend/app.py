@@ -7,14 +7,10 @@ import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
+# quiet the TensorFlow/MediaPipe native logs through the environment, so the ML
+# stacks are only imported once a route that needs them is used
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-try:
-    import absl.logging
-    absl.logging.set_verbosity(absl.logging.ERROR)
-    import tensorflow as tf
-    tf.get_logger().setLevel('ERROR')
-except Exception:
-    pass
+os.environ.setdefault('GLOG_minloglevel', '2')
 
 app = Flask(__name__)
 
@@ -52,6 +48,9 @@ def home():
     return "Server running!"
 
 if __name__ == "__main__":
+    from services.voice_warmup import start_warmup
+    # import and build the voice stack now, so /voice/start does not have to
+    start_warmup()
     print("🚀 Starting Flask-SocketIO server on http://127.0.0.1:5000")
     print("\n📋 Registered routes:")
     for rule in app.url_map.iter_rules():
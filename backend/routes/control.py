@@ -1,9 +1,10 @@
 from flask import Blueprint, jsonify
 import threading
-from services import pure_eye_calibrator
+import time
 from utils.feature_flags import is_enabled
-import cv2,time
-from services import volume_control
+
+# service modules pull in OpenCV, MediaPipe, pycaw and the voice stack, so each
+# one is imported inside the routes that use it rather than when the server boots
 
 bp = Blueprint("control", __name__)
 
@@ -58,6 +59,7 @@ def eye_start():
     
     try:
         try:
+            from services import pure_eye_calibrator
             print("🔧 Running calibration before starting eye tracker...")
             calib_file = pure_eye_calibrator.run_pure_eye_calibration()
             if not calib_file:
@@ -190,6 +192,7 @@ def eye_stop():
 def eye_calibrate():
     if not is_enabled("eye_control"):
         return jsonify({"error": "Eye control disabled"}), 403
+    from services import pure_eye_calibrator
     threading.Thread(target=pure_eye_calibrator.run_pure_eye_calibration, daemon=True).start()
     return jsonify({"status": "Eye calibration started"})
 
@@ -203,37 +206,6 @@ def run_volume_control():
         import traceback
         traceback.print_exc()
 
-screenshot_running = True
-cap = None
-hands = None
-
-def run_screenshot_control():
-    global screenshot_running
-    last_time = 0
-    cooldown = 2
-    while screenshot_running:
-        success, img = cap.read()
-        if not success:
-            break
-
-        img = cv2.flip(img, 1)
-        results = hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
-
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                lm_list = [[i, int(lm.x*640), int(lm.y*480)]
-                           for i, lm in enumerate(hand_landmarks.landmark)]
-                if len(lm_list) == 21:
-                    fingers = fingers_up(lm_list)
-                    if sum(fingers) == 5 and time.time() - last_time > cooldown:
-                        take_screenshot()
-                        last_time = time.time()
-        time.sleep(0.01)
-
-    cap.release()
-    cv2.destroyAllWindows()
-    print("✓ Screenshot control stopped")
-
 gesture_threads = {
     "volume": None,
     "screenshot": None,
@@ -247,6 +219,7 @@ def volume_start():
         volume_stop()
         time.sleep(0.1)
 
+    from services import volume_control
     gesture_threads["volume"] = threading.Thread(target=volume_control.start_volume_control, daemon=True)
     gesture_threads["volume"].start()
     return jsonify({"status": "Volume control started - camera initializing"})
@@ -255,9 +228,11 @@ def volume_start():
 def volume_stop():
     global gesture_threads
 
-    volume_control.stop_volume_control()
-
-    time.sleep(0.1)
+    # nothing to stop if volume control was never started in this process
+    if gesture_threads["volume"] is not None:
+        from services import volume_control
+        volume_control.stop_volume_control()
+        time.sleep(0.1)
     gesture_threads["volume"] = None
     return jsonify({"status": "Volume control stopped"})
 
@@ -304,27 +279,30 @@ def run_voice_controller(voice_controller):
     finally:
         print(">>> Voice controller thread ended")
         global controllers
-        controllers["voice"] = None
+        # a newer session may already have replaced this one
+        if controllers["voice"] is voice_controller:
+            controllers["voice"] = None
 
 @bp.route("/voice/start", methods=["POST"])
 def voice_start():
-    from services.voice_assistant import VoiceAssistant
+    from services.voice_warmup import start_warmup, VoiceSession
     global controllers
 
     if controllers["voice"] is not None:
         voice_stop_internal()
-        import time
-        time.sleep(0.3)
 
     try:
-        assistant = VoiceAssistant(silent_mode=True)
-        controllers["voice"] = assistant
+        # the assistant is built on the session thread, from modules the warmup has already imported
+        warmup = start_warmup()
+        session = VoiceSession(lambda: warmup.create_assistant(silent_mode=True))
+        controllers["voice"] = session
 
-        threading.Thread(target=run_voice_controller, args=(assistant,), daemon=True).start()
+        threading.Thread(target=run_voice_controller, args=(session,), daemon=True).start()
         return jsonify({
             "status": "Voice control started (full assistant mode)", 
             "voice_active": True,
             "mode": "full_assistant",
+            "warm": warmup.done.is_set(),
             "features": "Browser control + System-wide control (apps, files, windows, system info)"
         })
     except Exception as e:
@@ -13,11 +13,18 @@ from dataclasses import dataclass
 from typing import Tuple, List, Optional
 import json
 
+try:
+    from .camera_pipeline import CameraFrameSource, FrameRateGovernor, FrameWorkspace
+except ImportError:
+    from camera_pipeline import CameraFrameSource, FrameRateGovernor, FrameWorkspace
+
 
 pyautogui.FAILSAFE = False
 pyautogui.PAUSE = 0  
 
 should_stop = False
+idle_timeout = 5.0
+idle_fps = 4.0
 
 @dataclass
 class GazePoint:
@@ -176,6 +183,7 @@ class AdvancedEyeTracker:
         
         self.fps_counter = deque(maxlen=30)
         self.accuracy_buffer = deque(maxlen=100)
+        self.power_governor = None
         
         
         self.mouse_smoothing = 0.4 if self.is_calibrated else 0.3  
@@ -1183,7 +1191,8 @@ class AdvancedEyeTracker:
             'calibrated': self.is_calibrated,
             'tracking_mode': 'Pure Eye Movement' if self.is_calibrated else 'Head + Eye Movement',
             'cursor_control_enabled': self.cursor_control_enabled,
-            'screen_engagement': self.estimate_screen_engagement() if len(self.gaze_history) >= 10 else True
+            'screen_engagement': self.estimate_screen_engagement() if len(self.gaze_history) >= 10 else True,
+            'power': self.power_governor.get_metrics() if self.power_governor else None
         }
     
     def save_usage_data(self, filename: str = "New_advanced_eye_tracking_session.json"):
@@ -1242,7 +1251,8 @@ class AdvancedEyeTracker:
             "calibrated": self.is_calibrated,
             "tracking_mode": "Pure Eye Movement" if self.is_calibrated else "Basic Head Tracking",
             "cursor_control_enabled": self.cursor_control_enabled,
-            "screen_engagement": screen_engagement
+            "screen_engagement": screen_engagement,
+            "power": self.power_governor.get_metrics() if self.power_governor else None
         },
         "session_duration": time.time() - getattr(self, "session_start_time", 0),
         "screen_resolution": [self.screen_w, self.screen_h]
@@ -1266,15 +1276,15 @@ def create_advanced_eye_tracking_demo():
     except Exception:
         pass
     
-    cap = cv2.VideoCapture(0)
-    if not cap.isOpened():
+    cap = CameraFrameSource(0, 640, 480, fps=30)
+    if not cap.open():
+        cap.release()
         print("❌ Error: Could not open camera")
         print("   Please check if camera is connected and not being used by another application")
         return
     
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    cap.set(cv2.CAP_PROP_FPS, 30)
+    governor = FrameRateGovernor(active_fps=30, idle_fps=idle_fps, idle_after=idle_timeout)
+    tracker.power_governor = governor
     
     print("✅ Camera initialized successfully")
     print("🖱️  PyAutoGUI failsafe disabled for smooth mouse control")
@@ -1321,13 +1331,24 @@ def create_advanced_eye_tracking_demo():
         
         print("✅ MediaPipe Face Mesh initialized successfully")
         
+        try:
+            face_detector = mp.solutions.face_detection.FaceDetection(
+                model_selection=0,
+                min_detection_confidence=0.5
+            )
+        except Exception as e:
+            print(f"⚠️ Face detection unavailable, idle mode will keep using Face Mesh: {e}")
+            face_detector = None
+        
     except ImportError:
         print("❌ MediaPipe not available - using demo mode")
         print("   Install MediaPipe with compatible Python version to enable full functionality")
         face_mesh = None
+        face_detector = None
     except Exception as e:
         print(f"❌ MediaPipe error: {e}")
         face_mesh = None
+        face_detector = None
         
         while True:
             frame_count += 1
@@ -1365,25 +1386,44 @@ def create_advanced_eye_tracking_demo():
         print("🎥 Starting camera capture...")
         global should_stop
         should_stop = False 
+        workspace = FrameWorkspace()
+        seq = 0
         
         while True:
             if should_stop:
                 print("🛑 Stop flag detected, exiting...")
                 break
                 
-            ret, frame = cap.read()
-            if not ret:
-                print("❌ Failed to read from camera")
-                break
+            governor.pace()
+            seq, frame = cap.wait_frame(seq)
+            if frame is None:
+                if not cap.isOpened():
+                    print("❌ Failed to read from camera")
+                    break
+                continue
             
             frame_count += 1
             frame_time = time.time()
             
             if mirror_camera:
-                frame = cv2.flip(frame, 1)
-            
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frame = workspace.mirror(frame)
+            
+            if governor.idle and face_detector is not None:
+                detection = face_detector.process(workspace.to_rgb(workspace.downscale(frame, 0.25), "rgb_small"))
+                if not detection.detections:
+                    governor.mark_presence(False)
+                    cv2.putText(frame, f"Idle - waiting for a face ({governor.target_fps:.0f} fps)", 
+                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+                    cv2.imshow('Eye Tracking', frame)
+                    if cv2.waitKey(1) & 0xFF == 27:
+                        print("👋 Exiting...")
+                        break
+                    continue
+                governor.mark_presence(True)
+            
+            rgb_frame = workspace.to_rgb(frame)
             results = face_mesh.process(rgb_frame)
+            governor.mark_presence(bool(results.multi_face_landmarks))
             
             if results.multi_face_landmarks:
                 landmarks = results.multi_face_landmarks[0]
@@ -1622,6 +1662,8 @@ def create_advanced_eye_tracking_demo():
         
         should_stop = False
         cap.release()
+        if face_detector is not None:
+            face_detector.close()
         cv2.destroyAllWindows()
         tracker.save_usage_data()
         print("✅ Advanced Eye Tracking completed")
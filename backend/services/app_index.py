@@ -0,0 +1,260 @@
+"""
+Persistent index of installed applications for `SystemController.launch_app`.
+Executables under the configured roots are indexed once in a background
+thread and saved to disk with each directory's mtime; later refreshes only
+re-list directories whose mtime changed. Lookups are in memory.
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    from .fuzzy_matcher import FuzzyMatcher
+except ImportError:
+    from fuzzy_matcher import FuzzyMatcher
+
+DEFAULT_APP_ROOTS = [
+    r"C:\Program Files",
+    r"C:\Program Files (x86)",
+    r"C:\Users\{}\AppData\Local\Programs".format(os.getenv('USERNAME', '')),
+    r"C:\Users\{}\AppData\Roaming".format(os.getenv('USERNAME', '')),
+]
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".eye_control", "app_index.json")
+# installers, uninstallers and updaters sit next to the real executable and are never launched by name
+HELPER_EXECUTABLE = re.compile(r"^(?:unins|uninstall|setup|update)", re.IGNORECASE)
+
+
+def _compact(name):
+    return re.sub(r"[^a-z0-9]+", "", name.lower())
+
+
+class AppIndex:
+    """Maps app names to executable paths.
+
+    Each executable is indexed under its file stem ("chrome") and the name of
+    its folder ("microsoft vs code"); installer helpers are left out. Under a
+    folder name, executables named like the folder come first. `find` tries an exact name, then a
+    prefix, then a substring and finally a fuzzy match.
+    """
+
+    def __init__(self, roots, index_path=None, extensions=(".exe",), refresh_interval=3600.0):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.index_path = index_path
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.refresh_interval = refresh_interval
+        self.ready = threading.Event()
+        self._dirs = {}
+        self._apps = {}
+        self._names = []
+        self._matcher = FuzzyMatcher(min_score=0.8)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_env(cls):
+        """Index over APP_INDEX_ROOTS (os.pathsep-separated) saved at APP_INDEX_PATH"""
+        roots = os.getenv("APP_INDEX_ROOTS")
+        return cls(roots.split(os.pathsep) if roots else DEFAULT_APP_ROOTS,
+                   os.getenv("APP_INDEX_PATH", DEFAULT_INDEX_PATH))
+
+    def load(self):
+        """Load the saved index; returns False when missing or built for other roots"""
+        if not self.index_path or not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read app index: {e}")
+            return False
+        if data.get("roots") != self.roots or data.get("extensions") != list(self.extensions):
+            return False
+        with self._lock:
+            self._dirs = {path: tuple(entry) for path, entry in data["dirs"].items()}
+            self._rebuild_lookup()
+        self.ready.set()
+        return True
+
+    def save(self):
+        if not self.index_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"roots": self.roots, "extensions": list(self.extensions), "dirs": self._dirs}, f)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"⚠️ Could not save app index: {e}")
+
+    def _scan_dir(self, path, mtime):
+        subdirs, apps = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.name.lower().endswith(self.extensions):
+                            apps.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return mtime, subdirs, apps
+
+    def refresh(self):
+        """Re-list only directories whose mtime changed; returns how many were re-listed"""
+        dirs = {}
+        rescanned = 0
+        stack = [root for root in self.roots if os.path.isdir(root)]
+        while stack and not self._stop.is_set():
+            path = stack.pop()
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            entry = self._dirs.get(path)
+            if entry is None or entry[0] != mtime:
+                entry = self._scan_dir(path, mtime)
+                rescanned += 1
+            dirs[path] = entry
+            stack.extend(os.path.join(path, name) for name in entry[1])
+        if self._stop.is_set():
+            return rescanned
+
+        removed = len(self._dirs.keys() - dirs.keys())
+        with self._lock:
+            self._dirs = dirs
+            self._rebuild_lookup()
+        if rescanned or removed:
+            self.save()
+        self.ready.set()
+        return rescanned
+
+    def _rebuild_lookup(self):
+        apps = {}
+        for path, (_, _, files) in self._dirs.items():
+            folder = os.path.basename(path).lower()
+            for name in files:
+                stem = os.path.splitext(name)[0].lower()
+                if HELPER_EXECUTABLE.match(stem):
+                    continue
+                full_path = os.path.join(path, name)
+                apps.setdefault(stem, []).append((0, full_path))
+                # "audacity" -> audacity.exe, "mozilla firefox" -> firefox.exe before their siblings
+                apps.setdefault(folder, []).append((0 if _compact(stem) in _compact(folder) else 1, full_path))
+        # then the shallowest, shortest path is usually the main executable
+        for key, entries in apps.items():
+            entries.sort(key=lambda e: (e[0], e[1].count(os.sep), len(e[1])))
+            apps[key] = [p for _, p in entries]
+        self._apps = apps
+        self._names = sorted(apps)
+        self._matcher = FuzzyMatcher(self._names, min_score=0.8)
+
+    def find(self, app_name, timeout=0.0):
+        """Best executable for `app_name`, or None; waits up to `timeout` for the first build"""
+        if not self.ready.is_set() and timeout:
+            self.ready.wait(timeout)
+        key = app_name.lower().strip()
+        with self._lock:
+            apps, names, matcher = self._apps, self._names, self._matcher
+        if not key:
+            return None
+        if key in apps:
+            return apps[key][0]
+
+        start = bisect.bisect_left(names, key)
+        if start < len(names) and names[start].startswith(key):
+            return apps[names[start]][0]
+
+        contained = [name for name in names if key in name]
+        if contained:
+            return apps[min(contained, key=len)][0]
+
+        match, _ = matcher.match(key)
+        return apps[match][0] if match else None
+
+    def start(self):
+        """Load the saved index, then refresh it in the background every `refresh_interval`"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        self.load()
+        while not self._stop.is_set():
+            started = time.time()
+            try:
+                rescanned = self.refresh()
+                print(f"📇 App index: {len(self._apps)} names, {rescanned} folders rescanned "
+                      f"in {time.time() - started:.1f}s")
+            except Exception as e:
+                print(f"⚠️ App index refresh failed: {e}")
+            self._stop.wait(self.refresh_interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+def _demo(apps=2000, folders_per_app=20):
+    """Build, reload, refresh and query an index over a synthetic Program Files tree"""
+    import random
+    import shutil
+    import tempfile
+
+    rng = random.Random(5)
+    base = tempfile.mkdtemp(prefix="app_index_")
+    root = os.path.join(base, "Program Files")
+    try:
+        names = [f"app{i:04d}" for i in range(apps)] + ["chrome", "spotify", "code"]
+        for name in names:
+            app_dir = os.path.join(root, "Microsoft VS Code") if name == "code" else os.path.join(root, f"Vendor {name}", name)
+            for j in range(folders_per_app):
+                os.makedirs(os.path.join(app_dir, f"lib{j}"), exist_ok=True)
+                open(os.path.join(app_dir, f"lib{j}", f"data{j}.dll"), "w").close()
+            open(os.path.join(app_dir, f"{name}.exe"), "w").close()
+            open(os.path.join(app_dir, "lib0", f"{name}_helper.exe"), "w").close()
+
+        index_path = os.path.join(base, "app_index.json")
+        index = AppIndex([root], index_path)
+        start = time.perf_counter()
+        index.refresh()
+        print(f"📊 cold build: {time.perf_counter() - start:.2f}s over {len(index._dirs)} folders")
+
+        reloaded = AppIndex([root], index_path)
+        start = time.perf_counter()
+        reloaded.load()
+        print(f"📊 load from disk: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        rescanned = reloaded.refresh()
+        print(f"📊 refresh, nothing changed: {time.perf_counter() - start:.2f}s ({rescanned} folders re-listed)")
+
+        new_dir = os.path.join(root, "Vendor discord", "discord")
+        os.makedirs(new_dir)
+        open(os.path.join(new_dir, "discord.exe"), "w").close()
+        start = time.perf_counter()
+        rescanned = reloaded.refresh()
+        print(f"📊 refresh after install: {time.perf_counter() - start:.2f}s ({rescanned} folders re-listed)")
+
+        queries = ["chrome", "spot", "vs code", "discrod", f"app{rng.randrange(apps):04d}"]
+        start = time.perf_counter()
+        for _ in range(200):
+            results = [reloaded.find(q) for q in queries]
+        print(f"📊 lookup: {1e6 * (time.perf_counter() - start) / (200 * len(queries)):.0f} µs")
+        for query, result in zip(queries, results):
+            print(f"   '{query}' → {os.path.relpath(result, root) if result else None}")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    _demo()
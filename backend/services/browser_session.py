@@ -0,0 +1,282 @@
+"""
+Persistent WebDriver session for the browser voice commands.
+Chrome is launched by the first command that needs it (open, search, new
+tab) and then reused. If the user closes the window it is not reopened
+behind their back; the next such command opens a new one. The session
+never closes the browser on its own: Chrome is started detached and only
+`quit()` (the "close browser" command) shuts it. Navigation, search, tab
+and scroll commands are sent straight to the driver; callers fall back to
+keystroke macros only when no session is available.
+"""
+
+import os
+import threading
+import time
+from urllib.parse import quote_plus
+
+try:
+    from selenium.common.exceptions import WebDriverException
+    SELENIUM_AVAILABLE = True
+except ImportError:
+    WebDriverException = Exception
+    SELENIUM_AVAILABLE = False
+
+GOOGLE_HOME = "https://www.google.com"
+GOOGLE_SEARCH = "https://www.google.com/search?q={}"
+
+
+def browser_session_enabled():
+    return SELENIUM_AVAILABLE and os.getenv("BROWSER_SESSION", "1").lower() in ("1", "true", "yes", "on")
+
+
+class BrowserSession:
+    """Owns one WebDriver created by `driver_factory` (returns a driver or None).
+
+    Every command method returns False without doing anything when there is
+    no live session, so callers can use it as `if not session.back(): ...`.
+    With `launch_on_demand`, navigate, search and new_tab first launch the
+    browser, waiting up to `launch_timeout` seconds for it. Commands are
+    serialised with a lock because a WebDriver is not safe to share between
+    threads.
+    """
+
+    def __init__(self, driver_factory, start_url=GOOGLE_HOME, launch_on_demand=True, launch_timeout=30):
+        self.driver_factory = driver_factory
+        self.start_url = start_url
+        self.launch_on_demand = launch_on_demand
+        self.launch_timeout = launch_timeout
+        self.ready = threading.Event()
+        self._launched_event = threading.Event()
+        self._driver = None
+        self._closed = False
+        self._launching = False
+        self._launch_failed = False
+        self._lock = threading.RLock()
+
+    def start(self):
+        """Launch the browser on a background thread; returns immediately"""
+        with self._lock:
+            if self._driver is not None or self._launching:
+                return
+            self._closed = False
+            self._launching = True
+            self._launched_event.clear()
+        threading.Thread(target=self._launch, daemon=True).start()
+
+    def _launch(self):
+        started = time.time()
+        driver = None
+        try:
+            driver = self.driver_factory()
+            if driver is not None and self.start_url:
+                driver.get(self.start_url)
+        except Exception as e:
+            print(f"⚠️ Browser session failed to start: {e}")
+            driver = None
+        with self._lock:
+            self._launching = False
+            self._launch_failed = driver is None
+            self._launched_event.set()
+            if driver is None:
+                return
+            if self._closed:
+                driver.quit()
+                return
+            self._driver = driver
+            self.ready.set()
+        print(f"🌐 Browser session ready in {time.time() - started:.1f}s")
+
+    def wait(self, timeout=None):
+        return self.ready.wait(timeout)
+
+    @property
+    def driver(self):
+        """The live driver, or None once the user has closed the window"""
+        with self._lock:
+            driver = self._driver
+            if driver is None:
+                return None
+            try:
+                driver.current_window_handle
+                return driver
+            except WebDriverException:
+                pass
+            # the active tab is gone; another tab of the same window may still be open
+            try:
+                handles = driver.window_handles
+                if handles:
+                    driver.switch_to.window(handles[-1])
+                    return driver
+            except WebDriverException:
+                pass
+            self._driver = None
+            self.ready.clear()
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        print("⚠️ Browser session window was closed")
+        return None
+
+    def _launched(self):
+        """The live driver, launching the browser first if the session allows it"""
+        driver = self.driver
+        # a browser that failed to start once is not retried on every command
+        if driver is None and self.launch_on_demand and not self._launch_failed:
+            self.start()
+            if self._launched_event.wait(self.launch_timeout):
+                driver = self.driver
+        return driver
+
+    def _run(self, command, launch=False):
+        driver = self._launched() if launch else None
+        with self._lock:
+            driver = driver or self.driver
+            if driver is None:
+                return False
+            try:
+                command(driver)
+                return True
+            except WebDriverException as e:
+                print(f"⚠️ Browser session command failed: {e}")
+                return False
+
+    def navigate(self, url):
+        return self._run(lambda driver: driver.get(url), launch=True)
+
+    def search(self, query):
+        return self.navigate(GOOGLE_SEARCH.format(quote_plus(query)))
+
+    def new_tab(self, url=None):
+        def command(driver):
+            driver.switch_to.new_window("tab")
+            if url:
+                driver.get(url)
+        return self._run(command, launch=True)
+
+    def close_tab(self):
+        """Close the active tab unless it is the last one"""
+        with self._lock:
+            driver = self.driver
+            try:
+                if driver is None or len(driver.window_handles) < 2:
+                    return False
+            except WebDriverException:
+                return False
+
+            def command(driver):
+                driver.close()
+                driver.switch_to.window(driver.window_handles[-1])
+            return self._run(command)
+
+    def back(self):
+        return self._run(lambda driver: driver.back())
+
+    def scroll(self, pages):
+        """Scroll by `pages` viewport heights; negative scrolls up"""
+        return self._run(lambda driver: driver.execute_script(
+            "window.scrollBy(0, window.innerHeight * arguments[0]);", pages))
+
+    def current_url(self):
+        driver = self.driver
+        if driver is None:
+            return None
+        try:
+            return driver.current_url
+        except WebDriverException:
+            return None
+
+    def owns_window(self, window_title):
+        """Whether a top-level window title belongs to the session's active tab"""
+        driver = self.driver
+        if driver is None or not window_title:
+            return False
+        try:
+            title = driver.title
+        except WebDriverException:
+            return False
+        return bool(title) and window_title.startswith(title)
+
+    def quit(self):
+        """Close the browser for good; `start` opens a new one"""
+        with self._lock:
+            self._closed = True
+            driver, self._driver = self._driver, None
+            self.ready.clear()
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        return driver is not None
+
+
+def _keystroke_search_floor(query):
+    """Seconds `_search_with_pyautogui` spends in fixed sleeps, with the first focus succeeding"""
+    return 1.0 + 1.5 + 1.0 + 0.5 + 0.08 * len(query) + 1.0
+
+
+def _benchmark(pages=20):
+    """Command-to-page-load latency through a warm session, served from a local HTTP server"""
+    if not SELENIUM_AVAILABLE:
+        print("⚠️ selenium is not installed; nothing to measure")
+        return
+    import functools
+    import http.server
+    import shutil
+    import statistics
+    import tempfile
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    site = tempfile.mkdtemp(prefix="browser_session_")
+    for i in range(pages):
+        with open(os.path.join(site, f"page{i}.html"), "w") as f:
+            f.write(f"<html><head><title>Page {i}</title></head><body>" +
+                    "<p>lorem ipsum dolor sit amet</p>" * 2000 + "</body></html>")
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=site))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def headless_chrome():
+        options = Options()
+        options.add_argument("--headless=new")
+        options.page_load_strategy = "eager"
+        return webdriver.Chrome(options=options)
+
+    session = BrowserSession(headless_chrome, start_url=f"{base}/page0.html")
+    try:
+        started = time.perf_counter()
+        session.start()
+        if not session.wait(60):
+            print("❌ Chrome did not start")
+            return
+        print(f"🚀 Cold start (paid once, in the background): {time.perf_counter() - started:.2f}s")
+
+        timings = {"navigate": [], "new tab": [], "back": [], "scroll": []}
+        for i in range(1, pages):
+            for label, command in (("navigate", lambda: session.navigate(f"{base}/page{i}.html")),
+                                   ("scroll", lambda: session.scroll(1)),
+                                   ("back", session.back),
+                                   ("new tab", lambda: session.new_tab(f"{base}/page{i}.html"))):
+                start = time.perf_counter()
+                command()
+                timings[label].append(time.perf_counter() - start)
+            session.close_tab()
+        for label, values in timings.items():
+            print(f"📊 {label:>8}: median {statistics.median(values) * 1000:6.1f} ms, "
+                  f"max {max(values) * 1000:6.1f} ms")
+        query = "weather in bangalore tomorrow"
+        print(f"⌨️ Keystroke search for '{query}': at least {_keystroke_search_floor(query):.2f}s of fixed sleeps")
+    finally:
+        session.quit()
+        server.shutdown()
+        shutil.rmtree(site, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    _benchmark()
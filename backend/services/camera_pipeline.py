@@ -0,0 +1,284 @@
+"""
+Frame-driven scheduling shared by the camera services.
+Capture runs on its own thread and signals each frame arrival; gesture and
+tracking loops wait on that signal instead of sleeping for a fixed interval.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class CameraFrameSource:
+    """Reads frames on a background thread and keeps only the newest one.
+
+    `source` is a camera index or the path of a recorded video. Recorded videos
+    are replayed at their own frame rate so loops see camera-like timing.
+    Frames are read into a ring of three reusable buffers: the newest frame,
+    the one the consumer is holding and the one being filled. A frame returned
+    by `wait_frame` stays valid until the next `wait_frame` call.
+    """
+
+    def __init__(self, source=0, width=640, height=480, fps=None):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.cap = None
+        self._buffers = [None, None, None]
+        self._latest = None
+        self._in_use = None
+        self._seq = 0
+        self._running = False
+        self._thread = None
+        self._condition = threading.Condition()
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            return False
+        if not isinstance(self.source, str):
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+            if self.fps:
+                self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened() and self._running
+
+    def _capture_loop(self):
+        replay_interval = 0.0
+        if isinstance(self.source, str):
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+            replay_interval = 1.0 / fps
+        next_frame_time = time.time()
+
+        while self._running:
+            with self._condition:
+                index = next(i for i in range(len(self._buffers))
+                             if i != self._latest and i != self._in_use)
+            buffer = self._buffers[index]
+            ret, frame = self.cap.read(buffer) if buffer is not None else self.cap.read()
+            if not ret:
+                break
+            if replay_interval:
+                next_frame_time += replay_interval
+                delay = next_frame_time - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            with self._condition:
+                self._buffers[index] = frame
+                self._latest = index
+                self._seq += 1
+                self._condition.notify_all()
+
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+    def wait_frame(self, last_seq=0, timeout=1.0):
+        """Block until a frame newer than `last_seq` arrives; returns (seq, frame)"""
+        with self._condition:
+            if self._seq == last_seq and self._running:
+                self._condition.wait(timeout)
+            if self._seq == last_seq:
+                return last_seq, None
+            self._in_use = self._latest
+            return self._seq, self._buffers[self._in_use]
+
+    def release(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+
+class FrameRateGovernor:
+    """Caps how often a loop processes frames.
+
+    Runs at `active_fps` while something is being tracked, drops to `idle_fps`
+    after `idle_after` seconds without presence and snaps back to the full
+    rate on the first frame where presence returns. Wall time and process CPU
+    time are accumulated per state for `get_metrics`.
+    """
+
+    def __init__(self, active_fps=30.0, idle_fps=5.0, idle_after=3.0):
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.last_presence = time.time()
+        self._last_tick = 0.0
+
+        self.state = "active"
+        self.state_time = {"active": 0.0, "idle": 0.0}
+        self.state_cpu = {"active": 0.0, "idle": 0.0}
+        self._state_since = time.time()
+        self._cpu_since = time.process_time()
+
+    @property
+    def idle(self):
+        return time.time() - self.last_presence > self.idle_after
+
+    @property
+    def target_fps(self):
+        return self.idle_fps if self.idle else self.active_fps
+
+    def _account(self):
+        now, cpu = time.time(), time.process_time()
+        self.state_time[self.state] += now - self._state_since
+        self.state_cpu[self.state] += cpu - self._cpu_since
+        self._state_since, self._cpu_since = now, cpu
+
+        state = "idle" if self.idle else "active"
+        if state != self.state:
+            print(f"💤 Camera loop {self.state} → {state} ({self.target_fps:.0f} fps)")
+            self.state = state
+
+    def mark_presence(self, present):
+        if present:
+            self.last_presence = time.time()
+        self._account()
+
+    def pace(self):
+        """Sleep only for whatever is left of the current frame budget"""
+        self._account()
+        now = time.time()
+        delay = self._last_tick + 1.0 / self.target_fps - now
+        if delay > 0:
+            time.sleep(delay)
+            now += delay
+        self._last_tick = now
+
+    def get_metrics(self):
+        self._account()
+        return {
+            "power_state": self.state,
+            "target_fps": self.target_fps,
+            "time_in_state": {k: round(v, 2) for k, v in self.state_time.items()},
+            "cpu_percent": {k: round(100.0 * self.state_cpu[k] / v, 1) if v else 0.0
+                            for k, v in self.state_time.items()},
+        }
+
+
+class FrameWorkspace:
+    """Preallocated destinations for the per-frame mirror and colour conversion.
+
+    Each named output is reused while the frame size stays the same, so the
+    loops stop allocating a flipped copy and an RGB copy on every frame.
+    Results are overwritten by the next call with the same name.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def _buffer(self, name, shape, dtype):
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = self._buffers[name] = np.empty(shape, dtype)
+        return buffer
+
+    def mirror(self, frame):
+        return cv2.flip(frame, 1, dst=self._buffer("mirror", frame.shape, frame.dtype))
+
+    def to_rgb(self, frame, name="rgb"):
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._buffer(name, frame.shape, frame.dtype))
+
+    def downscale(self, frame, factor=0.5):
+        h, w = frame.shape[:2]
+        shape = (int(h * factor), int(w * factor)) + frame.shape[2:]
+        dst = self._buffer("small", shape, frame.dtype)
+        return cv2.resize(frame, (shape[1], shape[0]), dst=dst, interpolation=cv2.INTER_AREA)
+
+
+def _benchmark(video_path, seconds=20):
+    """Process a recorded clip through the governor and report CPU use per state"""
+    import mediapipe as mp
+
+    hands = mp.solutions.hands.Hands(max_num_hands=1, min_detection_confidence=0.7,
+                                     min_tracking_confidence=0.5)
+    source = CameraFrameSource(video_path)
+    if not source.open():
+        print(f"❌ Could not open {video_path}")
+        return
+    governor = FrameRateGovernor()
+
+    seq = 0
+    end = time.time() + seconds
+    workspace = FrameWorkspace()
+    while time.time() < end and source.isOpened():
+        governor.pace()
+        seq, frame = source.wait_frame(seq)
+        if frame is None:
+            continue
+        frame = workspace.mirror(frame)
+        if governor.idle:
+            frame = workspace.downscale(frame)
+        results = hands.process(workspace.to_rgb(frame, "rgb_small" if governor.idle else "rgb"))
+        governor.mark_presence(bool(results.multi_hand_landmarks))
+
+    source.release()
+    hands.close()
+    metrics = governor.get_metrics()
+    for state, wall in metrics["time_in_state"].items():
+        print(f"📊 {state}: {wall:.1f}s, CPU {metrics['cpu_percent'][state]:.0f}%")
+
+
+def _allocation_benchmark(video_path, frames=300):
+    """Compare per-frame allocations and time of fresh copies vs. reused buffers"""
+    import tracemalloc
+
+    def run(pooled):
+        cap = cv2.VideoCapture(video_path)
+        workspace = FrameWorkspace()
+        frame = None
+        allocated = 0
+        count = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        while count < frames:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            if pooled:
+                ret, frame = cap.read(frame) if frame is not None else cap.read()
+                if not ret:
+                    break
+                rgb = workspace.to_rgb(workspace.mirror(frame))
+            else:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+            allocated += tracemalloc.get_traced_memory()[1] - base
+            count += 1
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+        cap.release()
+        return count, allocated, elapsed
+
+    for label, pooled in (("fresh copies", False), ("reused buffers", True)):
+        count, allocated, elapsed = run(pooled)
+        if count:
+            print(f"📊 {label}: {allocated / count / 1024:.0f} KiB allocated/frame, "
+                  f"{allocated / elapsed / 2**20:.1f} MiB/s, {1000 * elapsed / count:.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python camera_pipeline.py <recorded_clip.mp4> [seconds]")
+        print("       python camera_pipeline.py --alloc <recorded_clip.mp4> [frames]")
+    elif sys.argv[1] == "--alloc":
+        _allocation_benchmark(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 300)
+    else:
+        _benchmark(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 20)
@@ -0,0 +1,210 @@
+"""
+Single dispatch index for voice commands.
+Browser, system and assistant commands register their trigger phrases and
+patterns here; everything is compiled into one lookup so a command is routed
+with a dict hit for exact phrases or one regex search otherwise.
+"""
+
+import re
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def pattern_specificity(pattern: str) -> int:
+    """Number of literal characters a pattern requires to match"""
+    required = re.sub(r"\((?:\?:)?[^()]*\)\?", "", pattern)
+    required = re.sub(r"\[[^\]]*\]", "x", required)
+    required = re.sub(r"\((?:\?:)?([^()]*)\)", lambda m: min(m.group(1).split("|"), key=len), required)
+    required = re.sub(r"\\.", "", required)
+    return sum(c.isalnum() for c in required)
+
+
+def _phrase_pattern(phrase: str) -> str:
+    words = phrase.split()
+    if len(words) == 1:
+        # a lone word is too easily part of something else ("the back door")
+        return "^" + re.escape(words[0]) + "$"
+    return r"\b" + r"\s+".join(re.escape(word) for word in words) + r"\b"
+
+
+def _sample_command(pattern: str) -> str:
+    """A command the pattern should accept, for the conflict report"""
+    sample = re.sub(r"\\s[+*]", " ", pattern)
+    sample = re.sub(r"\\b|\^|\$", "", sample)
+    sample = re.sub(r"\[[^\]]*\]\*", " ", sample)
+    sample = re.sub(r"\[[^\]]*\]", "d", sample)
+    sample = sample.replace("(.+)", "notes").replace("(.*)", "notes").replace(r"(\d+)", "5").replace(".*", " ")
+    # innermost groups first: optional ones vanish, the rest keep their first alternative
+    while True:
+        reduced = re.sub(r"\((?:\?:)?([^()]*)\)(\?)?",
+                         lambda m: "" if m.group(2) else m.group(1).split("|")[0], sample)
+        if reduced == sample:
+            break
+        sample = reduced
+    sample = re.sub(r"\\(.)", r"\1", sample)
+    return re.sub(r"\s+", " ", sample).strip()
+
+
+class Command:
+    """One command and the triggers that route to it"""
+
+    def __init__(self, name: str, handler: Callable, owner: str, phrases, patterns, priority: int, order: int,
+                 guessable: bool = True):
+        self.name = name
+        self.handler = handler
+        self.owner = owner
+        self.phrases = [p.lower() for p in phrases]
+        self.patterns = list(patterns) + [_phrase_pattern(p) for p in self.phrases]
+        self.priority = priority
+        self.order = order
+        self.guessable = guessable
+
+    @property
+    def label(self) -> str:
+        return f"{self.owner}.{self.name}"
+
+
+class CommandRegistry:
+    """
+    Routes a command to the registered handler whose trigger matches best.
+
+    Ranking, deterministic for any input: the leftmost match wins; at the
+    same position a higher `priority` wins, then the trigger with the most
+    required literal text, then the command registered first. Phrases match
+    as whole words anywhere in the command, single-word phrases only as the
+    whole command. Handlers receive the match of
+    their own trigger (`match.string` is the full command).
+    """
+
+    def __init__(self):
+        self.commands: List[Command] = []
+        self._alternatives: List[Tuple[Command, "re.Pattern"]] = []
+        self._combined = None
+        self._exact: Dict[str, int] = {}
+
+    def register(self, name: str, handler: Callable, phrases=(), patterns=(), owner: str = "", priority: int = 0,
+                 guessable: bool = True):
+        """`guessable=False` keeps the command out of `known_phrases`, so only an exact trigger runs it"""
+        self.commands.append(Command(name, handler, owner, phrases, patterns, priority, len(self.commands), guessable))
+        self._combined = None
+
+    def compile(self):
+        entries = []
+        for command in self.commands:
+            for pattern in command.patterns:
+                entries.append((-command.priority, -pattern_specificity(pattern), command.order, pattern, command))
+        entries.sort(key=lambda entry: entry[:4])
+
+        self._alternatives = [(command, re.compile(pattern, re.IGNORECASE)) for *_, pattern, command in entries]
+        # triggers start on a word, so mid-word positions are rejected before trying any alternative
+        self._combined = re.compile(
+            r"(?<!\w)(?:" + "|".join(f"(?P<c{index}>{entry[3]})" for index, entry in enumerate(entries)) + ")",
+            re.IGNORECASE,
+        ) if entries else re.compile(r"(?!)")
+
+        # whole-command phrases are resolved once here, so the hot path is a dict lookup
+        self._exact = {}
+        for command in self.commands:
+            for phrase in command.phrases:
+                found = self._combined.search(phrase)
+                if found and found.start() == 0:
+                    self._exact[phrase] = int(found.lastgroup[1:])
+
+    def match(self, command: str) -> Tuple[Optional[Command], Optional["re.Match"]]:
+        if self._combined is None:
+            self.compile()
+        command = command.strip().lower()
+
+        index = self._exact.get(command)
+        if index is not None:
+            owner, pattern = self._alternatives[index]
+            return owner, pattern.match(command)
+
+        found = self._combined.search(command)
+        if not found:
+            return None, None
+        owner, pattern = self._alternatives[int(found.lastgroup[1:])]
+        return owner, pattern.match(command, found.start())
+
+    def dispatch(self, command: str):
+        """Run the best handler; returns (command, handler result) or (None, None)"""
+        owner, match = self.match(command)
+        if owner is None:
+            return None, None
+        return owner, owner.handler(match)
+
+    def known_phrases(self) -> List[str]:
+        """Every phrase the registry accepts verbatim: declared phrases plus
+        literal patterns, for fuzzy correction of misrecognised commands"""
+        phrases = []
+        for command in self.commands:
+            if not command.guessable:
+                continue
+            phrases.extend(command.phrases)
+            for pattern in command.patterns[:len(command.patterns) - len(command.phrases)]:
+                if "(." in pattern or "[" in pattern:
+                    continue
+                sample = _sample_command(pattern)
+                if sample and re.search(pattern, sample, re.IGNORECASE):
+                    phrases.append(sample)
+        return list(dict.fromkeys(phrases))
+
+    def conflicts(self) -> List[Tuple[str, Command, List[Command], Command]]:
+        """(sample, its command, other commands also triggered, winner) for every overlap"""
+        if self._combined is None:
+            self.compile()
+        report = []
+        for command in self.commands:
+            samples = list(command.phrases)
+            for pattern in command.patterns[:len(command.patterns) - len(command.phrases)]:
+                sample = _sample_command(pattern)
+                if sample and re.search(pattern, sample, re.IGNORECASE) and sample not in samples:
+                    samples.append(sample)
+            for sample in samples:
+                others = [other for other in self.commands if other is not command and
+                          any(re.search(p, sample, re.IGNORECASE) for p in other.patterns)]
+                if others:
+                    report.append((sample, command, others, self.match(sample)[0]))
+        return report
+
+    def print_conflict_report(self):
+        report = self.conflicts()
+        shadowed = [entry for entry in report if entry[3] is not entry[1]]
+        print(f"🔀 {len(report)} overlapping triggers, {len(shadowed)} resolved away from their own command")
+        for sample, command, others, winner in report:
+            mark = "⚠️" if winner is not command else "  "
+            print(f"{mark} '{sample}' ({command.label}) also matches "
+                  f"{', '.join(o.label for o in others)} → {winner.label if winner else None}")
+
+
+def _benchmark(registry: CommandRegistry, rounds=20000):
+    """Dispatch latency for exact phrases, parameterised commands and misses"""
+    registry.compile()
+    exact = list(registry._exact)
+    parameterised = ["open notepad", "search for cheap flights", "switch to spotify", "find quarterly report",
+                     "please scroll down a little", "open the d drive", "ask about this chart",
+                     "search meaning of serendipity", "shut down in 5 minutes", "go to downloads"]
+    misses = ["what time is it", "tell me a joke", "how tall is everest", "thanks"]
+
+    for label, commands in (("exact phrase", exact), ("parameterised", parameterised), ("no match", misses)):
+        start = time.perf_counter()
+        for i in range(rounds):
+            registry.match(commands[i % len(commands)])
+        elapsed = time.perf_counter() - start
+        print(f"📊 {label}: {1e6 * elapsed / rounds:.2f} µs/command")
+
+
+if __name__ == "__main__":
+    # python command_registry.py — conflict report and dispatch benchmark for the assistant's commands
+    from voice_assistant import VoiceAssistant
+    from voice_browser_control import VoiceBrowserController
+    from intent_router import IntentRouter
+
+    assistant = VoiceAssistant.__new__(VoiceAssistant)
+    assistant.intent_router = IntentRouter()
+    assistant.browser_controller = VoiceBrowserController.__new__(VoiceBrowserController)
+    registry = CommandRegistry()
+    assistant.register_commands(registry)
+    print(f"📋 {len(registry.commands)} commands registered")
+    registry.print_conflict_report()
+    _benchmark(registry)
@@ -0,0 +1,285 @@
+"""
+Background file-name index for the "search for" / "find" voice commands.
+The home folder (and other configured roots) is listed once with
+`os.scandir` in a background thread; later refreshes only re-list folders
+whose mtime changed. Names are kept as one lowercase text blob, so a
+prefix or substring query is a few `str.find` scans instead of a disk walk.
+"""
+
+import bisect
+import heapq
+import os
+import threading
+import time
+from array import array
+
+DEFAULT_FILE_ROOTS = [os.path.expanduser("~")]
+DEFAULT_EXCLUDES = {
+    "appdata", "node_modules", "__pycache__", "$recycle.bin", "system volume information",
+    "windows", "program files", "program files (x86)", "programdata",
+}
+
+# rank of a hit: whole name, start of the name, start of a word, anywhere
+EXACT, PREFIX, WORD, SUBSTRING = range(4)
+
+
+class FileIndex:
+    """Ranked name search over every file and folder under `roots`.
+
+    Each folder contributes one block of names to the blob, with folder names
+    suffixed by "/". Block start offsets are kept in a sorted array, so the
+    folder of any hit is a bisect away.
+    """
+
+    def __init__(self, roots, refresh_interval=300.0, exclude=DEFAULT_EXCLUDES, max_candidates=20000):
+        self.roots = [os.path.abspath(root) for root in roots]
+        self.refresh_interval = refresh_interval
+        self.exclude = {name.lower() for name in exclude}
+        self.max_candidates = max_candidates
+        self.ready = threading.Event()
+        self._dirs = {}
+        self._blob = "\n"
+        self._starts = array("l")
+        self._paths = []
+        self._blocks = []
+        self._depths = array("l")
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_env(cls):
+        """Index over FILE_INDEX_ROOTS (os.pathsep-separated), refreshed every FILE_INDEX_REFRESH seconds"""
+        roots = os.getenv("FILE_INDEX_ROOTS")
+        return cls(roots.split(os.pathsep) if roots else DEFAULT_FILE_ROOTS,
+                   float(os.getenv("FILE_INDEX_REFRESH", "300")))
+
+    def covers(self, path):
+        path = os.path.abspath(path)
+        return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in self.roots)
+
+    def _scan_dir(self, path, mtime):
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if "\n" in entry.name:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        else:
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        block = "\n".join(files + [name + "/" for name in subdirs])
+        walk = [name for name in subdirs if not name.startswith(".") and name.lower() not in self.exclude]
+        return mtime, block, walk
+
+    def refresh(self):
+        """Re-list only folders whose mtime changed; returns how many were re-listed"""
+        roots = set(self.roots)
+        dirs = {}
+        rescanned = 0
+        stack = [root for root in self.roots if os.path.isdir(root)]
+        while stack and not self._stop.is_set():
+            path = stack.pop()
+            if path in dirs:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            entry = self._dirs.get(path)
+            if entry is None or entry[0] != mtime:
+                entry = self._scan_dir(path, mtime)
+                rescanned += 1
+            dirs[path] = entry
+            # a root nested inside another root is walked once, as its own root
+            stack.extend(child for child in (os.path.join(path, name) for name in entry[2])
+                         if child not in roots)
+        if self._stop.is_set():
+            return rescanned
+
+        removed = len(self._dirs.keys() - dirs.keys())
+        if rescanned or removed or not self.ready.is_set():
+            self._dirs = dirs
+            self._rebuild()
+        self.ready.set()
+        return rescanned
+
+    def _rebuild(self):
+        parts, starts, paths, blocks, depths = [], array("l"), [], [], array("l")
+        offset = 1
+        for path, (_, block, _) in self._dirs.items():
+            lower = block.lower()
+            starts.append(offset)
+            parts.append(lower)
+            paths.append(path)
+            blocks.append(block)
+            depths.append(path.count(os.sep))
+            offset += len(lower) + 1
+        blob = "\n" + "\n".join(parts) + "\n"
+        with self._lock:
+            self._blob, self._starts, self._paths, self._blocks, self._depths = blob, starts, paths, blocks, depths
+
+    @staticmethod
+    def _prefix_rank(blob, end):
+        after = blob[end]
+        return EXACT if after == "\n" or (after == "/" and blob[end + 1] == "\n") else PREFIX
+
+    def search(self, query, limit=10, kind=None, under=None, timeout=0.0):
+        """Best paths for `query`, ranked whole name > prefix > word start > substring,
+        then shallower and shorter. `kind` is "file" or "folder"; `under` restricts
+        results to one folder. Waits up to `timeout` for the first build."""
+        if not self.ready.is_set() and timeout:
+            self.ready.wait(timeout)
+        query = query.strip().lower()
+        if not query or "\n" in query or "/" in query:
+            return []
+        with self._lock:
+            blob, starts, paths, blocks, depths = self._blob, self._starts, self._paths, self._blocks, self._depths
+        prefix = os.path.abspath(under).rstrip(os.sep) + os.sep if under else None
+
+        hits = {}
+        pos = blob.find(query)
+        while pos != -1 and len(hits) < self.max_candidates:
+            before = blob[pos - 1]
+            if before == "\n":
+                hits[pos] = self._prefix_rank(blob, pos + len(query))
+            else:
+                hits.setdefault(blob.rfind("\n", 0, pos) + 1, WORD if not before.isalnum() else SUBSTRING)
+            pos = blob.find(query, pos + 1)
+        if pos != -1:
+            # too many hits to rank them all; keep every name that starts with the query
+            needle = "\n" + query
+            pos = blob.find(needle)
+            while pos != -1:
+                hits[pos + 1] = self._prefix_rank(blob, pos + len(needle))
+                pos = blob.find(needle, pos + 1)
+
+        ranked = []
+        for start, rank in hits.items():
+            end = blob.find("\n", start)
+            is_dir = blob[end - 1] == "/"
+            if kind == "file" and is_dir or kind == "folder" and not is_dir:
+                continue
+            dir_id = bisect.bisect_right(starts, start) - 1
+            if prefix and not (paths[dir_id] + os.sep).startswith(prefix):
+                continue
+            ranked.append((rank, depths[dir_id], end - start, dir_id, start))
+
+        results = []
+        for _, _, _, dir_id, start in heapq.nsmallest(limit, ranked):
+            position = blob.count("\n", starts[dir_id], start)
+            name = blocks[dir_id].split("\n")[position].rstrip("/")
+            results.append(os.path.join(paths[dir_id], name))
+        return results
+
+    def start(self):
+        """Build the index, then refresh it in the background every `refresh_interval`"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.time()
+            try:
+                rescanned = self.refresh()
+                if rescanned:
+                    print(f"🗂️ File index: {len(self._paths)} folders, {rescanned} rescanned "
+                          f"in {time.time() - started:.1f}s")
+            except Exception as e:
+                print(f"⚠️ File index refresh failed: {e}")
+            self._stop.wait(self.refresh_interval)
+
+    def stop(self):
+        self._stop.set()
+
+
+def _walk_search(search_path, query, limit=10):
+    """The previous per-request search: os.walk with early exit, for comparison"""
+    results = []
+    for root, dirs, files in os.walk(search_path):
+        results.extend(os.path.join(root, f) for f in files if query in f.lower())
+        if len(results) >= limit:
+            break
+    return results[:limit]
+
+
+def _make_tree(base, files, per_dir=20, fanout=12, seed=3):
+    """Generate `files` empty files in a nested folder tree with document-like names"""
+    import random
+    rng = random.Random(seed)
+    words = ["report", "invoice", "budget", "photo", "notes", "draft", "final", "summary", "scan",
+             "meeting", "project", "resume", "thesis", "backup", "export", "design", "slides", "data"]
+    exts = [".pdf", ".docx", ".xlsx", ".jpg", ".png", ".txt", ".pptx", ".csv", ".py", ".mp3"]
+    folders = [base]
+    created = 0
+    while created < files:
+        parent = folders[rng.randrange(len(folders))] if len(folders) > fanout else base
+        folder = os.path.join(parent, f"{rng.choice(words).title()} {len(folders)}")
+        os.makedirs(folder)
+        folders.append(folder)
+        for _ in range(min(per_dir, files - created)):
+            name = f"{rng.choice(words)}_{rng.choice(words)}_{created}{rng.choice(exts)}"
+            open(os.path.join(folder, name), "w").close()
+            created += 1
+    open(os.path.join(folders[-1], "Quarterly Tax Return 2024.pdf"), "w").close()
+    return folders
+
+
+def _benchmark(files=1_000_000, base=None):
+    """Build, refresh and query an index over a generated tree of `files` files"""
+    import shutil
+    import tempfile
+
+    base = base or tempfile.mkdtemp(prefix="file_index_")
+    try:
+        start = time.perf_counter()
+        folders = _make_tree(os.path.join(base, "home"), files)
+        print(f"📁 generated {files} files in {len(folders)} folders ({time.perf_counter() - start:.0f}s)")
+
+        index = FileIndex([os.path.join(base, "home")])
+        start = time.perf_counter()
+        index.refresh()
+        print(f"📊 cold build: {time.perf_counter() - start:.2f}s, "
+              f"{(len(index._blob) + sum(map(len, index._blocks))) / 1e6:.0f} MB of names")
+
+        start = time.perf_counter()
+        rescanned = index.refresh()
+        print(f"📊 refresh, nothing changed: {time.perf_counter() - start:.2f}s ({rescanned} folders re-listed)")
+
+        for folder in folders[-3:]:
+            open(os.path.join(folder, "new meeting minutes.docx"), "w").close()
+        start = time.perf_counter()
+        rescanned = index.refresh()
+        print(f"📊 refresh after 3 new files: {time.perf_counter() - start:.2f}s ({rescanned} folders re-listed)")
+
+        queries = ["quarterly tax", "tax return", "minutes", "thesis_resume", "budget_report_12345", "report"]
+        for query in queries:
+            start = time.perf_counter()
+            results = index.search(query)
+            indexed = time.perf_counter() - start
+            start = time.perf_counter()
+            walked = _walk_search(os.path.join(base, "home"), query)
+            walk_time = time.perf_counter() - start
+            top = os.path.basename(results[0]) if results else None
+            print(f"🔎 '{query}': index {indexed * 1000:.1f} ms → {top} | "
+                  f"os.walk {walk_time * 1000:.0f} ms ({len(walked)} hits)")
+        start = time.perf_counter()
+        folder = index.search("meeting 4", kind="folder")
+        print(f"🔎 folder 'meeting 4': {(time.perf_counter() - start) * 1000:.1f} ms → "
+              f"{os.path.basename(folder[0]) if folder else None}")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
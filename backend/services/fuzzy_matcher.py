@@ -0,0 +1,139 @@
+"""
+Fuzzy lookup for misrecognised commands and app names.
+Known phrases are indexed by character trigrams; a lookup collects the
+phrases sharing the most trigrams with the input and rescores only those,
+so the cost stays flat as the vocabulary grows.
+"""
+
+import difflib
+from collections import defaultdict
+from typing import Iterable, Optional, Tuple
+
+
+class FuzzyMatcher:
+    """Closest known phrase to a noisy input, with a 0..1 confidence"""
+
+    def __init__(self, phrases: Iterable[str] = (), n: int = 3, min_score: float = 0.75, candidates: int = 5):
+        self.n = n
+        self.min_score = min_score
+        self.candidates = candidates
+        self.phrases = []
+        self._ids = {}
+        self._gram_counts = []
+        self._index = defaultdict(list)
+        for phrase in phrases:
+            self.add(phrase)
+
+    def _ngrams(self, text: str):
+        padded = f" {text.strip().lower()} "
+        return {padded[i:i + self.n] for i in range(max(1, len(padded) - self.n + 1))}
+
+    def add(self, phrase: str):
+        phrase = phrase.strip().lower()
+        if not phrase or phrase in self._ids:
+            return
+        phrase_id = len(self.phrases)
+        self._ids[phrase] = phrase_id
+        self.phrases.append(phrase)
+        grams = self._ngrams(phrase)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            self._index[gram].append(phrase_id)
+
+    def match(self, text: str) -> Tuple[Optional[str], float]:
+        """(closest phrase, score), or (None, best score) when nothing clears `min_score`"""
+        text = text.strip().lower()
+        if text in self._ids:
+            return text, 1.0
+
+        grams = self._ngrams(text)
+        shared = defaultdict(int)
+        for gram in grams:
+            for phrase_id in self._index.get(gram, ()):
+                shared[phrase_id] += 1
+        if not shared:
+            return None, 0.0
+
+        # Dice overlap on trigrams picks the shortlist, edit similarity decides
+        shortlist = sorted(shared, key=lambda i: -2.0 * shared[i] / (len(grams) + self._gram_counts[i]))
+        best_id, best_score = None, 0.0
+        for phrase_id in shortlist[:self.candidates]:
+            score = difflib.SequenceMatcher(None, text, self.phrases[phrase_id]).ratio()
+            if score > best_score:
+                best_id, best_score = phrase_id, score
+
+        if best_score < self.min_score:
+            return None, best_score
+        return self.phrases[best_id], best_score
+
+
+def _perturb(phrase, rng, edits=1):
+    """Recogniser-style noise: dropped, doubled, swapped or substituted letters"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    chars = list(phrase)
+    for _ in range(edits):
+        positions = [i for i, c in enumerate(chars) if c != " "]
+        i = rng.choice(positions)
+        kind = rng.choice(("drop", "double", "swap", "sub"))
+        if kind == "drop" and len(positions) > 3:
+            del chars[i]
+        elif kind == "double":
+            chars.insert(i, chars[i])
+        elif kind == "swap" and i + 1 < len(chars) and chars[i + 1] != " ":
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        else:
+            chars[i] = rng.choice(letters)
+    return "".join(chars)
+
+
+def _benchmark(phrases, count=5000, min_score=0.75):
+    """Accuracy and per-lookup time over perturbed commands, plus false accepts on unrelated speech"""
+    import random
+    import time
+
+    matcher = FuzzyMatcher(phrases, min_score=min_score)
+    rng = random.Random(11)
+    samples = []
+    for _ in range(count):
+        phrase = rng.choice(matcher.phrases)
+        samples.append((phrase, _perturb(phrase, rng, rng.choice((1, 1, 2)))))
+    samples += [("scroll down", "scroll dawn"), ("close tab", "clothes tab"), ("pause video", "paws video"),
+                ("new tab", "knew tab"), ("go back", "go bak")]
+    unrelated = ["what time is it", "tell me a joke", "how tall is everest", "thank you", "good morning",
+                 "order a pizza", "remind me tomorrow", "turn on the lights", "who won the game", "hello there"]
+
+    correct = rejected = 0
+    start = time.perf_counter()
+    for expected, noisy in samples:
+        found, _ = matcher.match(noisy)
+        if found == expected:
+            correct += 1
+        elif found is None:
+            rejected += 1
+    elapsed = time.perf_counter() - start
+    false_accepts = [(text, matcher.match(text)) for text in unrelated]
+    false_accepts = [(text, found, score) for text, (found, score) in false_accepts if found]
+
+    total = len(samples)
+    print(f"📋 {len(matcher.phrases)} indexed phrases, min score {min_score}")
+    print(f"📊 {total} perturbed commands: {100.0 * correct / total:.1f}% corrected, "
+          f"{100.0 * rejected / total:.1f}% rejected, {100.0 * (total - correct - rejected) / total:.1f}% wrong")
+    print(f"⏱️ {1e6 * elapsed / total:.0f} µs/lookup")
+    print(f"🚫 {len(false_accepts)}/{len(unrelated)} unrelated phrases accepted: {false_accepts}")
+
+
+if __name__ == "__main__":
+    # python fuzzy_matcher.py — runs against the assistant's command phrases and app names
+    from voice_assistant import VoiceAssistant
+    from voice_browser_control import VoiceBrowserController
+    from intent_router import IntentRouter
+    from command_registry import CommandRegistry
+    from system_control import SystemController
+
+    assistant = VoiceAssistant.__new__(VoiceAssistant)
+    assistant.intent_router = IntentRouter()
+    assistant.browser_controller = VoiceBrowserController.__new__(VoiceBrowserController)
+    registry = CommandRegistry()
+    assistant.register_commands(registry)
+    app_names = SystemController.__new__(SystemController)._load_app_mappings()
+    _benchmark(registry.known_phrases() + [f"open {app}" for app in app_names])
@@ -0,0 +1,340 @@
+"""
+Shared HTTP client for fetching web pages.
+One pooled `requests.Session` is reused for every fetch, so repeat visits
+to a site skip the TCP and TLS handshakes. Responses are requested
+compressed (gzip, and brotli when it is installed), and bodies that carry
+an ETag or Last-Modified are kept in a disk cache. When a cached page is
+fetched again it is revalidated with a conditional GET, and a
+304 Not Modified is answered from disk. Bodies are read in chunks and
+cut off at `max_bytes`, so a giant page is never held in memory whole.
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".eye_control", "http_cache")
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+CHUNK_SIZE = 64 * 1024
+
+
+class HttpResponse:
+    """A response body read in chunks, from the network or from the disk cache.
+
+    `from_cache` is True when the server answered 304 and the body comes
+    from disk; `truncated` turns True once reading stops at `max_bytes`.
+    """
+
+    def __init__(self, client, url, response, cached):
+        self.client = client
+        self.url = url
+        self.status_code = response.status_code
+        self.from_cache = response.status_code == 304
+        if self.from_cache:
+            self.encoding = cached.get("encoding")
+        elif "charset" in response.headers.get("Content-Type", "").lower():
+            self.encoding = response.encoding
+        else:
+            # requests falls back to ISO-8859-1 for text/*, but pages without a charset are mostly UTF-8
+            self.encoding = None
+        self.encoding = self.encoding or "utf-8"
+        self.truncated = False
+        self.bytes_read = 0
+        self._response = response
+
+    def iter_bytes(self, chunk_size=CHUNK_SIZE):
+        try:
+            if self.from_cache:
+                yield from self._iter_cached(chunk_size)
+            else:
+                yield from self._iter_network(chunk_size)
+        finally:
+            self.close()
+
+    def _iter_cached(self, chunk_size):
+        with open(self.client._body_path(self.url), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                self.bytes_read += len(chunk)
+                yield chunk
+
+    def _iter_network(self, chunk_size):
+        validators = self.client._validators(self._response)
+        spool = self.client._open_spool(self.url) if validators else None
+        try:
+            for chunk in self._response.iter_content(chunk_size):
+                room = self.client.max_bytes - self.bytes_read
+                if len(chunk) > room:
+                    chunk, self.truncated = chunk[:room], True
+                self.bytes_read += len(chunk)
+                if spool:
+                    spool.write(chunk)
+                if chunk:
+                    yield chunk
+                if self.truncated:
+                    print(f"⚠️ Page is larger than {self.client.max_bytes // 1024} KB, reading stopped there")
+                    break
+            else:
+                if spool:
+                    spool.close()
+                    self.client._store(self.url, spool.name, dict(validators, encoding=self.encoding))
+                    spool = None
+        finally:
+            if spool:
+                spool.close()
+                os.remove(spool.name)
+
+    def iter_text(self, chunk_size=CHUNK_SIZE):
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        for chunk in self.iter_bytes(chunk_size):
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def read(self):
+        return b"".join(self.iter_bytes())
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HttpClient:
+    """Pooled, compressed, conditionally cached GETs; `cache_dir=None` turns the disk cache off"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=8 * 1024 * 1024, max_entries=200, pool_size=8):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Cache kept in HTTP_CACHE_DIR, bodies limited to HTTP_MAX_BYTES"""
+        return cls(os.getenv("HTTP_CACHE_DIR", DEFAULT_CACHE_DIR),
+                   int(os.getenv("HTTP_MAX_BYTES", str(8 * 1024 * 1024))))
+
+    def get(self, url, timeout=10):
+        """Start a GET for `url`; read the body from the returned HttpResponse"""
+        cached = self._load_meta(url)
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        if response.status_code != 304:
+            response.raise_for_status()
+        elif cached:
+            # reading the empty body hands the connection back to the pool
+            response.content
+            self._touch(url)
+        else:
+            response.close()
+            raise requests.HTTPError(f"304 Not Modified without a cached copy of {url}", response=response)
+        return HttpResponse(self, url, response, cached)
+
+    def close(self):
+        self.session.close()
+
+    @staticmethod
+    def _validators(response):
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["last_modified"] = response.headers["Last-Modified"]
+        return validators
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _body_path(self, url):
+        return self._path(url) + ".body"
+
+    def _load_meta(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(url) + ".json", "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not os.path.exists(self._body_path(url)):
+            return None
+        return meta
+
+    def _touch(self, url):
+        # trimming drops the least recently fetched pages first
+        try:
+            os.utime(self._path(url) + ".json")
+        except OSError:
+            pass
+
+    def _open_spool(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            return open(f"{self._body_path(url)}.{threading.get_ident()}.tmp", "wb")
+        except OSError as e:
+            print(f"⚠️ Could not write HTTP cache: {e}")
+            return None
+
+    def _store(self, url, spool_path, meta):
+        with self._lock:
+            try:
+                os.replace(spool_path, self._body_path(url))
+                with open(self._path(url) + ".json", "w") as f:
+                    json.dump(dict(meta, url=url), f)
+                self._trim()
+            except OSError as e:
+                print(f"⚠️ Could not write HTTP cache: {e}")
+
+    def _trim(self):
+        entries = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            for stale in (path, path[:-len(".json")] + ".body"):
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_client():
+    """The process-wide HttpClient, created on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HttpClient.from_env()
+        return _shared
+
+
+def _benchmark(fetches=5, page_kb=600):
+    """Connections and bytes served by a counting local server, plain requests.get against HttpClient"""
+    import gzip
+    import http.server
+    import shutil
+    import socketserver
+    import tempfile
+    import time
+
+    page = ("<html><body>" + "".join(f"<p>Paragraph {i} says {hashlib.md5(str(i).encode()).hexdigest()}.</p>"
+                                     for i in range(page_kb * 16)) + "</body></html>").encode("utf-8")
+    compressed = gzip.compress(page)
+    etag = '"' + hashlib.md5(page).hexdigest() + '"'
+    stats = {"connections": 0, "bytes": 0, "not_modified": 0}
+
+    class CountingHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            stats["connections"] += 1
+
+        def do_GET(self):
+            if self.path == "/huge":
+                return self._huge()
+            if self.headers.get("If-None-Match") == etag:
+                stats["not_modified"] += 1
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+            body = compressed if gzipped else page
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("ETag", etag)
+            if gzipped:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            stats["bytes"] += len(body)
+
+        def _huge(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            try:
+                for _ in range(1000):
+                    self.wfile.write(page[:100 * 1024])
+                    stats["bytes"] += 100 * 1024
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+        daemon_threads = True
+
+    server = Server(("127.0.0.1", 0), CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    cache_dir = tempfile.mkdtemp(prefix="http_cache_")
+
+    def measure(label, fetch):
+        stats.update(connections=0, bytes=0, not_modified=0)
+        start = time.perf_counter()
+        for _ in range(fetches):
+            body = fetch()
+            assert body == page
+        elapsed = time.perf_counter() - start
+        print(f"📊 {label:>32}: {fetches} fetches in {elapsed * 1000:6.0f} ms, {stats['connections']} connections, "
+              f"{stats['bytes'] / 1024:7.0f} KB served, {stats['not_modified']} x 304")
+
+    try:
+        print(f"📄 {len(page) // 1024} KB page ({len(compressed) // 1024} KB gzipped)")
+        measure("requests.get per fetch (before)", lambda: requests.get(
+            base + "/page", headers={"User-Agent": USER_AGENT}, timeout=10).content)
+        client = HttpClient(cache_dir)
+        measure("shared HttpClient", lambda: client.get(base + "/page").read())
+
+        stats.update(bytes=0)
+        limited = HttpClient(None, max_bytes=2 * 1024 * 1024)
+        with limited.get(base + "/huge") as response:
+            size = sum(len(chunk) for chunk in response.iter_bytes())
+        time.sleep(0.2)
+        print(f"📊 {'100 MB page, 2 MB limit':>32}: read {size / 1024:.0f} KB (truncated: {response.truncated}), "
+              f"server got to send {stats['bytes'] / 1024:.0f} KB before the connection closed")
+    finally:
+        server.shutdown()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    _benchmark()
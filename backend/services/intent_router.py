@@ -4,7 +4,20 @@ This enables natural language understanding for system-wide voice commands.
 """
 
 import re
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+
+try:
+    from .command_registry import pattern_specificity
+except ImportError:
+    from command_registry import pattern_specificity
+
+# optional tails of the power commands: "shut down the pc in 5 minutes"
+_MACHINE = r"(?:\s+(?:the\s+)?(?:computer|pc|laptop|system))?"
+_DELAY = r"(?:\s+in\s+\d+\s*(?:seconds?|secs?|minutes?|mins?))?"
+
+# intents that power the machine down or lock it; never reached by a guess
+POWER_INTENTS = ("lock_screen", "sleep", "shutdown", "restart")
+
 
 class IntentRouter:
     """Routes voice commands to appropriate system actions"""
@@ -12,6 +25,7 @@ class IntentRouter:
     def __init__(self):
         """Initialize intent router with command patterns"""
         self.patterns = self._initialize_patterns()
+        self._compile_patterns()
     
     def _initialize_patterns(self):
         """Initialize command patterns for intent recognition"""
@@ -32,7 +46,6 @@ class IntentRouter:
                 r"go\s+to\s+(desktop|documents|downloads|pictures|videos|music)",
                 r"open\s+(desktop|documents|downloads|pictures|videos|music)",
                 r"navigate\s+to\s+(.+)",
-                r"go\s+to\s+(.+)",
             ],
             
             "search_files": [
@@ -72,21 +85,18 @@ class IntentRouter:
                 r"lock\s+(?:the\s+)?(?:screen|computer|pc|laptop)",
                 r"lock\s+system",
             ],
+            # power intents take the whole command, so "restart chrome" or "sleep tab" never reach them
             "sleep": [
-                r"sleep",
+                r"^sleep$",
                 r"put\s+(?:the\s+)?(?:computer|pc|laptop|system)\s+to\s+sleep",
-                r"sleep\s+(?:the\s+)?(?:computer|pc|laptop|system)",
+                r"^sleep\s+(?:the\s+)?(?:computer|pc|laptop|system)$",
             ],
             "shutdown": [
-                r"shutdown",
-                r"shut\s+down",
-                r"turn\s+off\s+(?:the\s+)?(?:computer|pc|laptop)",
-                r"power\s+off",
+                r"^(?:shut\s*down|power\s+off)" + _MACHINE + _DELAY + "$",
+                r"^turn\s+off\s+(?:the\s+)?(?:computer|pc|laptop|system)" + _DELAY + "$",
             ],
             "restart": [
-                r"restart",
-                r"reboot",
-                r"restart\s+(?:the\s+)?(?:computer|pc|laptop)",
+                r"^(?:restart|reboot)" + _MACHINE + _DELAY + "$",
             ],
          
             "show_desktop": [
@@ -114,6 +124,38 @@ class IntentRouter:
             ],
         }
     
+    def _compile_patterns(self):
+        """
+        Compile every pattern into one alternation of named groups.
+        
+        A search returns the leftmost match; at the same position the pattern
+        with the most required literal text wins, then the one declared first.
+        """
+        entries = []
+        order = 0
+        for intent_type, patterns in self.patterns.items():
+            for pattern in patterns:
+                entries.append((-pattern_specificity(pattern), order, intent_type, pattern))
+                order += 1
+        entries.sort()
+        
+        self._alternatives: List[Tuple[str, re.Pattern]] = [
+            (intent_type, re.compile(pattern, re.IGNORECASE)) for _, _, intent_type, pattern in entries
+        ]
+        self._combined = re.compile(
+            "|".join(f"(?P<i{index}>{pattern})" for index, (*_, pattern) in enumerate(entries)),
+            re.IGNORECASE,
+        )
+    
+    def register_commands(self, registry, handle_intent):
+        """Register every intent with `registry` as a "system" command that
+        calls `handle_intent(intent_type, params)`. Power intents are left out
+        of fuzzy correction: a misheard "shut town" must not shut down."""
+        for intent_type, patterns in self.patterns.items():
+            registry.register(intent_type, lambda m, intent_type=intent_type: handle_intent(
+                intent_type, self._extract_parameters(intent_type, m, m.string)),
+                patterns=patterns, owner="system", guessable=intent_type not in POWER_INTENTS)
+    
     def parse_intent(self, command: str) -> Tuple[Optional[str], Dict]:
         """
         Parse a voice command and return intent type and extracted parameters
@@ -122,15 +164,16 @@ class IntentRouter:
             Tuple of (intent_type, parameters_dict)
         """
         command = command.strip().lower()
-     
-        for intent_type, patterns in self.patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, command, re.IGNORECASE)
-                if match:
-                    params = self._extract_parameters(intent_type, match, command)
-                    return intent_type, params
         
-        return None, {}
+        found = self._combined.search(command)
+        if not found:
+            return None, {}
+        
+        intent_type, pattern = self._alternatives[int(found.lastgroup[1:])]
+        # same pattern at the same position, so its own groups are numbered from 1
+        match = pattern.match(command, found.start())
+        params = self._extract_parameters(intent_type, match, command)
+        return intent_type, params
     
     def _extract_parameters(self, intent_type: str, match: re.Match, full_command: str) -> Dict:
         """Extract parameters from matched pattern"""
@@ -206,3 +249,50 @@ class IntentRouter:
         }
         return descriptions.get(intent_type, "Unknown intent")
 
+
+def _benchmark(count=100000):
+    """Compare the compiled matcher with the old per-pattern scan on a synthetic corpus"""
+    import random
+    import time
+    
+    apps = ["chrome", "notepad", "spotify", "vs code", "calculator", "word", "excel", "discord"]
+    folders = ["desktop", "documents", "downloads", "pictures", "videos", "music"]
+    templates = [
+        "open {app}", "launch the {app}", "please start {app}", "switch to {app}", "go to {app}",
+        "focus {app}", "go to {folder}", "show me the {folder}", "open {folder}", "open file explorer",
+        "open this pc", "search for file {app} notes", "where is my {folder} backup", "list open windows",
+        "what is the system status", "battery level", "lock the screen", "shut down in 5 minutes",
+        "restart the computer", "show desktop", "right click here", "double click", "refresh desktop",
+        "open {app} on desktop", "open desktop icon {app}", "scroll down a bit", "what time is it",
+    ]
+    rng = random.Random(7)
+    corpus = [rng.choice(templates).format(app=rng.choice(apps), folder=rng.choice(folders))
+              for _ in range(count)]
+    
+    router = IntentRouter()
+    
+    def linear_scan(command):
+        command = command.strip().lower()
+        for intent_type, patterns in router.patterns.items():
+            for pattern in patterns:
+                match = re.search(pattern, command, re.IGNORECASE)
+                if match:
+                    return intent_type, router._extract_parameters(intent_type, match, command)
+        return None, {}
+    
+    results = {}
+    for label, parse in (("linear scan", linear_scan), ("compiled", router.parse_intent)):
+        start = time.perf_counter()
+        results[label] = [parse(command)[0] for command in corpus]
+        elapsed = time.perf_counter() - start
+        print(f"📊 {label}: {1e6 * elapsed / count:.2f} µs/command over {count} commands")
+    
+    changed = sorted({(c, old, new) for c, old, new in zip(corpus, results["linear scan"], results["compiled"])
+                      if old != new})
+    print(f"🔀 {len(changed)} distinct commands now route differently:")
+    for command, old, new in changed[:20]:
+        print(f"   '{command}': {old} → {new}")
+
+
+if __name__ == "__main__":
+    _benchmark()
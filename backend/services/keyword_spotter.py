@@ -0,0 +1,158 @@
+"""
+Local keyword spotting for the most frequent short commands.
+A grammar-restricted Vosk decoder listens to each phrase while it is being
+spoken; when the phrase is one of the configured keywords it is dispatched
+straight away, without waiting for the end-of-phrase pause or a cloud
+round trip. Anything else falls through to full recognition.
+"""
+
+import json
+import os
+
+DEFAULT_KEYWORDS = [
+    "scroll down", "scroll up", "scroll down more", "scroll up more",
+    "click", "double click", "right click",
+    "new tab", "close tab", "go back",
+    "play video", "pause video", "play", "pause",
+]
+# keywords that also start a command with parameters ("click at 300 400", "click here twice")
+PARAMETERISED_KEYWORDS = ["click", "double click", "right click"]
+
+
+class KeywordMatcher:
+    """Decides when the hypotheses for one phrase add up to a keyword.
+
+    A keyword fires as soon as the partial hypothesis equals it, unless a
+    longer keyword starts with it ("scroll down" vs "scroll down more"),
+    which waits for Vosk's own short endpoint, or a parameterised command
+    does ("click at 300 400"), which waits for the end of the phrase.
+    """
+
+    def __init__(self, keywords=None, parameterised=None):
+        self.keywords = [k.strip().lower() for k in (keywords or DEFAULT_KEYWORDS) if k.strip()]
+        held = {k.strip().lower() for k in (PARAMETERISED_KEYWORDS if parameterised is None else parameterised)}
+        self._keyword_set = set(self.keywords)
+        self._at_endpoint = self._keyword_set - held
+        self._immediate = {k for k in self._at_endpoint
+                           if not any(o != k and o.startswith(k + " ") for o in self.keywords)}
+        self._heard = []
+
+    def reset(self):
+        self._heard = []
+
+    def partial(self, text):
+        """Keyword to fire on the partial hypothesis `text`, or None"""
+        return text if not self._heard and text in self._immediate else None
+
+    def endpoint(self, text):
+        """Keyword to fire when Vosk ends an utterance on `text`, or None"""
+        phrase = self._add(text)
+        return phrase if phrase in self._at_endpoint else None
+
+    def final(self, text):
+        """Keyword for the whole phrase once it has ended, or None"""
+        phrase = self._add(text)
+        return phrase if phrase in self._keyword_set else None
+
+    def _add(self, text):
+        # an utterance ended by Vosk is only part of the phrase; the words after it still count
+        if text:
+            self._heard.append(text)
+        return " ".join(self._heard)
+
+
+class KeywordSpotter:
+    """Matches whole phrases against a small keyword vocabulary, see KeywordMatcher"""
+
+    def __init__(self, keywords=None, model_path=None, parameterised=None):
+        from vosk import KaldiRecognizer
+        try:
+            from .speech_backends import load_vosk_model
+        except ImportError:
+            from speech_backends import load_vosk_model
+        self._recognizer_class = KaldiRecognizer
+        self.matcher = KeywordMatcher(keywords, parameterised)
+        self.keywords = self.matcher.keywords
+        self.model = load_vosk_model(model_path)
+        self._grammar = json.dumps(self.keywords + ["[unk]"])
+        self._decoder = None
+        self._sample_rate = None
+
+    def reset(self, sample_rate):
+        """Start a new phrase"""
+        self.matcher.reset()
+        if self._decoder is None or sample_rate != self._sample_rate:
+            self._decoder = self._recognizer_class(self.model, sample_rate, self._grammar)
+            self._sample_rate = sample_rate
+        else:
+            self._decoder.Reset()
+
+    def feed(self, chunk):
+        """Keyword spoken so far in this phrase, or None"""
+        if self._decoder.AcceptWaveform(chunk):
+            return self.matcher.endpoint(json.loads(self._decoder.Result()).get("text", ""))
+        return self.matcher.partial(json.loads(self._decoder.PartialResult()).get("partial", ""))
+
+    def finish(self):
+        """Keyword for the phrase that just ended, or None"""
+        return self.matcher.final(json.loads(self._decoder.FinalResult()).get("text", ""))
+
+
+def create_keyword_spotter(keywords=None):
+    """Spotter when KEYWORD_SPOTTING=1, with VOICE_KEYWORDS (comma-separated) overriding the defaults"""
+    if os.getenv("KEYWORD_SPOTTING", "0").lower() not in ("1", "true", "yes", "on"):
+        return None
+    if keywords is None and os.getenv("VOICE_KEYWORDS"):
+        keywords = os.getenv("VOICE_KEYWORDS").split(",")
+    try:
+        spotter = KeywordSpotter(keywords, os.getenv("VOSK_MODEL_PATH"))
+        print(f"⚡ Keyword spotting enabled for {len(spotter.keywords)} commands")
+        return spotter
+    except ImportError:
+        print("⚠️ vosk not installed. Install with: pip install vosk")
+    except Exception as e:
+        print(f"⚠️ Keyword spotting unavailable: {e}")
+    return None
+
+
+def _benchmark(wav_path, keywords=None):
+    """Replay a recording with and without spotting and compare command latency"""
+    import statistics
+    import speech_recognition as sr
+    try:
+        from .audio_pipeline import VoicePipeline
+        from .speech_backends import WavFileSource, create_speech_backend
+    except ImportError:
+        from audio_pipeline import VoicePipeline
+        from speech_backends import WavFileSource, create_speech_backend
+
+    backend = create_speech_backend()
+    runs = {}
+    for label, spotter in (("full recognition", None),
+                           ("keyword spotting", KeywordSpotter(keywords))):
+        latencies = {"keyword": [], backend.name: []}
+
+        def on_command(text, segment):
+            path = "keyword" if segment.spotted else backend.name
+            latencies[path].append(segment.latency)
+            print(f"  {path:>8}: '{text}' in {segment.latency * 1000:.0f} ms")
+
+        print(f"▶️ {label}")
+        recognizer = sr.Recognizer()
+        recognizer.pause_threshold = 1.2
+        VoicePipeline(WavFileSource(wav_path), backend, recognizer, on_command, spotter=spotter).run()
+        runs[label] = latencies
+
+    for label, latencies in runs.items():
+        for path, values in latencies.items():
+            if values:
+                print(f"📊 {label} / {path}: median {statistics.median(values) * 1000:.0f} ms "
+                      f"over {len(values)} commands")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) < 2:
+        print("Usage: python keyword_spotter.py <recorded_commands.wav> [keyword, ...]")
+    else:
+        _benchmark(sys.argv[1], sys.argv[2:] or None)
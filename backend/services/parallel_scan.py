@@ -0,0 +1,199 @@
+"""
+Parallel directory scanning for cold file, folder and app searches.
+Directories are listed with `os.scandir` by a pool of threads. Each worker
+keeps its own deque of directories to visit and steals from the others
+when it runs dry. Matches are streamed to the caller as they are found,
+and closing the stream cancels the scan.
+"""
+
+import os
+import queue
+import threading
+from collections import deque
+
+try:
+    from .file_index import DEFAULT_EXCLUDES
+except ImportError:
+    from file_index import DEFAULT_EXCLUDES
+
+_DONE = object()
+
+
+class ParallelScanner:
+    """Streams paths under `roots` whose lowercase name satisfies `match(name, is_dir)`.
+
+    Workers pop from the end of their own deque (depth first, close to the
+    directory they just listed) and steal from the front of the others'
+    (the oldest, usually largest subtrees). Hidden and excluded folders are
+    not entered; `max_depth` counts levels below each root.
+    """
+
+    def __init__(self, workers=8, max_depth=None, exclude=DEFAULT_EXCLUDES, skip_hidden=True):
+        self.workers = workers
+        self.max_depth = max_depth
+        self.exclude = {name.lower() for name in exclude}
+        self.skip_hidden = skip_hidden
+        self.stats = {}
+
+    def scan(self, roots, match, max_depth=None, cancel=None):
+        """Generator of matching paths; stops early when `cancel` is set or the generator is closed"""
+        max_depth = self.max_depth if max_depth is None else max_depth
+        stop = threading.Event()
+        results = queue.Queue()
+        deques = [deque() for _ in range(self.workers)]
+        lock = threading.Condition()
+        state = {"pending": 0, "dirs": 0}
+        for i, root in enumerate(root for root in roots if os.path.isdir(root)):
+            deques[i % self.workers].append((os.path.abspath(root), 0))
+            state["pending"] += 1
+
+        def stopped():
+            return stop.is_set() or (cancel is not None and cancel.is_set())
+
+        def steal(me):
+            for offset in range(1, self.workers):
+                try:
+                    return deques[(me + offset) % self.workers].popleft()
+                except IndexError:
+                    continue
+            return None
+
+        def worker(me):
+            own = deques[me]
+            try:
+                while not stopped():
+                    try:
+                        item = own.pop()
+                    except IndexError:
+                        item = steal(me)
+                    if item is None:
+                        with lock:
+                            if state["pending"] == 0:
+                                break
+                            lock.wait(0.01)
+                        continue
+
+                    path, depth = item
+                    children = []
+                    try:
+                        with os.scandir(path) as entries:
+                            for entry in entries:
+                                try:
+                                    is_dir = entry.is_dir(follow_symlinks=False)
+                                except OSError:
+                                    continue
+                                name = entry.name.lower()
+                                if match(name, is_dir):
+                                    results.put(entry.path)
+                                if is_dir and (max_depth is None or depth < max_depth) and name not in self.exclude \
+                                        and not (self.skip_hidden and name.startswith(".")):
+                                    children.append((entry.path, depth + 1))
+                    except OSError:
+                        pass
+
+                    with lock:
+                        own.extend(children)
+                        # children are counted before their parent is retired, so pending only hits 0 at the end
+                        state["pending"] += len(children) - 1
+                        state["dirs"] += 1
+                        if state["pending"] == 0 or children:
+                            lock.notify_all()
+            finally:
+                results.put(_DONE)
+
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        finished = 0
+        try:
+            while finished < self.workers:
+                item = results.get()
+                if item is _DONE:
+                    finished += 1
+                else:
+                    yield item
+        finally:
+            stop.set()
+            self.stats = {"dirs": state["dirs"], "cancelled": finished < self.workers}
+
+    def first(self, roots, match, max_depth=None):
+        """First matching path, or None; the scan is cancelled as soon as it is found"""
+        stream = self.scan(roots, match, max_depth)
+        try:
+            return next(stream, None)
+        finally:
+            stream.close()
+
+
+def _drop_caches():
+    """Empty the Linux page, dentry and inode caches (needs root); False when not possible"""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def _benchmark(files=300_000, workers=(1, 4, 8, 16, 32)):
+    """Cold and warm searches against serial os.walk on a generated tree"""
+    import shutil
+    import tempfile
+    import time
+    try:
+        from .file_index import _make_tree
+    except ImportError:
+        from file_index import _make_tree
+
+    base = tempfile.mkdtemp(prefix="parallel_scan_")
+    try:
+        root = os.path.join(base, "home")
+        folders = _make_tree(root, files)
+        cold = _drop_caches()
+        print(f"📁 {files} files in {len(folders)} folders, {os.cpu_count()} CPU(s), "
+              f"{'cold runs after dropping caches' if cold else 'caches cannot be dropped, cold = warm'}")
+
+        missing = "no such file"
+        target = "quarterly tax return 2024.pdf"
+
+        def walk(needle, stop_at_first):
+            found = None
+            for dirpath, dirnames, names in os.walk(root):
+                for name in names + dirnames:
+                    if needle in name.lower():
+                        found = os.path.join(dirpath, name)
+                        if stop_at_first:
+                            return found
+            return found
+
+        def timed(run):
+            times = []
+            for flush in (cold, False):
+                if flush:
+                    _drop_caches()
+                start = time.perf_counter()
+                result = run()
+                times.append(time.perf_counter() - start)
+            return times, result
+
+        rows = [("os.walk", lambda needle, first: walk(needle, first))]
+        for count in workers:
+            scanner = ParallelScanner(workers=count, skip_hidden=False, exclude=())
+            rows.append((f"{count} workers", lambda needle, first, scanner=scanner:
+                         scanner.first([root], lambda name, is_dir: needle in name) if first else
+                         list(scanner.scan([root], lambda name, is_dir: needle in name))))
+
+        for label, run in rows:
+            (full_cold, full_warm), _ = timed(lambda: run(missing, False))
+            (first_cold, first_warm), found = timed(lambda: run(target, True))
+            print(f"📊 {label:>10}: full scan cold {full_cold * 1000:6.0f} ms / warm {full_warm * 1000:5.0f} ms | "
+                  f"first match cold {first_cold * 1000:6.0f} ms / warm {first_warm * 1000:5.0f} ms "
+                  f"({'found' if found else 'missing'})")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 300_000)
@@ -10,6 +10,11 @@ from datetime import datetime
 import pyautogui
 from collections import deque
 
+try:
+    from .camera_pipeline import FrameWorkspace
+except ImportError:
+    from camera_pipeline import FrameWorkspace
+
 latest_calibration_file = None
 
 mirror_preview = True
@@ -939,18 +944,21 @@ def run_pure_eye_calibration():
         detection_failure_count = 0
         max_detection_failures = 5 
         last_successful_detection = time.time()
+        workspace = FrameWorkspace()
+        raw_frame = None
         
         while not calibrator.calibration_complete:
-            ret, frame = cap.read()
+            ret, raw_frame = cap.read(raw_frame) if raw_frame is not None else cap.read()
             if not ret:
                 continue
+            frame = raw_frame
             try:
                 if mirror_preview:
-                    frame = cv2.flip(frame, 1)
+                    frame = workspace.mirror(raw_frame)
             except Exception:
                 pass
             
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rgb_frame = workspace.to_rgb(frame)
             results = face_mesh.process(rgb_frame)
             
             face_detected = False
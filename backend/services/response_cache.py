@@ -0,0 +1,327 @@
+"""
+Content-addressed cache for slow answers: Gemini responses and fetched pages.
+Entries are keyed by a hash of everything that determines the answer (the
+prompt, the screenshot pixels, the page URL and content), expire after a
+TTL and are evicted least-recently-used past a size limit. Concurrent
+requests for the same key share one call instead of each making their own.
+The on-disk copy is written a few seconds after the last change and at exit,
+not on every insert.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".eye_control", "response_cache.json")
+
+_MISS = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """LRU + TTL cache with in-flight request coalescing, optionally saved as JSON at `path`.
+
+    Values must be JSON-serialisable when `path` is set. Changes are saved
+    `save_delay` seconds after the last one, by `flush()`, and at exit.
+    `hits`, `misses` and `coalesced` count how each lookup was answered.
+    """
+
+    def __init__(self, path=None, ttl=600.0, max_entries=256, save_delay=2.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self.hits = self.misses = self.coalesced = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer = None
+        self._dirty = False
+        if path:
+            self.load()
+            atexit.register(self.flush)
+
+    @classmethod
+    def from_env(cls):
+        """Cache saved at RESPONSE_CACHE_PATH, entries kept RESPONSE_CACHE_TTL seconds"""
+        return cls(os.getenv("RESPONSE_CACHE_PATH", DEFAULT_CACHE_PATH),
+                   float(os.getenv("RESPONSE_CACHE_TTL", "600")))
+
+    @staticmethod
+    def key(*parts):
+        """Hash of `parts` (str or bytes); lengths are mixed in so parts cannot run together"""
+        digest = hashlib.sha256()
+        for part in parts:
+            data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Could not read response cache: {e}")
+            return False
+        now = time.time()
+        with self._lock:
+            for key, (expires, value) in data.items():
+                if expires > now:
+                    self._entries[key] = (expires, value)
+            self._trim()
+        return True
+
+    def save(self):
+        if not self.path:
+            return
+        # one writer at a time, each through its own temp file, so overlapping saves cannot clash
+        with self._save_lock:
+            with self._lock:
+                data = dict(self._entries)
+                self._dirty = False
+            tmp_path = None
+            try:
+                directory = os.path.dirname(self.path) or "."
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + ".",
+                                                suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+            except Exception as e:
+                print(f"⚠️ Could not save response cache: {e}")
+            finally:
+                if tmp_path:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
+
+    def flush(self):
+        """Save now if anything changed since the last save"""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty = self._dirty
+        if timer:
+            timer.cancel()
+        if dirty:
+            self.save()
+
+    def _schedule_save(self):
+        # called with self._lock held
+        self._dirty = True
+        if self.path and self._save_timer is None:
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISS
+        if entry[0] <= time.time():
+            del self._entries[key]
+            return _MISS
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISS else value
+
+    def get_counted(self, key, default=None):
+        """Like `get`, but counted in `hits` or `misses`"""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISS:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            self._entries[key] = (time.time() + (self.ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            self._trim()
+            self._schedule_save()
+
+    def get_or_compute(self, key, compute, ttl=None, cacheable=None):
+        """Cached value for `key`, or `compute()`; callers arriving while it runs wait for its result.
+        Results for which `cacheable(value)` is false (e.g. an empty page) are returned but not stored."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISS:
+                self.hits += 1
+                return value
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+            if cacheable is None or cacheable(call.value):
+                self.put(key, call.value, ttl)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+
+
+class CachedModel:
+    """Wraps a Gemini `GenerativeModel` so identical prompts (and screenshots) are answered once"""
+
+    def __init__(self, model, cache):
+        self.model = model
+        self.cache = cache
+
+    @staticmethod
+    def _key(prompt, image):
+        if image is None:
+            return ResponseCache.key("text", prompt)
+        if isinstance(image, dict):
+            # an already encoded {"mime_type", "data"} blob
+            return ResponseCache.key("blob", prompt, image["mime_type"], image["data"])
+        return ResponseCache.key("image", prompt, image.mode, "x".join(map(str, image.size)), image.tobytes())
+
+    def generate_text(self, prompt, image=None, ttl=None):
+        content = prompt if image is None else [prompt, image]
+        return self.cache.get_or_compute(self._key(prompt, image),
+                                         lambda: self.model.generate_content(content).text, ttl)
+
+    def stream_text(self, prompt, image=None, ttl=None):
+        """Like `generate_text`, but yields the answer in fragments as they arrive.
+
+        A cached answer comes back as a single fragment. Only non-empty
+        answers that were read to the end are cached; streams are not
+        coalesced.
+        """
+        key = self._key(prompt, image)
+        cached = self.cache.get_counted(key)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for chunk in self.model.generate_content(prompt if image is None else [prompt, image], stream=True):
+            text = getattr(chunk, "text", "")
+            if text:
+                parts.append(text)
+                yield text
+        # an empty answer (e.g. a blocked response) would otherwise be replayed until it expires
+        if parts:
+            self.cache.put(key, "".join(parts), ttl)
+
+
+def _demo(callers=8):
+    """Duplicate screen and page questions against a stand-in model and a local HTTP server"""
+    import functools
+    import http.server
+    import shutil
+    import tempfile
+    from PIL import Image
+
+    try:
+        from .web_page import fetch_page_text
+    except ImportError:
+        from web_page import fetch_page_text
+
+    class StandInModel:
+        def __init__(self):
+            self.calls = 0
+
+        def generate_content(self, content):
+            self.calls += 1
+            time.sleep(0.5)
+            return type("Response", (), {"text": f"answer #{self.calls}"})()
+
+    site = tempfile.mkdtemp(prefix="response_cache_")
+    with open(os.path.join(site, "article.html"), "w") as f:
+        f.write("<html><body><nav>menu</nav><p>" + "The quick brown fox. " * 500 + "</p></body></html>")
+    fetches = []
+
+    class CountingHandler(http.server.SimpleHTTPRequestHandler):
+        def do_GET(self):
+            fetches.append(self.path)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(CountingHandler, directory=site))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/article.html"
+    path = os.path.join(site, "cache.json")
+
+    try:
+        model = StandInModel()
+        cache = ResponseCache(path)
+        pages = ResponseCache(ttl=120, max_entries=32)
+        gemini = CachedModel(model, cache)
+        screenshot = Image.new("RGB", (1920, 1080), "navy")
+
+        def summarize():
+            text = pages.get_or_compute(ResponseCache.key("page", url), lambda: fetch_page_text(url),
+                                        cacheable=bool)
+            return gemini.generate_text(f"Summarize {url}:\n\n{text}")
+
+        for label, ask in (("analyze screen", lambda: gemini.generate_text("Describe the screen", screenshot)),
+                           ("summarize page", summarize)):
+            start = time.perf_counter()
+            threads = [threading.Thread(target=ask) for _ in range(callers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            burst = time.perf_counter() - start
+            start = time.perf_counter()
+            answer = ask()
+            repeat = time.perf_counter() - start
+            print(f"📊 {label}: {callers} concurrent askers in {burst * 1000:.0f} ms, "
+                  f"repeat in {repeat * 1000:.2f} ms -> {answer!r}")
+
+        cache.flush()
+        reloaded = ResponseCache(path)
+        print(f"🧠 Model calls: {model.calls}, page fetches: {len(fetches)}, "
+              f"hits {cache.hits}, coalesced {cache.coalesced}, reloaded from disk: {len(reloaded._entries)} entries")
+    finally:
+        server.shutdown()
+        shutil.rmtree(site, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    _demo()
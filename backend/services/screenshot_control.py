@@ -2,173 +2,401 @@ import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
 
 import cv2
-import numpy as np
+import json
+import threading
 import time
 import pyautogui
 from datetime import datetime
 
-print("Starting screenshot control script...")
+try:
+    from .camera_pipeline import CameraFrameSource, FrameRateGovernor, FrameWorkspace
+except ImportError:
+    from camera_pipeline import CameraFrameSource, FrameRateGovernor, FrameWorkspace
 
 screenshots_folder = "screenshots_captured"
-if not os.path.exists(screenshots_folder):
-    os.makedirs(screenshots_folder)
-    print(f"✓ Created folder: {screenshots_folder}")
-else:
-    print(f"✓ Using existing folder: {screenshots_folder}")
+captures_index_file = "captures.jsonl"
 
-try:
-    import mediapipe as mp
-    print("✓ MediaPipe imported successfully")
-    
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(
-        static_image_mode=False,
-        max_num_hands=1,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5
-    )
-    mp_draw = mp.solutions.drawing_utils
-    print("✓ MediaPipe hands initialized successfully")
-    
-except Exception as e:
-    print(f"✗ Error importing MediaPipe: {e}")
-    exit(1)
+screenshot_running = False
+cap = None
+hands = None
+frame_governor = None
 
 wCam, hCam = 640, 480
 
-print("Initializing webcam...")
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    print("✗ Error: Cannot open webcam")
-    exit(1)
+screenshot_cooldown = 2
+burst_count = 5
+burst_interval = 0.3
+gaze_region_size = (800, 500)
+dedup_threshold = 5
+# a gesture must be seen in this many consecutive frames before it captures
+gesture_hold_frames = 4
 
-cap.set(3, wCam)
-cap.set(4, hCam)
-print("✓ Webcam initialized successfully")
+# a closed fist is how a hand rests, so it never triggers a capture
+GESTURE_MODES = {
+    "Open Palm": "full",
+    "Peace Sign": "burst",
+    "Three Fingers": "window",
+    "Pointing": "gaze",
+}
+
+
+class ScreenshotDeduplicator:
+    """Skips writing captures that are perceptually identical to the previous one"""
+
+    def __init__(self, threshold=dedup_threshold):
+        self.threshold = threshold
+        self.last_hash = None
+        self.last_filepath = None
+
+    @staticmethod
+    def difference_hash(image, hash_size=8):
+        """64-bit dHash: compares neighbouring pixels of a tiny grayscale thumbnail"""
+        small = image.convert("L").resize((hash_size + 1, hash_size))
+        pixels = list(small.getdata())
+        value = 0
+        for row in range(hash_size):
+            offset = row * (hash_size + 1)
+            for col in range(hash_size):
+                value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+        return value
+
+    def is_duplicate(self, image):
+        """Return (duplicate, image_hash) for the capture against the last written one"""
+        image_hash = self.difference_hash(image)
+        if self.last_hash is None or self.last_filepath is None:
+            return False, image_hash
+        distance = bin(image_hash ^ self.last_hash).count("1")
+        return distance <= self.threshold, image_hash
+
+    def remember(self, image_hash, filepath):
+        self.last_hash = image_hash
+        self.last_filepath = filepath
+
+
+# one per capture mode, so a gaze crop is never compared against a full-screen capture
+deduplicators = {}
+# bursts save from their own thread; the deduplicators and capture index are shared
+_save_lock = threading.Lock()
+_burst_thread = None
+
+
+def _ensure_folder():
+    if not os.path.exists(screenshots_folder):
+        os.makedirs(screenshots_folder)
+        print(f"✓ Created folder: {screenshots_folder}")
+
+
+def _record_capture(entry):
+    try:
+        with open(os.path.join(screenshots_folder, captures_index_file), "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except Exception as e:
+        print(f"⚠️ Could not update capture index: {e}")
+
+
+def get_window_region_under_cursor():
+    """Return (left, top, width, height) of the top-level window under the cursor"""
+    try:
+        import ctypes
+        from ctypes import wintypes
+        import win32gui
+        cursor_x, cursor_y = pyautogui.position()
+        hwnd = ctypes.windll.user32.WindowFromPoint(wintypes.POINT(cursor_x, cursor_y))
+        hwnd = ctypes.windll.user32.GetAncestor(hwnd, 2)
+        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        if right > left and bottom > top:
+            return _clamp_region((left, top, right - left, bottom - top))
+    except Exception as e:
+        print(f"⚠️ Could not find window under cursor: {e}")
+    return None
+
+
+def get_gaze_region(gaze_point=None, size=None):
+    """Rectangle centred on the gaze point (the cursor follows gaze when eye control is on)"""
+    if gaze_point is None:
+        gaze_point = pyautogui.position()
+    width, height = size or gaze_region_size
+    x, y = int(gaze_point[0]), int(gaze_point[1])
+    return _clamp_region((x - width // 2, y - height // 2, width, height))
+
+
+def _clamp_region(region):
+    screen_w, screen_h = pyautogui.size()
+    left, top, width, height = region
+    width, height = min(width, screen_w), min(height, screen_h)
+    left = max(0, min(left, screen_w - width))
+    top = max(0, min(top, screen_h - height))
+    return (left, top, width, height)
+
+
+def capture_image(mode="full", region=None, gaze_point=None):
+    """Grab a PIL image for the given mode: full, window or gaze"""
+    if region is None:
+        if mode == "window":
+            region = get_window_region_under_cursor()
+        elif mode == "gaze":
+            region = get_gaze_region(gaze_point)
+    if region:
+        return pyautogui.screenshot(region=region)
+    return pyautogui.screenshot()
+
+
+def save_capture(image, mode="full", dedup=True):
+    """Write the capture unless it duplicates the previous one; returns the file it refers to"""
+    with _save_lock:
+        return _save_capture(image, mode, dedup)
+
+
+def _save_capture(image, mode, dedup):
+    _ensure_folder()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    entry = {"timestamp": timestamp, "mode": mode}
+
+    image_hash = None
+    deduplicator = deduplicators.setdefault(mode, ScreenshotDeduplicator())
+    if dedup:
+        duplicate, image_hash = deduplicator.is_duplicate(image)
+        if duplicate:
+            entry["duplicate_of"] = deduplicator.last_filepath
+            _record_capture(entry)
+            print(f"↺ Screen unchanged, referencing: {deduplicator.last_filepath}")
+            return deduplicator.last_filepath
+
+    filepath = os.path.join(screenshots_folder, f"screenshot_{timestamp}.png")
+    image.save(filepath)
+    if image_hash is not None:
+        deduplicator.remember(image_hash, filepath)
+    entry["file"] = filepath
+    _record_capture(entry)
+    print(f"✓ Screenshot saved: {filepath}")
+    return filepath
+
+
+def take_screenshot(mode="full", region=None, gaze_point=None, dedup=True):
+    """Capture in `mode`; returns the file written, or for "burst" the thread taking it"""
+    try:
+        if mode == "burst":
+            return start_burst(dedup=dedup)
+        image = capture_image(mode, region, gaze_point)
+        return save_capture(image, mode, dedup)
+    except Exception as e:
+        print(f"✗ Error taking screenshot: {e}")
+        return None
+
+
+def take_burst_screenshots(count=None, interval=None, mode="full", dedup=True):
+    """Capture `count` frames `interval` seconds apart; unchanged frames are only referenced"""
+    count = count or burst_count
+    interval = burst_interval if interval is None else interval
+    saved = []
+    next_shot = time.time()
+    for i in range(count):
+        delay = next_shot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        next_shot += interval
+        try:
+            image = capture_image(mode)
+            saved.append(save_capture(image, "burst", dedup))
+        except Exception as e:
+            print(f"✗ Burst frame {i + 1} failed: {e}")
+    return saved
+
+
+def start_burst(dedup=True):
+    """Take a burst on a background thread so the camera loop keeps tracking; None while one is running"""
+    global _burst_thread
+    if _burst_thread is not None and _burst_thread.is_alive():
+        print("⚠️ Burst already in progress")
+        return None
+    _burst_thread = threading.Thread(target=take_burst_screenshots, kwargs={"dedup": dedup},
+                                     name="screenshot-burst", daemon=True)
+    _burst_thread.start()
+    return _burst_thread
 
-last_screenshot_time = 0
-screenshot_cooldown = 2
-pTime = 0
 
 def fingers_up(lm_list):
     fingers = []
-    
+
     if lm_list[4][1] > lm_list[3][1]:
         fingers.append(1)
     else:
         fingers.append(0)
-    
+
     for id in [8, 12, 16, 20]:
         if lm_list[id][2] < lm_list[id-2][2]:
             fingers.append(1)
         else:
             fingers.append(0)
-    
+
     return fingers
 
-def take_screenshot():
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"screenshot_{timestamp}.png"
-    filepath = os.path.join(screenshots_folder, filename)
-    
+
+def detect_gesture(fingers):
+    total_fingers = sum(fingers)
+    if total_fingers == 5:
+        return "Open Palm"
+    if total_fingers == 0:
+        return "Closed Fist"
+    if fingers == [0, 1, 1, 0, 0]:
+        return "Peace Sign"
+    # the thumb reading depends on which hand is up, so only the other fingers decide
+    if fingers[1:] == [1, 0, 0, 0]:
+        return "Pointing"
+    if fingers[1:] == [1, 1, 1, 0]:
+        return "Three Fingers"
+    return None
+
+
+class GestureHold:
+    """Reports a gesture only once it has been seen in `frames` consecutive frames,
+    so a hand passing through a pose on its way to another does not capture"""
+
+    def __init__(self, frames=None):
+        self.frames = frames or gesture_hold_frames
+        self.gesture = None
+        self.count = 0
+
+    def update(self, gesture):
+        if gesture != self.gesture:
+            self.gesture, self.count = gesture, 0
+        self.count += 1
+        return gesture if gesture and self.count >= self.frames else None
+
+
+def _init_capture(source=0):
+    global cap, hands
+    import mediapipe as mp
+
+    cap = CameraFrameSource(source, wCam, hCam)
+    if not cap.open():
+        print("✗ Error: Cannot open webcam")
+        cap.release()
+        cap = None
+        return False
+
+    hands = mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=1,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.5
+    )
+    return True
+
+
+def get_power_metrics():
+    return frame_governor.get_metrics() if frame_governor else None
+
+
+def stop_screenshot_control():
+    global screenshot_running
+    screenshot_running = False
+    time.sleep(0.05)
+
+
+def run_screenshot_control(source=0):
+    global screenshot_running, cap, hands, frame_governor
+    import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    mp_draw = mp.solutions.drawing_utils
+
+    if screenshot_running:
+        return
+    screenshot_running = True
+    if not _init_capture(source):
+        screenshot_running = False
+        return
+
+    print("Gestures:")
+    for gesture, mode in GESTURE_MODES.items():
+        print(f"- {gesture} → {mode} screenshot")
+    print("Press 'Esc' key to exit")
+
+    last_screenshot_time = 0
+    hold = GestureHold()
+    pTime = 0
+    governor = frame_governor = FrameRateGovernor()
+    workspace = FrameWorkspace()
+    seq = 0
+
     try:
-        screenshot = pyautogui.screenshot()
-        screenshot.save(filepath)
-        print(f"✓ Screenshot saved: {filepath}")
-        return True
+        while screenshot_running:
+            if not cap.isOpened():
+                print("Failed to read from webcam")
+                break
+
+            governor.pace()
+            seq, img = cap.wait_frame(seq)
+            if img is None:
+                continue
+
+            img = workspace.mirror(img)
+            if governor.idle:
+                img_rgb = workspace.to_rgb(workspace.downscale(img), "rgb_small")
+            else:
+                img_rgb = workspace.to_rgb(img)
+            results = hands.process(img_rgb)
+            governor.mark_presence(bool(results.multi_hand_landmarks))
+            if not results.multi_hand_landmarks:
+                hold.update(None)
+
+            if results.multi_hand_landmarks:
+                for hand_landmarks in results.multi_hand_landmarks:
+                    mp_draw.draw_landmarks(img, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+
+                    h, w, c = img.shape
+                    lm_list = [[id, int(lm.x * w), int(lm.y * h)]
+                               for id, lm in enumerate(hand_landmarks.landmark)]
+
+                    if len(lm_list) >= 21:
+                        fingers = fingers_up(lm_list)
+                        gesture_name = detect_gesture(fingers)
+                        if gesture_name not in GESTURE_MODES:
+                            gesture_name = None
+                        held = hold.update(gesture_name)
+                        current_time = time.time()
+
+                        if held and (current_time - last_screenshot_time) > screenshot_cooldown:
+                            if take_screenshot(GESTURE_MODES[held]):
+                                last_screenshot_time = time.time()
+                                cv2.rectangle(img, (50, 50), (300, 100), (0, 255, 0), cv2.FILLED)
+                                cv2.putText(img, "Screenshot Taken!", (60, 80), cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 0, 0), 2)
+
+                        if gesture_name:
+                            cv2.putText(img, f"Gesture: {gesture_name} ({GESTURE_MODES[gesture_name]})", (10, 150), cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 255, 0), 2)
+                            cv2.putText(img, f"Fingers: {sum(fingers)}", (10, 180), cv2.FONT_HERSHEY_COMPLEX, 0.7, (255, 0, 0), 2)
+
+            remaining_cooldown = max(0, screenshot_cooldown - (time.time() - last_screenshot_time))
+            if remaining_cooldown > 0:
+                cv2.putText(img, f"Cooldown: {remaining_cooldown:.1f}s", (10, 400),
+                           cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 255, 255), 2)
+
+            cTime = time.time()
+            fps = 1 / (cTime - pTime) if pTime != 0 else 0
+            pTime = cTime
+            cv2.putText(img, f'FPS: {int(fps)}', (10, 30), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
+
+            cv2.imshow("Screenshot Control", img)
+
+            if cv2.waitKey(1) == 27:
+                break
+
     except Exception as e:
-        print(f"✗ Error taking screenshot: {e}")
-        return False
+        print(f"✗ Error in main loop: {e}")
+        import traceback
+        traceback.print_exc()
 
-print("Starting gesture detection...")
-print("Gestures:")
-print("- Open Palm (all fingers up) → Take Screenshot")
-print("- Closed Fist (no fingers up) → Take Screenshot")
-print("- Peace Sign (index + middle up) → Take Screenshot")
-print("Press 'Esc' key to exit")
+    finally:
+        screenshot_running = False
+        if cap:
+            cap.release()
+            cap = None
+        cv2.destroyAllWindows()
+        if hands:
+            hands.close()
+            hands = None
+        print("✓ Screenshot control stopped")
 
-try:
-    while True:
-        success, img = cap.read()
-        if not success:
-            print("Failed to read from webcam")
-            break
-
-        img = cv2.flip(img, 1) 
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        
-        results = hands.process(img_rgb)
-        
-        gesture_detected = False
-        gesture_name = ""
-        
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_draw.draw_landmarks(img, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                
-                lm_list = []
-                h, w, c = img.shape
-                for id, lm in enumerate(hand_landmarks.landmark):
-                    cx, cy = int(lm.x * w), int(lm.y * h)
-                    lm_list.append([id, cx, cy])
-                
-                if len(lm_list) >= 21: 
-                    fingers = fingers_up(lm_list)
-                    total_fingers = sum(fingers)
-                    
-                    current_time = time.time()
-                    
-                    if total_fingers == 5:
-                        gesture_detected = True
-                        gesture_name = "Open Palm"
-                    
-                    elif total_fingers == 0:
-                        gesture_detected = True
-                        gesture_name = "Closed Fist"
-                    
-                    elif fingers == [0, 1, 1, 0, 0]:
-                        gesture_detected = True
-                        gesture_name = "Peace Sign"
-                    
-                    if gesture_detected and (current_time - last_screenshot_time) > screenshot_cooldown:
-                        if take_screenshot():
-                            last_screenshot_time = current_time
-                            cv2.rectangle(img, (50, 50), (300, 100), (0, 255, 0), cv2.FILLED)
-                            cv2.putText(img, "Screenshot Taken!", (60, 80), cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 0, 0), 2)
-                    
-                    if gesture_detected:
-                        cv2.putText(img, f"Gesture: {gesture_name}", (10, 150), cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 255, 0), 2)
-                        cv2.putText(img, f"Fingers: {total_fingers}", (10, 180), cv2.FONT_HERSHEY_COMPLEX, 0.7, (255, 0, 0), 2)
-                    
-                    finger_names = ["Thumb", "Index", "Middle", "Ring", "Pinky"]
-                    for i, (finger, status) in enumerate(zip(finger_names, fingers)):
-                        color = (0, 255, 0) if status else (0, 0, 255)
-                        cv2.putText(img, f"{finger}: {'Up' if status else 'Down'}", 
-                                  (400, 50 + i*30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
-
-        remaining_cooldown = max(0, screenshot_cooldown - (time.time() - last_screenshot_time))
-        if remaining_cooldown > 0:
-            cv2.putText(img, f"Cooldown: {remaining_cooldown:.1f}s", (10, 400), 
-                       cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 255, 255), 2)
-
-        cTime = time.time()
-        fps = 1 / (cTime - pTime) if pTime != 0 else 0
-        pTime = cTime
-
-        cv2.putText(img, f'FPS: {int(fps)}', (10, 30), cv2.FONT_HERSHEY_PLAIN, 2, (255, 0, 0), 2)
-
-        cv2.imshow("Screenshot Control", img)
-
-        if cv2.waitKey(1) == 27:
-            break
-
-except Exception as e:
-    print(f"✗ Error in main loop: {e}")
-    import traceback
-    traceback.print_exc()
-
-finally:
-    print("Cleaning up...")
-    cap.release()
-    cv2.destroyAllWindows()
-    print("✓ Cleanup complete")
\ No newline at end of file
+
+if __name__ == "__main__":
+    run_screenshot_control()
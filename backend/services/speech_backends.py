@@ -0,0 +1,180 @@
+"""
+Speech recognition backends and audio sources for the voice controllers.
+A backend turns speech from an audio source into command text; the Google
+backend uploads the finished phrase, the Vosk backend decodes locally while
+the user is still speaking.
+"""
+
+import json
+import os
+import time
+
+import speech_recognition as sr
+
+_vosk_models = {}
+
+
+def load_vosk_model(model_path=None):
+    """Vosk model for `model_path` (or the small en-us model), loaded once per process"""
+    from vosk import Model, SetLogLevel
+    SetLogLevel(-1)
+    key = model_path or "en-us"
+    if key not in _vosk_models:
+        print(f"📦 Loading Vosk model: {key}")
+        _vosk_models[key] = Model(model_path) if model_path else Model(lang="en-us")
+    return _vosk_models[key]
+
+
+class GoogleSpeechBackend:
+    """Records the whole phrase, then sends it to Google's web recognizer"""
+
+    name = "google"
+
+    def __init__(self):
+        self.last_latency = None
+
+    def listen(self, recognizer, source, timeout=None, phrase_time_limit=None):
+        audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        # listen() only returns after pause_threshold seconds of silence
+        speech_end = time.time() - recognizer.pause_threshold
+        text = recognizer.recognize_google(audio)
+        self.last_latency = time.time() - speech_end
+        return text
+
+    def recognize(self, recognizer, segment):
+        """Text for an already segmented utterance, or None if unintelligible"""
+        try:
+            return recognizer.recognize_google(segment.to_audio_data())
+        except sr.UnknownValueError:
+            return None
+
+
+class VoskSpeechBackend:
+    """Offline streaming recognizer. The model is loaded once per path and
+    partial hypotheses are passed to `on_partial` while audio is still arriving.
+    Audio must be 16-bit mono PCM (the default for sr.Microphone)."""
+
+    name = "vosk"
+
+    def __init__(self, model_path=None, on_partial=None):
+        from vosk import KaldiRecognizer
+        self._recognizer_class = KaldiRecognizer
+        self.model = load_vosk_model(model_path)
+        self.on_partial = on_partial or (lambda text: print(f"💭 {text}..."))
+        self.last_latency = None
+
+    def listen(self, recognizer, source, timeout=None, phrase_time_limit=None):
+        decoder = self._recognizer_class(self.model, source.SAMPLE_RATE)
+        started = time.time()
+        phrase_start = None
+        last_partial = ""
+        last_change = None
+        text = ""
+
+        while True:
+            data = source.stream.read(source.CHUNK)
+            if not data:
+                break
+            if decoder.AcceptWaveform(data):
+                text = json.loads(decoder.Result()).get("text", "")
+                if text:
+                    break
+            else:
+                partial = json.loads(decoder.PartialResult()).get("partial", "")
+                if partial and partial != last_partial:
+                    last_partial = partial
+                    last_change = time.time()
+                    if phrase_start is None:
+                        phrase_start = last_change
+                    self.on_partial(partial)
+
+            now = time.time()
+            if phrase_start is None and timeout and now - started > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            if phrase_start is not None and phrase_time_limit and now - phrase_start > phrase_time_limit:
+                break
+
+        if not text:
+            text = json.loads(decoder.FinalResult()).get("text", "")
+        if not text:
+            raise sr.UnknownValueError()
+        self.last_latency = time.time() - last_change if last_change else None
+        return text
+
+    def recognize(self, recognizer, segment):
+        """Text for an already segmented utterance, or None if unintelligible.
+        Each call gets its own decoder, so segments can be decoded in parallel."""
+        decoder = self._recognizer_class(self.model, segment.sample_rate)
+        decoder.AcceptWaveform(segment.frame_data)
+        return json.loads(decoder.FinalResult()).get("text", "") or None
+
+
+class WavFileSource(sr.AudioSource):
+    """Plays a WAV file into the listen loops as if it were a microphone.
+
+    The file stays open across `with` blocks so each listen() continues where
+    the previous one stopped, and reads are paced in real time so latency
+    measurements match live speech. `exhausted` is set at end of file.
+    """
+
+    def __init__(self, path, realtime=True):
+        self.path = path
+        self.realtime = realtime
+        self.exhausted = False
+        self._audio_file = sr.AudioFile(path)
+        self._file_stream = None
+        self.stream = None
+
+    def __enter__(self):
+        if self._file_stream is None:
+            self._audio_file.__enter__()
+            self._file_stream = self._audio_file.stream
+            self.SAMPLE_RATE = self._audio_file.SAMPLE_RATE
+            self.SAMPLE_WIDTH = self._audio_file.SAMPLE_WIDTH
+            self.CHUNK = self._audio_file.CHUNK
+            self.stream = self
+            self._next_read = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def read(self, size):
+        data = self._file_stream.read(size)
+        if not data:
+            self.exhausted = True
+            return data
+        if self.realtime:
+            self._next_read += size / self.SAMPLE_RATE
+            delay = self._next_read - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        return data
+
+    def close(self):
+        if self._file_stream is not None:
+            self._audio_file.__exit__(None, None, None)
+            self._file_stream = None
+
+
+def create_speech_backend(name=None):
+    """Backend named by `name` or SPEECH_BACKEND (google|vosk); falls back to Google"""
+    name = (name or os.getenv("SPEECH_BACKEND", "google")).lower()
+    if name == "vosk":
+        try:
+            return VoskSpeechBackend(os.getenv("VOSK_MODEL_PATH"))
+        except ImportError:
+            print("⚠️ vosk not installed. Install with: pip install vosk")
+        except Exception as e:
+            print(f"⚠️ Failed to load Vosk model: {e}")
+        print("💡 Falling back to Google speech recognition")
+    return GoogleSpeechBackend()
+
+
+def create_audio_source(wav_path=None):
+    """WAV replay source when `wav_path` or VOICE_INPUT_WAV is set, otherwise the microphone"""
+    wav_path = wav_path or os.getenv("VOICE_INPUT_WAV")
+    if wav_path:
+        print(f"🎞️ Using recorded audio input: {wav_path}")
+        return WavFileSource(wav_path)
+    return sr.Microphone()
@@ -0,0 +1,258 @@
+"""
+Incremental text-to-speech for long answers.
+Streamed LLM text is cut into sentences as it arrives and spoken from a
+single queue thread, so speech starts after the first sentence instead of
+after the whole response. Each command starts a new utterance group,
+which cancels whatever the previous command still has queued or is
+speaking.
+"""
+
+import queue
+import re
+import threading
+import time
+
+# a sentence ends at . ! ? (plus closing quotes/brackets) followed by whitespace, or at a line break
+_SENTENCE_END = re.compile(r"""(?<=[.!?])["')\]]*\s+|\n+""")
+
+
+class SentenceChunker:
+    """Turns a stream of text fragments into whole sentences.
+
+    Sentences longer than `max_chars` are cut at the last space before the
+    limit, so a run-on list does not hold up speech.
+    """
+
+    def __init__(self, max_chars=240):
+        self.max_chars = max_chars
+        self._buffer = ""
+
+    def feed(self, text):
+        """Sentences completed by `text`"""
+        self._buffer += text
+        sentences = []
+        while True:
+            match = _SENTENCE_END.search(self._buffer)
+            if match and match.start() <= self.max_chars:
+                sentence, self._buffer = self._buffer[:match.start()], self._buffer[match.end():]
+            elif len(self._buffer) > self.max_chars:
+                cut = self._buffer.rfind(" ", 0, self.max_chars)
+                cut = cut if cut > 0 else self.max_chars
+                sentence, self._buffer = self._buffer[:cut], self._buffer[cut:].lstrip()
+            else:
+                break
+            sentence = _clean(sentence)
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+
+    def flush(self):
+        sentence, self._buffer = _clean(self._buffer), ""
+        return [sentence] if sentence else []
+
+
+def _clean(text):
+    """Drop markdown markers that TTS engines read out literally"""
+    return re.sub(r"[*#_`]+", "", text).strip()
+
+
+class Pyttsx3Voice:
+    """Speaks one sentence at a time on a pyttsx3 engine; only used from the queue thread.
+
+    pyttsx3 is not thread-safe, so a cancelled sentence is stopped from the
+    engine's own word callback, which runs inside `runAndWait`.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._cancelled = None
+        engine.connect("started-word", self._on_word)
+
+    def _on_word(self, name, location, length):
+        if self._cancelled is not None and self._cancelled():
+            self.engine.stop()
+
+    def speak(self, text, cancelled=lambda: False):
+        self._cancelled = cancelled
+        try:
+            self.engine.say(text)
+            self.engine.runAndWait()
+        finally:
+            self._cancelled = None
+
+
+class SpeechQueue:
+    """Speaks queued sentences in order on one worker thread.
+
+    `begin()` starts a new group of sentences and cancels the previous one:
+    queued sentences of older groups are skipped and the sentence being
+    spoken is stopped. Only the worker touches the voice; `voice.speak(text,
+    cancelled)` is expected to stop on its own once `cancelled()` turns True.
+    `first_audio` holds the time from `begin()` to the first sentence of the
+    current group reaching the voice.
+    """
+
+    def __init__(self, voice):
+        self.voice = voice
+        self.first_audio = None
+        self._generation = 0
+        self._started = time.perf_counter()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def begin(self):
+        """Cancel anything pending and return a token for the new group"""
+        with self._lock:
+            self._generation += 1
+            self._started = time.perf_counter()
+            self.first_audio = None
+            return self._generation
+
+    def current(self):
+        """Token of the current group"""
+        return self._generation
+
+    def cancelled(self, token):
+        return token != self._generation
+
+    def say(self, text, token=None):
+        """Queue `text` in the group of `token`, by default the current one"""
+        self._queue.put((self._generation if token is None else token, text))
+
+    def wait(self, timeout=None):
+        """Block until everything queued so far has been spoken or skipped"""
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def _run(self):
+        while True:
+            token, text = self._queue.get()
+            if token is None:
+                text.set()
+                continue
+            with self._lock:
+                if token != self._generation:
+                    continue
+                if self.first_audio is None:
+                    self.first_audio = time.perf_counter() - self._started
+            try:
+                self.voice.speak(text, lambda token=token: self.cancelled(token))
+            except Exception as e:
+                print(f"⚠️ TTS error: {e}")
+
+
+def speak_stream(fragments, speech, on_text=None):
+    """Speak streamed `fragments` sentence by sentence; returns the full text.
+
+    The sentences join the current group on `speech`, after anything the
+    command already said. Stops reading the stream as soon as another group
+    is started, e.g. because a new command came in. `on_text` sees every
+    fragment, for printing it as it arrives.
+    """
+    token = speech.current() if speech else None
+    chunker = SentenceChunker()
+    parts = []
+    for fragment in fragments:
+        if speech and speech.cancelled(token):
+            close = getattr(fragments, "close", None)
+            if close:
+                close()
+            break
+        parts.append(fragment)
+        if on_text:
+            on_text(fragment)
+        if speech:
+            for sentence in chunker.feed(fragment):
+                speech.say(sentence, token)
+    else:
+        if speech:
+            for sentence in chunker.flush():
+                speech.say(sentence, token)
+    return "".join(parts)
+
+
+def _benchmark(words=120, words_per_chunk=4, chunk_delay=0.05):
+    """Time to first audio with and without streaming, against a local fake streaming endpoint"""
+    import http.server
+    import urllib.request
+
+    answer = ("The screen shows a code editor with a Python file open. " * (words // 10 + 1)).split()[:words]
+
+    class StreamingHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for i in range(0, len(answer), words_per_chunk):
+                    time.sleep(chunk_delay)
+                    data = (" ".join(answer[i:i + words_per_chunk]) + " ").encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # the client stopped reading because the answer was cancelled
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StreamingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+
+    def stream():
+        with urllib.request.urlopen(url) as response:
+            while True:
+                chunk = response.read1(4096)
+                if not chunk:
+                    break
+                yield chunk.decode("utf-8")
+
+    class RecordingVoice:
+        def __init__(self):
+            self.spoken = []
+
+        def speak(self, text, cancelled):
+            self.spoken.append(text)
+            for _ in text.split():
+                if cancelled():
+                    return
+                time.sleep(0.01)
+
+    try:
+        voice = RecordingVoice()
+        speech = SpeechQueue(voice)
+
+        start = time.perf_counter()
+        full = "".join(stream())
+        speech.say(full)
+        speech.wait()
+        print(f"📊 whole response, then speak: first audio after {(time.perf_counter() - start) * 1000:6.0f} ms")
+
+        speech.begin()
+        speak_stream(stream(), speech)
+        first_audio = speech.first_audio
+        speech.wait()
+        print(f"📊 streamed, sentence by sentence: first audio after {first_audio * 1000:6.0f} ms "
+              f"({len(voice.spoken) - 1} sentences)")
+
+        start = time.perf_counter()
+        speech.begin()
+        fragments = stream()
+        threading.Timer(0.3, speech.begin).start()
+        text = speak_stream(fragments, speech)
+        print(f"🛑 cancelled by a new command after {(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"{len(text.split())} of {words} words read")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -8,12 +8,39 @@ import psutil
 import shutil
 from pathlib import Path
 import json
+import threading
+
+try:
+    from .fuzzy_matcher import FuzzyMatcher
+    from .app_index import AppIndex
+    from .file_index import FileIndex
+    from .parallel_scan import ParallelScanner
+    from .window_registry import WindowRegistry
+    from .ui_wait import Win32Desktop, show_desktop, open_from_start_menu
+    from .text_input import TextInjector
+except ImportError:
+    from fuzzy_matcher import FuzzyMatcher
+    from app_index import AppIndex
+    from file_index import FileIndex
+    from parallel_scan import ParallelScanner
+    from window_registry import WindowRegistry
+    from ui_wait import Win32Desktop, show_desktop, open_from_start_menu
+    from text_input import TextInjector
 
 class SystemController:
     
-    def __init__(self):
+    def __init__(self, window_registry=None):
+        self.app_index = AppIndex.from_env()
+        self.app_index.start()
+        self.file_index = FileIndex.from_env()
+        self.file_index.start()
+        self.scanner = ParallelScanner()
+        self.windows = window_registry or WindowRegistry(watch=True)
+        self.desktop = Win32Desktop()
+        self.text_input = TextInjector()
         self.app_mappings = self._load_app_mappings()
         self.special_paths = self._get_special_paths()
+        self.app_matcher = FuzzyMatcher(self.app_mappings, min_score=0.8)
         print("✅ System Controller initialized")
     
     def _load_app_mappings(self):
@@ -66,43 +93,20 @@ class SystemController:
             if key not in mappings:
                 mappings[key] = value
         
+        # paths that don't exist on this machine are resolved through the app index at launch time
         for app_name, path_template in list(mappings.items()):
             if "{}" in path_template:
-                try:
-                    actual_path = path_template.format(os.getenv('USERNAME', ''))
-                    if os.path.exists(actual_path):
-                        mappings[app_name] = actual_path
-                    else:
-                        found = self._find_app_path(app_name)
-                        if found:
-                            mappings[app_name] = found
-                except:
-                    pass
-            elif not os.path.exists(path_template) and not path_template.endswith('.exe'):
-                found = self._find_app_path(app_name)
-                if found:
-                    mappings[app_name] = found
+                mappings[app_name] = path_template.format(os.getenv('USERNAME', ''))
         
         return mappings
     
-    def _find_app_path(self, app_name):
-        common_paths = [
-            r"C:\Program Files",
-            r"C:\Program Files (x86)",
-            r"C:\Users\{}\AppData\Local\Programs".format(os.getenv('USERNAME', '')),
-            r"C:\Users\{}\AppData\Roaming".format(os.getenv('USERNAME', '')),
-        ]
-        
-        for base_path in common_paths:
-            if not os.path.exists(base_path):
-                continue
-            for root, dirs, files in os.walk(base_path):
-                for file in files:
-                    if app_name.lower() in file.lower() and file.endswith('.exe'):
-                        full_path = os.path.join(root, file)
-                        if os.path.exists(full_path):
-                            return full_path
-        return None
+    def _find_app_path(self, app_name, timeout=2.0):
+        found = self.app_index.find(app_name, timeout=timeout)
+        if found or self.app_index.ready.is_set():
+            return found
+        # first run and the index is still building: look for the executable directly
+        target = app_name.lower().strip() + ".exe"
+        return self.scanner.first(self.app_index.roots, lambda name, is_dir: not is_dir and name == target)
     
     def _get_special_paths(self):
         return {
@@ -124,6 +128,8 @@ class SystemController:
             
             if app_name_lower in self.app_mappings:
                 path = self.app_mappings[app_name_lower]
+                if os.path.isabs(path) and not os.path.exists(path):
+                    path = self._find_app_path(app_name_lower) or path
                 if path.startswith("ms-settings:"):
                     subprocess.Popen(["start", path], shell=True)
                 elif os.path.exists(path) or path.endswith('.exe'):
@@ -133,6 +139,11 @@ class SystemController:
                     subprocess.Popen([path], shell=True)
                     return f"✅ Launched {app_name}"
             
+            corrected, score = self.app_matcher.match(app_name_lower)
+            if corrected and corrected != app_name_lower:
+                print(f"🔤 No app named '{app_name}', launching '{corrected}' ({score:.0%} match)")
+                return self.launch_app(corrected)
+            
             found_path = self._find_app_path(app_name_lower)
             if found_path:
                 subprocess.Popen([found_path])
@@ -185,50 +196,50 @@ class SystemController:
         
         folder_name_lower = folder_name.lower()
         
-        for location in search_locations:
-            if not os.path.exists(location):
-                continue
-            try:
-                for root, dirs, files in os.walk(location):
-                    for dir_name in dirs:
-                        if folder_name_lower in dir_name.lower():
-                            full_path = os.path.join(root, dir_name)
-                            if os.path.isdir(full_path):
-                                return full_path
-                    if root.count(os.sep) > 3:
-                        dirs[:] = []  
-            except PermissionError:
-                continue
+        if self.file_index.ready.wait(2.0):
+            found = self.file_index.search(folder_name_lower, limit=1, kind="folder")
+            if found:
+                return found[0]
+            search_locations = [loc for loc in search_locations if not self.file_index.covers(loc)]
         
-        return None
+        return self.scanner.first(search_locations, lambda name, is_dir: is_dir and folder_name_lower in name,
+                                  max_depth=4)
     
-    def search_files(self, query, location=None):
+    def search_files(self, query, location=None, on_result=None):
         try:
             search_path = location if location and os.path.exists(location) else os.path.expanduser("~")
             
             results = []
             query_lower = query.lower()
+            opened = None
             
-            try:
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        if query_lower in file.lower():
-                            results.append(os.path.join(root, file))
-                            if len(results) >= 10:  
-                                break
-                    
-                    if len(results) >= 10:
-                        break
-                    
-                    if root.count(os.sep) > 5:
-                        dirs[:] = []
-            except PermissionError:
-                pass
+            if self.file_index.covers(search_path) and self.file_index.ready.wait(2.0):
+                results = self.file_index.search(query_lower, kind="file", under=search_path)
+            else:
+                # cold search: open the first hit as soon as it streams in, keep counting for 2 more seconds
+                cancel = threading.Event()
+                stream = self.scanner.scan([search_path], lambda name, is_dir: not is_dir and query_lower in name,
+                                           cancel=cancel)
+                try:
+                    for path in stream:
+                        results.append(path)
+                        if opened is None:
+                            opened = path
+                            subprocess.Popen(["explorer.exe", os.path.dirname(path)])
+                            if on_result:
+                                on_result(f"✅ Found {os.path.basename(path)}, opening its folder")
+                            timer = threading.Timer(2.0, cancel.set)
+                            timer.daemon = True
+                            timer.start()
+                        if len(results) >= 10:
+                            break
+                finally:
+                    stream.close()
             
             if results:
                 first_result = results[0]
-                folder_path = os.path.dirname(first_result)
-                subprocess.Popen(["explorer.exe", folder_path])
+                if opened is None:
+                    subprocess.Popen(["explorer.exe", os.path.dirname(first_result)])
                 return f"✅ Found {len(results)} file(s). Opened folder containing: {os.path.basename(first_result)}"
             else:
                 return f"❌ No files found matching: {query}"
@@ -290,32 +301,15 @@ class SystemController:
             return f"❌ Failed to get system info: {e}"
     
     def get_all_windows(self):
-        windows = []
-        
-        def enum_windows_callback(hwnd, window_list):
-            if win32gui.IsWindowVisible(hwnd):
-                try:
-                    title = win32gui.GetWindowText(hwnd)
-                    if title:
-                        window_list.append((hwnd, title))
-                except:
-                    pass
-            return True
-        
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        return windows
-    
+        return [(window.hwnd, window.title) for window in self.windows.titled()]
+
     def switch_to_window(self, window_name):
         try:
-            windows = self.get_all_windows()
-            window_name_lower = window_name.lower()
-            
-            for hwnd, title in windows:
-                if window_name_lower in title.lower():
-                    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                    win32gui.SetForegroundWindow(hwnd)
-                    return f"✅ Switched to {title}"
-            
+            for window in self.windows.find_title(window_name)[:1]:
+                win32gui.ShowWindow(window.hwnd, win32con.SW_RESTORE)
+                win32gui.SetForegroundWindow(window.hwnd)
+                return f"✅ Switched to {window.title}"
+
             return f"❌ Window not found: {window_name}"
         except Exception as e:
             return f"❌ Failed to switch window: {e}"
@@ -369,7 +363,7 @@ class SystemController:
     
     def show_desktop(self):
         try:
-            pyautogui.hotkey('win', 'd')
+            self.desktop.hotkey('win', 'd')
             return "✅ Showing desktop"
         except Exception as e:
             return f"❌ Failed to show desktop: {e}"
@@ -392,14 +386,8 @@ class SystemController:
     
     def open_desktop_icon(self, icon_name):
         try:
-            pyautogui.hotkey('win', 'd')
-            time.sleep(0.5)
-            
-            pyautogui.hotkey('win')
-            time.sleep(0.3)
-            pyautogui.typewrite(icon_name, interval=0.1)
-            time.sleep(0.5)
-            pyautogui.press('enter')
+            open_from_start_menu(self.desktop, lambda text: self.text_input.type_text(text, "start_search"),
+                                 icon_name)
             
             return f"✅ Opened {icon_name}"
         except Exception as e:
@@ -407,9 +395,8 @@ class SystemController:
     
     def refresh_desktop(self):
         try:
-            pyautogui.hotkey('win', 'd')
-            time.sleep(0.3)
-            pyautogui.press('f5')
+            show_desktop(self.desktop)
+            self.desktop.press('f5')
             return "✅ Desktop refreshed"
         except Exception as e:
             return f"❌ Failed to refresh desktop: {e}"
@@ -0,0 +1,283 @@
+"""
+Text injection for the voice commands that type into other windows.
+A whole string goes in as one clipboard paste or one `SendInput` batch of
+Unicode key events instead of one `pyautogui.typewrite` call (and sleep)
+per character. Which method a field gets is set per target, with plain
+typing as the last resort for fields that reject both. A paste is only
+used when the clipboard can be put back afterwards, and counts as done
+only when the field can be seen to hold the text (or cannot be read).
+"""
+
+import threading
+import time
+
+try:
+    import ctypes
+    from ctypes import wintypes
+    import pyautogui
+    import win32clipboard
+    import win32con
+    WIN32_AVAILABLE = True
+except (ImportError, ValueError):
+    WIN32_AVAILABLE = False
+
+# tried in order until one succeeds
+TARGET_STRATEGIES = {
+    # the omnibox takes a paste as one edit, so autocomplete runs once instead of per character
+    "address_bar": ("paste", "unicode", "typewrite"),
+    "find_box": ("unicode", "typewrite"),
+    "explorer_search": ("unicode", "typewrite"),
+    "start_search": ("unicode", "typewrite"),
+    "default": ("unicode", "paste", "typewrite"),
+}
+
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+VK_RETURN = 0x0D
+VK_CONTROL = 0x11
+VK_V = 0x56
+WM_GETTEXT = 0x000D
+WM_GETTEXTLENGTH = 0x000E
+SMTO_ABORTIFHUNG = 0x0002
+# Windows derives these from CF_UNICODETEXT, so they need not be saved
+CF_TEXT, CF_OEMTEXT, CF_LOCALE = 1, 7, 16
+# windows whose fields ignore Ctrl+V or send it elsewhere (terminals, remote desktop): always typed into
+NO_PASTE_CLASSES = {"ConsoleWindowClass", "PuTTY", "mintty", "TscShellContainerClass"}
+# standard edit controls, whose text can be read back to check a paste landed
+EDIT_CLASSES = ("Edit", "RichEdit", "RICHEDIT")
+
+if WIN32_AVAILABLE:
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD), ("dwFlags", wintypes.DWORD),
+                    ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG), ("mouseData", wintypes.DWORD),
+                    ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
+
+    class GUITHREADINFO(ctypes.Structure):
+        _fields_ = [("cbSize", wintypes.DWORD), ("flags", wintypes.DWORD), ("hwndActive", wintypes.HWND),
+                    ("hwndFocus", wintypes.HWND), ("hwndCapture", wintypes.HWND),
+                    ("hwndMenuOwner", wintypes.HWND), ("hwndMoveSize", wintypes.HWND),
+                    ("hwndCaret", wintypes.HWND), ("rcCaret", wintypes.RECT)]
+
+
+def _key_events(text):
+    """(vk, scan, flags) for every key down and up needed to type `text`"""
+    events = []
+    units = text.replace("\r\n", "\n").encode("utf-16-le")
+    for i in range(0, len(units), 2):
+        unit = int.from_bytes(units[i:i + 2], "little")
+        if unit in (0x0A, 0x0D):
+            events += [(VK_RETURN, 0, 0), (VK_RETURN, 0, KEYEVENTF_KEYUP)]
+        else:
+            events += [(0, unit, KEYEVENTF_UNICODE), (0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)]
+    return events
+
+
+class Win32InputBackend:
+    """Clipboard paste, one-batch `SendInput` and pyautogui typing on the real desktop"""
+
+    def __init__(self, restore_delay=0.5, verify_timeout=0.3):
+        # the target reads the clipboard when it handles Ctrl+V, so the old contents are put back a little later
+        self.restore_delay = restore_delay
+        self.verify_timeout = verify_timeout
+
+    def send_events(self, events):
+        inputs = (INPUT * len(events))()
+        for item, (vk, scan, flags) in zip(inputs, events):
+            item.type = INPUT_KEYBOARD
+            item.union.ki = KEYBDINPUT(vk, scan, flags, 0, 0)
+        sent = ctypes.windll.user32.SendInput(len(events), inputs, ctypes.sizeof(INPUT))
+        return sent == len(events)
+
+    def unicode(self, text):
+        return self.send_events(_key_events(text))
+
+    def paste(self, text):
+        user32 = ctypes.windll.user32
+        if _class_name(user32.GetForegroundWindow()) in NO_PASTE_CLASSES:
+            return False
+        field = self._focused_edit()
+        try:
+            win32clipboard.OpenClipboard()
+        except Exception:
+            return False
+        try:
+            previous = _save_clipboard()
+            if previous is None:
+                # an image or copied files can't be put back afterwards, so leave them alone
+                return False
+            win32clipboard.EmptyClipboard()
+            win32clipboard.SetClipboardText(text, win32con.CF_UNICODETEXT)
+        finally:
+            win32clipboard.CloseClipboard()
+        pasted = self.send_events([(VK_CONTROL, 0, 0), (VK_V, 0, 0),
+                                   (VK_V, 0, KEYEVENTF_KEYUP), (VK_CONTROL, 0, KEYEVENTF_KEYUP)])
+        if pasted and field:
+            # a field that ignores Ctrl+V must fall through to typing instead of reporting success
+            pasted = self._wait_for_text(field, text)
+        timer = threading.Timer(self.restore_delay, self._restore, args=(text, previous))
+        timer.daemon = True
+        timer.start()
+        return pasted
+
+    def _focused_edit(self):
+        """The focused control of the foreground window if it is a standard edit control, else None"""
+        info = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+        if not ctypes.windll.user32.GetGUIThreadInfo(0, ctypes.byref(info)) or not info.hwndFocus:
+            return None
+        return info.hwndFocus if _class_name(info.hwndFocus).startswith(EDIT_CLASSES) else None
+
+    def _wait_for_text(self, field, text):
+        deadline = time.perf_counter() + self.verify_timeout
+        while True:
+            if text in _control_text(field):
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.02)
+
+    def _restore(self, pasted, previous):
+        try:
+            win32clipboard.OpenClipboard()
+            try:
+                # leave the clipboard alone if something else was copied in the meantime
+                if win32clipboard.GetClipboardData(win32con.CF_UNICODETEXT) == pasted:
+                    win32clipboard.EmptyClipboard()
+                    for clipboard_format, data in previous:
+                        win32clipboard.SetClipboardData(clipboard_format, data)
+            finally:
+                win32clipboard.CloseClipboard()
+        except Exception:
+            pass
+
+    def typewrite(self, text):
+        pyautogui.write(text)
+        return True
+
+
+def _save_clipboard():
+    """(format, data) for everything on the open clipboard, or None if some of it can't be copied
+    back later, e.g. a bitmap or a file list"""
+    saved = []
+    clipboard_format = win32clipboard.EnumClipboardFormats(0)
+    while clipboard_format:
+        if clipboard_format not in (CF_TEXT, CF_OEMTEXT, CF_LOCALE):
+            try:
+                data = win32clipboard.GetClipboardData(clipboard_format)
+            except Exception:
+                return None
+            if not isinstance(data, (bytes, str)):
+                return None
+            saved.append((clipboard_format, data))
+        clipboard_format = win32clipboard.EnumClipboardFormats(clipboard_format)
+    return saved
+
+
+def _class_name(hwnd):
+    buffer = ctypes.create_unicode_buffer(256)
+    return buffer.value if hwnd and ctypes.windll.user32.GetClassNameW(hwnd, buffer, 256) else ""
+
+
+def _control_text(hwnd):
+    """Text of a control in another process; WM_GETTEXT is marshalled across processes, GetWindowText isn't"""
+    user32, result = ctypes.windll.user32, ctypes.c_size_t()
+    if not user32.SendMessageTimeoutW(hwnd, WM_GETTEXTLENGTH, 0, 0, SMTO_ABORTIFHUNG, 100, ctypes.byref(result)):
+        return ""
+    buffer = ctypes.create_unicode_buffer(result.value + 1)
+    if not user32.SendMessageTimeoutW(hwnd, WM_GETTEXT, len(buffer), buffer, SMTO_ABORTIFHUNG, 100,
+                                      ctypes.byref(result)):
+        return ""
+    return buffer.value
+
+
+class FakeInputBackend:
+    """Records injected text for tests and benchmarks.
+
+    Each synthesized key event costs `event_cost` seconds and a paste costs
+    `paste_cost`, to model how long the target takes to take the input in.
+    `rejects` names strategies the focused field refuses.
+    """
+
+    def __init__(self, event_cost=0.00005, paste_cost=0.002, typewrite_pause=0.1, rejects=()):
+        self.event_cost = event_cost
+        self.paste_cost = paste_cost
+        self.typewrite_pause = typewrite_pause
+        self.rejects = set(rejects)
+        self.text = ""
+
+    def unicode(self, text):
+        if "unicode" in self.rejects:
+            return False
+        time.sleep(self.event_cost * len(_key_events(text)))
+        self.text += text
+        return True
+
+    def paste(self, text):
+        if "paste" in self.rejects:
+            return False
+        time.sleep(self.paste_cost)
+        self.text += text
+        return True
+
+    def typewrite(self, text):
+        # pyautogui sends every character as its own key press, then pauses once per call
+        time.sleep(self.event_cost * 2 * len(text) + self.typewrite_pause)
+        self.text += text
+        return True
+
+
+class TextInjector:
+    """Types text into the focused field with the strategies listed for its target"""
+
+    def __init__(self, backend=None, strategies=None):
+        self.backend = backend or Win32InputBackend()
+        self.strategies = dict(TARGET_STRATEGIES, **(strategies or {}))
+
+    def type_text(self, text, target="default"):
+        """Inject `text`; returns the strategy that worked, or None"""
+        if not text:
+            return None
+        for strategy in self.strategies.get(target, self.strategies["default"]):
+            try:
+                if getattr(self.backend, strategy)(text):
+                    return strategy
+            except Exception as e:
+                print(f"⚠️ Text input via {strategy} failed: {e}")
+        return None
+
+
+def _benchmark(text="how to make sourdough bread at home fast", repeats=5):
+    """Characters per second of each strategy on a fake input backend"""
+    def per_character():
+        # what _search_with_pyautogui used to do: one typewrite call and an 80 ms sleep per character
+        for char in text:
+            backend.typewrite(char)
+            time.sleep(0.08)
+
+    backend = FakeInputBackend()
+    runs = [("per-char + 80 ms sleeps", per_character)]
+    for strategy in ("typewrite", "unicode", "paste"):
+        runs.append((strategy, lambda strategy=strategy: getattr(backend, strategy)(text)))
+    rejecting = TextInjector(FakeInputBackend(rejects=("paste",)))
+    runs.append(("address bar, paste rejected", lambda: rejecting.type_text(text, "address_bar")))
+
+    print(f"⌨️ {len(text)} characters: '{text}'")
+    for label, run in runs:
+        start = time.perf_counter()
+        for _ in range(1 if label.startswith("per-char") else repeats):
+            run()
+        elapsed = (time.perf_counter() - start) / (1 if label.startswith("per-char") else repeats)
+        print(f"📊 {label:>28}: {elapsed * 1000:8.1f} ms, {len(text) / elapsed:10.0f} chars/s")
+
+
+if __name__ == "__main__":
+    _benchmark()
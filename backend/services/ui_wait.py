@@ -0,0 +1,266 @@
+"""
+Condition-based waits for UI automation.
+Instead of sleeping a fixed time after a keystroke or window call, actions
+poll what they are waiting for (a window in front, the clipboard changed,
+an element on the page) with a short backoff and give up at a deadline.
+The desktop is reached through a small backend so the same actions run
+against `FakeDesktop` in tests and benchmarks.
+"""
+
+import time
+
+try:
+    import pyautogui
+    import win32clipboard
+    import win32con
+    import win32gui
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+DESKTOP_CLASSES = ("Progman", "WorkerW")
+
+
+def wait_until(predicate, timeout=2.0, interval=0.005, max_interval=0.05, backoff=1.5,
+               clock=time.monotonic, sleep=time.sleep):
+    """Poll `predicate` until it returns something truthy and return that value.
+
+    Polling starts every `interval` seconds and backs off to `max_interval`.
+    Returns the last (falsy) result once `timeout` seconds have passed.
+    Exceptions from the predicate count as not ready yet.
+    """
+    deadline = clock() + timeout
+    while True:
+        try:
+            result = predicate()
+        except Exception:
+            result = None
+        if result or clock() >= deadline:
+            return result
+        sleep(min(interval, max(0.0, deadline - clock())))
+        interval = min(interval * backoff, max_interval)
+
+
+class Win32Desktop:
+    """Foreground window, window state, clipboard and keyboard of the real desktop"""
+
+    def foreground(self):
+        return win32gui.GetForegroundWindow()
+
+    def title(self, hwnd):
+        return win32gui.GetWindowText(hwnd) if hwnd else ""
+
+    def class_name(self, hwnd):
+        return win32gui.GetClassName(hwnd) if hwnd else ""
+
+    def activate(self, hwnd):
+        win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+        win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
+        win32gui.SetForegroundWindow(hwnd)
+
+    def minimize(self, hwnd):
+        win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+
+    def maximize(self, hwnd):
+        win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
+
+    def is_minimized(self, hwnd):
+        return bool(win32gui.IsIconic(hwnd))
+
+    def is_maximized(self, hwnd):
+        return win32gui.GetWindowPlacement(hwnd)[1] == win32con.SW_SHOWMAXIMIZED
+
+    def clipboard_sequence(self):
+        return win32clipboard.GetClipboardSequenceNumber()
+
+    def clipboard_text(self):
+        win32clipboard.OpenClipboard()
+        try:
+            return win32clipboard.GetClipboardData(win32con.CF_UNICODETEXT)
+        finally:
+            win32clipboard.CloseClipboard()
+
+    def hotkey(self, *keys):
+        pyautogui.hotkey(*keys)
+
+    def press(self, key, presses=1):
+        pyautogui.press(key, presses=presses)
+
+
+def focus_window(desktop, hwnd, timeout=1.0):
+    """Bring `hwnd` to the front; True once it is the foreground window"""
+    desktop.activate(hwnd)
+    return bool(wait_until(lambda: desktop.foreground() == hwnd, timeout))
+
+
+def wait_for_foreground(desktop, accept, timeout=1.0):
+    """Wait until `accept(title, class_name)` holds for the foreground window; returns its handle or None"""
+    def ready():
+        hwnd = desktop.foreground()
+        return hwnd if hwnd and accept(desktop.title(hwnd), desktop.class_name(hwnd)) else None
+    return wait_until(ready, timeout)
+
+
+def copy_text(desktop, keys=("ctrl", "c"), timeout=1.0):
+    """Send the copy shortcut and return the new clipboard text, or None if the clipboard never changed"""
+    before = desktop.clipboard_sequence()
+    desktop.hotkey(*keys)
+    if not wait_until(lambda: desktop.clipboard_sequence() != before, timeout):
+        return None
+    return wait_until(desktop.clipboard_text, timeout=0.2)
+
+
+def show_desktop(desktop, timeout=1.0):
+    """Win+D, then wait for the desktop to be in front; returns whether it is"""
+    desktop.hotkey('win', 'd')
+    return wait_for_foreground(desktop, lambda title, class_name: class_name in DESKTOP_CLASSES, timeout) is not None
+
+
+def cycle_to_window(desktop, accept, attempts=3, timeout=0.8):
+    """Alt+Tab until `accept(title, class_name)` holds for the foreground window; returns its handle or None"""
+    for _ in range(attempts):
+        desktop.hotkey('alt', 'tab')
+        hwnd = wait_for_foreground(desktop, accept, timeout)
+        if hwnd:
+            return hwnd
+    return None
+
+
+def read_address_bar(desktop, timeout=1.0):
+    """Text of the focused browser's address bar, copied through the clipboard; None if nothing was copied"""
+    desktop.hotkey('ctrl', 'l')
+    desktop.hotkey('ctrl', 'a')
+    try:
+        return copy_text(desktop, timeout=timeout)
+    finally:
+        desktop.press('escape')
+
+
+def open_from_start_menu(desktop, type_text, name, results_delay=0.5, timeout=1.0):
+    """Show the desktop, open Start, type `name` with `type_text(name)` and launch the first result"""
+    show_desktop(desktop, timeout)
+    desktop_hwnd = desktop.foreground()
+    desktop.press('win')
+    wait_until(lambda: desktop.foreground() != desktop_hwnd, timeout)
+    type_text(name)
+    # search results fill in asynchronously and expose nothing to poll for
+    time.sleep(results_delay)
+    desktop.press('enter')
+
+
+def element_present(driver, by, selector):
+    """Predicate for `wait_until`: the matching elements once there is at least one"""
+    return lambda: driver.find_elements(by, selector)
+
+
+class FakeDesktop:
+    """Scripted desktop for tests and benchmarks.
+
+    `windows` maps handles to (title, class_name). Focus, window state and
+    clipboard changes land `latency` seconds after the call that causes
+    them, like a busy real desktop. Ctrl+C copies `selection`, Win+D brings
+    `desktop_hwnd` to the front, the Win key `start_hwnd` and Alt+Tab the
+    previously active window. Every key sent is recorded in `keys`.
+    """
+
+    def __init__(self, windows, foreground=None, latency=0.05, desktop_hwnd=None, selection="", start_hwnd=None):
+        self.windows = dict(windows)
+        self.latency = latency
+        self.desktop_hwnd = desktop_hwnd
+        self.start_hwnd = start_hwnd
+        self.selection = selection
+        self.keys = []
+        self._foreground = [(0.0, foreground)]
+        self._clipboard = [(0.0, (0, ""))]
+        self._state = {}
+
+    def _later(self, timeline, value):
+        timeline.append((time.monotonic() + self.latency, value))
+
+    @staticmethod
+    def _now(timeline):
+        now = time.monotonic()
+        return [value for at, value in timeline if at <= now][-1]
+
+    def foreground(self):
+        return self._now(self._foreground)
+
+    def title(self, hwnd):
+        return self.windows.get(hwnd, ("", ""))[0]
+
+    def class_name(self, hwnd):
+        return self.windows.get(hwnd, ("", ""))[1]
+
+    def activate(self, hwnd):
+        self._state[hwnd] = [(0.0, "normal")]
+        self._later(self._foreground, hwnd)
+
+    def minimize(self, hwnd):
+        self._later(self._state.setdefault(hwnd, [(0.0, "normal")]), "minimized")
+
+    def maximize(self, hwnd):
+        self._later(self._state.setdefault(hwnd, [(0.0, "normal")]), "maximized")
+
+    def is_minimized(self, hwnd):
+        return self._now(self._state.get(hwnd, [(0.0, "normal")])) == "minimized"
+
+    def is_maximized(self, hwnd):
+        return self._now(self._state.get(hwnd, [(0.0, "normal")])) == "maximized"
+
+    def clipboard_sequence(self):
+        return self._now(self._clipboard)[0]
+
+    def clipboard_text(self):
+        return self._now(self._clipboard)[1]
+
+    def hotkey(self, *keys):
+        self.keys.append("+".join(keys))
+        if keys == ("ctrl", "c"):
+            self._later(self._clipboard, (self._clipboard[-1][1][0] + 1, self.selection))
+        elif keys == ("win", "d") and self.desktop_hwnd is not None:
+            self._later(self._foreground, self.desktop_hwnd)
+        elif keys == ("alt", "tab"):
+            previous = [hwnd for _, hwnd in self._foreground if hwnd != self._foreground[-1][1]]
+            if previous:
+                self._later(self._foreground, previous[-1])
+
+    def press(self, key, presses=1):
+        self.keys.extend([key] * presses)
+        if key == "win" and self.start_hwnd is not None:
+            self._later(self._foreground, self.start_hwnd)
+
+
+def _benchmark(latency=0.05):
+    """Fixed-sleep versions of a few commands against the condition-based ones, on a fake desktop"""
+    chrome, editor, desktop_hwnd = 1, 2, 3
+    windows = {chrome: ("Inbox - Google Chrome", "Chrome_WidgetWin_1"),
+               editor: ("notes.txt - Notepad", "Notepad"),
+               desktop_hwnd: ("", "WorkerW")}
+    desktop = FakeDesktop(windows, foreground=editor, latency=latency, desktop_hwnd=desktop_hwnd,
+                          selection="https://example.com/")
+
+    def focus():
+        return focus_window(desktop, chrome)
+
+    def copy_url():
+        return read_address_bar(desktop)
+
+    def minimize():
+        desktop.minimize(chrome)
+        return wait_until(lambda: desktop.is_minimized(chrome), 0.5)
+
+    # seconds each command used to sleep regardless of how fast the desktop was
+    commands = [("focus Chrome", focus, 1.0),
+                ("copy current URL", copy_url, 0.5 + 0.3 + 0.2 + 0.3),
+                ("show desktop", lambda: show_desktop(desktop), 0.3),
+                ("minimize window", minimize, 0.15)]
+    print(f"🖥️ Fake desktop reacting after {latency * 1000:.0f} ms")
+    for label, command, fixed in commands:
+        start = time.perf_counter()
+        result = command()
+        elapsed = time.perf_counter() - start
+        print(f"📊 {label:>16}: {elapsed * 1000:6.1f} ms (fixed sleeps: {fixed * 1000:6.0f} ms) -> {result!r}")
+
+
+if __name__ == "__main__":
+    _benchmark()
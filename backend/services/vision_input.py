@@ -0,0 +1,144 @@
+"""
+Preparing screenshots for the vision model.
+A full-resolution capture of a 4K desktop is several megabytes per
+question, and the model scales large images down on its side anyway. So a
+capture is cut to the region that matters (the whole screen, the active
+window or the area around the gaze point), shrunk to `max_dimension` and
+encoded as JPEG or WebP before it is uploaded.
+"""
+
+import io
+import os
+import time
+from collections import namedtuple
+
+REGIONS = ("full", "window", "gaze")
+GAZE_REGION_SIZE = (1280, 800)
+
+MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+
+# `blob` is what goes to Gemini; the rest is for reporting
+PreparedImage = namedtuple("PreparedImage", "blob size original_size image_format bytes encode_ms")
+
+
+def region_box(region, screen_size, window_rect=None, gaze_point=None, gaze_size=GAZE_REGION_SIZE):
+    """(left, top, width, height) to capture for `region`, clamped to the screen; None means full screen"""
+    screen_w, screen_h = screen_size
+    if region == "window" and window_rect:
+        left, top, right, bottom = window_rect
+        left, top = max(0, left), max(0, top)
+        right, bottom = min(screen_w, right), min(screen_h, bottom)
+        if right - left > 0 and bottom - top > 0:
+            return (left, top, right - left, bottom - top)
+    elif region == "gaze" and gaze_point:
+        width, height = min(gaze_size[0], screen_w), min(gaze_size[1], screen_h)
+        left = max(0, min(int(gaze_point[0]) - width // 2, screen_w - width))
+        top = max(0, min(int(gaze_point[1]) - height // 2, screen_h - height))
+        return (left, top, width, height)
+    return None
+
+
+class ImagePreprocessor:
+    """Downscales and encodes captures for upload.
+
+    `image_format` is JPEG, WEBP or PNG; `quality` applies to the lossy
+    formats. `region` is the default capture region, one of REGIONS.
+    """
+
+    def __init__(self, max_dimension=1568, image_format="JPEG", quality=80, region="full"):
+        image_format = image_format.upper()
+        if image_format not in MIME_TYPES:
+            raise ValueError(f"Unsupported image format: {image_format}")
+        if region not in REGIONS:
+            raise ValueError(f"Unknown capture region: {region}")
+        self.max_dimension = max_dimension
+        self.image_format = image_format
+        self.quality = quality
+        self.region = region
+
+    @classmethod
+    def from_env(cls):
+        """Settings from VISION_MAX_DIMENSION, VISION_FORMAT, VISION_QUALITY and VISION_REGION"""
+        return cls(int(os.getenv("VISION_MAX_DIMENSION", "1568")),
+                   os.getenv("VISION_FORMAT", "JPEG"),
+                   int(os.getenv("VISION_QUALITY", "80")),
+                   os.getenv("VISION_REGION", "full").lower())
+
+    def resize(self, image):
+        if not self.max_dimension or max(image.size) <= self.max_dimension:
+            return image
+        from PIL import Image
+
+        scale = self.max_dimension / max(image.size)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        # reducing_gap box-averages by a whole factor first, so the filter only runs on a smaller frame
+        return image.resize(size, Image.BILINEAR, reducing_gap=2.0)
+
+    def prepare(self, image):
+        start = time.perf_counter()
+        original_size = image.size
+        image = self.resize(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        if self.image_format == "PNG":
+            image.save(buffer, "PNG")
+        else:
+            image.save(buffer, self.image_format, quality=self.quality)
+        data = buffer.getvalue()
+        encode_ms = (time.perf_counter() - start) * 1000
+
+        blob = {"mime_type": MIME_TYPES[self.image_format], "data": data}
+        return PreparedImage(blob, image.size, original_size, self.image_format, len(data), encode_ms)
+
+
+def describe(prepared):
+    """One-line report of what is being uploaded"""
+    width, height = prepared.size
+    return (f"{prepared.original_size[0]}x{prepared.original_size[1]} -> {width}x{height} "
+            f"{prepared.image_format}, {prepared.bytes / 1024:.0f} KB in {prepared.encode_ms:.0f} ms")
+
+
+def _synthetic_screen(size):
+    """A desktop-like test frame: flat panels, text-like stripes and a noisy photo area"""
+    from PIL import Image, ImageDraw
+
+    width, height = size
+    image = Image.new("RGB", size, (30, 30, 30))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, width, 40), fill=(50, 50, 60))
+    draw.rectangle((0, 40, width // 5, height), fill=(37, 37, 38))
+    for y in range(60, height - 20, 22):
+        for x in range(width // 5 + 20, width - 400, 90):
+            draw.rectangle((x, y, x + 40 + (x * y) % 45, y + 10), fill=(200, 200, 190))
+    photo = Image.effect_noise((width // 4, height // 3), 64).convert("RGB")
+    image.paste(photo, (width - photo.width - 20, 60))
+    return image
+
+
+def _benchmark(repeats=3):
+    """Payload size and encode time per setting on synthetic 1080p, 1440p and 4K screens"""
+    settings = [
+        ("PNG, full size (before)", ImagePreprocessor(max_dimension=None, image_format="PNG")),
+        ("JPEG q80, full size", ImagePreprocessor(max_dimension=None)),
+        ("JPEG q80, max 1568", ImagePreprocessor()),
+        ("JPEG q60, max 1024", ImagePreprocessor(max_dimension=1024, quality=60)),
+        ("WEBP q80, max 1568", ImagePreprocessor(image_format="WEBP")),
+    ]
+    for screen in ((1920, 1080), (2560, 1440), (3840, 2160)):
+        image = _synthetic_screen(screen)
+        print(f"🖥️ {screen[0]}x{screen[1]} screen")
+        for label, preprocessor in settings:
+            runs = [preprocessor.prepare(image) for _ in range(repeats)]
+            best = min(runs, key=lambda run: run.encode_ms)
+            print(f"📊 {label:>24}: {describe(best)}")
+        window = region_box("window", screen, window_rect=(-8, 100, screen[0] // 2, screen[1] + 8))
+        gaze = region_box("gaze", screen, gaze_point=(screen[0] - 10, 10))
+        for label, box in (("active window", window), ("gaze region", gaze)):
+            crop = image.crop((box[0], box[1], box[0] + box[2], box[1] + box[3]))
+            print(f"📊 {label:>24}: {describe(ImagePreprocessor().prepare(crop))}")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -1,6 +1,5 @@
 import speech_recognition as sr
 import pyttsx3
-import threading
 import queue
 import time
 from typing import Optional
@@ -9,22 +8,36 @@ try:
     from .system_control import SystemController
     from .intent_router import IntentRouter
     from .voice_browser_control import VoiceBrowserController
+    from .speech_backends import create_speech_backend, create_audio_source
+    from .audio_pipeline import VoicePipeline
+    from .keyword_spotter import create_keyword_spotter
+    from .command_registry import CommandRegistry
+    from .fuzzy_matcher import FuzzyMatcher
+    from .speech_output import SpeechQueue, Pyttsx3Voice
 except ImportError:
     
     from system_control import SystemController
     from intent_router import IntentRouter
     from voice_browser_control import VoiceBrowserController
+    from speech_backends import create_speech_backend, create_audio_source
+    from audio_pipeline import VoicePipeline
+    from keyword_spotter import create_keyword_spotter
+    from command_registry import CommandRegistry
+    from fuzzy_matcher import FuzzyMatcher
+    from speech_output import SpeechQueue, Pyttsx3Voice
 
 class VoiceAssistant:
     
     
-    def __init__(self, silent_mode=False):
+    def __init__(self, silent_mode=False, speech_backend=None, audio_source=None, system_controller=None):
         
         self.silent_mode = silent_mode
         
         
         self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+        self.microphone = audio_source or create_audio_source()
+        self.speech_backend = speech_backend or create_speech_backend()
+        self.keyword_spotter = create_keyword_spotter()
         
         
         try:
@@ -32,15 +45,25 @@ class VoiceAssistant:
             self.tts_engine.setProperty('rate', 150)  
             self.tts_engine.setProperty('volume', 0.8)  
             self.tts_enabled = True
+            # one thread owns the engine: overlapping runAndWait calls fail, and new commands cut speech short
+            self.speech = SpeechQueue(Pyttsx3Voice(self.tts_engine))
         except Exception as e:
             if not silent_mode:
                 print(f"⚠️ TTS not available: {e}")
             self.tts_enabled = False
+            self.speech = None
         
         
-        self.system_controller = SystemController()
+        self.system_controller = system_controller or SystemController()
         self.intent_router = IntentRouter()
-        self.browser_controller = VoiceBrowserController()
+        self.browser_controller = VoiceBrowserController(self.speech_backend, self.microphone, self.keyword_spotter,
+                                                         window_registry=self.system_controller.windows)
+        if not silent_mode:
+            self.browser_controller.speech = self.speech
+        self.commands = CommandRegistry()
+        self.register_commands(self.commands)
+        self.fuzzy_matcher = FuzzyMatcher(self.commands.known_phrases() +
+                                          [f"open {app}" for app in self.system_controller.app_mappings])
         
         
         self.listening = False
@@ -75,13 +98,7 @@ class VoiceAssistant:
         
         if self.tts_enabled:
             try:
-                
-                def speak_thread():
-                    self.tts_engine.say(text)
-                    self.tts_engine.runAndWait()
-                
-                thread = threading.Thread(target=speak_thread, daemon=True)
-                thread.start()
+                self.speech.say(text)
             except Exception as e:
                 print(f"⚠️ TTS error: {e}")
         
@@ -98,79 +115,83 @@ class VoiceAssistant:
             print("🔧 Adjusted for ambient noise")
         
         self.listening = True
+        print("\n👂 Listening...")
         
-        while self.listening:
-            try:
-                with self.microphone as source:
-                    if not self.listening:
-                        break
-                    
-                    print("\n👂 Listening...")
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=8)
-                
-                if not self.listening:
-                    break
-                
-                print("🔄 Processing speech...")
-                command = self.recognizer.recognize_google(audio).lower()
-                print(f"🗣️ Heard: '{command}'")
-                
-                
-                response = self.process_command(command)
-                
-                
-                if response and isinstance(response, str) and len(response) > 0:
-                    
-                    if response.startswith("✅") or response.startswith("❌"):
-                        self.speak(response)
-            
-            except sr.WaitTimeoutError:
-                continue
-            except sr.UnknownValueError:
-                print("❓ Could not understand the command")
-            except sr.RequestError as e:
-                print(f"❌ Speech recognition error: {e}")
-            except Exception as e:
-                print(f"❌ Unexpected error: {e}")
+        
+        self.pipeline = VoicePipeline(self.microphone, self.speech_backend, self.recognizer, self._handle_heard,
+                                      spotter=self.keyword_spotter, on_heard=self._interrupt_speech)
+        stats = self.pipeline.run(lambda: self.listening)
+        if getattr(self.microphone, "exhausted", False):
+            print("🎞️ Recorded audio input finished")
+        print(f"📊 Heard {stats['recognised']} of {stats['segments']} phrases")
         
         print("🛑 Voice listening stopped gracefully.")
     
-    def process_command(self, command: str) -> Optional[str]:
+    def _interrupt_speech(self, command, segment):
         
-        command = command.strip().lower()
+        # runs on the recognising thread: whatever is still being read out, or
+        # still streaming in, belongs to the previous command, which may be
+        # holding the dispatcher until its answer is finished
+        if self.speech:
+            self.speech.begin()
+    
+    def _handle_heard(self, command: str, segment):
         
+        if not self.listening:
+            return
         
-        if "stop listening" in command or command in ["exit", "stop", "quit", "close"]:
-            print("🛑 Stop command received - shutting down voice assistant...")
-            self.stop_listening()
-            return "✅ Voice assistant stopped"
+        command = command.lower()
+        print(f"🗣️ Heard: '{command}'")
+        if segment.latency is not None:
+            path = "⚡ keyword" if segment.spotted else self.speech_backend.name
+            print(f"⏱️ {path}: {segment.latency * 1000:.0f} ms from end of speech")
         
+        response = self.process_command(command)
         
         
-        browser_keywords = ["chrome", "browser", "search", "google", "youtube", "video", 
-                           "tab", "scroll", "minimize chrome", "maximize chrome",
-                           "what's on my screen", "analyze screen", "summarise", "summarize"]
+        if response and isinstance(response, str) and len(response) > 0:
+            
+            if response.startswith("✅") or response.startswith("❌"):
+                self.speak(response)
+    
+    def register_commands(self, registry: CommandRegistry):
         
-        if any(keyword in command for keyword in browser_keywords):
-            try:
-                self.browser_controller.process_command(command)
-                return None  
-            except Exception as e:
-                print(f"Browser command error: {e}")
-                
+        registry.register("stop", lambda m: self._stop_command(), phrases=["stop listening"],
+                          patterns=[r"^(?:exit|stop|quit|close)$"], owner="assistant", priority=2)
         
+        # system intents first, so equally good browser triggers lose ties to them
+        self.intent_router.register_commands(registry, self._handle_system_intent)
         
-        intent_type, params = self.intent_router.parse_intent(command)
+        self.browser_controller.register_commands(registry)
+    
+    def _stop_command(self) -> str:
         
-        if intent_type:
-            return self._handle_system_intent(intent_type, params)
+        print("🛑 Stop command received - shutting down voice assistant...")
+        self.stop_listening()
+        return "✅ Voice assistant stopped"
+    
+    def process_command(self, command: str) -> Optional[str]:
         
+        command = command.strip().lower()
         
-        try:
-            self.browser_controller.process_command(command)
-            return None  
-        except:
-            pass
+        
+        browser = self.browser_controller
+        if browser.search_mode or browser.find_mode:
+            browser.process_command(command)
+            return None
+        
+        
+        handled, result = self.commands.dispatch(command)
+        if handled:
+            return result
+        
+        
+        suggestion, score = self.fuzzy_matcher.match(command)
+        if suggestion:
+            print(f"🔤 Heard '{command}', using closest command '{suggestion}' ({score:.0%} match)")
+            handled, result = self.commands.dispatch(suggestion)
+            if handled:
+                return result
         
         
         self.speak("I didn't understand that command. Please try again.")
@@ -195,7 +216,7 @@ class VoiceAssistant:
             elif intent_type == "search_files":
                 query = params.get("query", "")
                 if query:
-                    result = self.system_controller.search_files(query)
+                    result = self.system_controller.search_files(query, on_result=self.speak)
                     return result
                 else:
                     return "❌ Please specify what to search for"
@@ -15,15 +15,41 @@ import queue
 import os
 import win32gui
 import win32con
-import win32process
-import psutil
-import base64
-from io import BytesIO
-from PIL import Image
 import ctypes
 from ctypes import wintypes
 import shutil
 
+try:
+    from .speech_backends import create_speech_backend, create_audio_source
+    from .audio_pipeline import VoicePipeline
+    from .keyword_spotter import create_keyword_spotter
+    from .command_registry import CommandRegistry
+    from .fuzzy_matcher import FuzzyMatcher
+    from .window_registry import WindowRegistry, first
+    from .browser_session import BrowserSession, browser_session_enabled, GOOGLE_HOME
+    from .ui_wait import (Win32Desktop, wait_until, focus_window, wait_for_foreground, cycle_to_window,
+                          read_address_bar, element_present)
+    from .text_input import TextInjector
+    from .response_cache import ResponseCache, CachedModel
+    from .speech_output import speak_stream
+    from .vision_input import ImagePreprocessor, region_box, describe
+    from .page_summary import PageSummarizer
+except ImportError:
+    from speech_backends import create_speech_backend, create_audio_source
+    from audio_pipeline import VoicePipeline
+    from keyword_spotter import create_keyword_spotter
+    from command_registry import CommandRegistry
+    from fuzzy_matcher import FuzzyMatcher
+    from window_registry import WindowRegistry, first
+    from browser_session import BrowserSession, browser_session_enabled, GOOGLE_HOME
+    from ui_wait import (Win32Desktop, wait_until, focus_window, wait_for_foreground, cycle_to_window,
+                         read_address_bar, element_present)
+    from text_input import TextInjector
+    from response_cache import ResponseCache, CachedModel
+    from speech_output import speak_stream
+    from vision_input import ImagePreprocessor, region_box, describe
+    from page_summary import PageSummarizer
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -38,25 +64,28 @@ try:
 except ImportError:
     print("⚠️ python-dotenv not installed. Install with: pip install python-dotenv")
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    print("⚠️ google-generativeai not installed. Install with: pip install google-generativeai")
-    GEMINI_AVAILABLE = False
-
 class VoiceBrowserController:
-    def __init__(self):
+    def __init__(self, speech_backend=None, audio_source=None, keyword_spotter=None, window_registry=None):
         self.recognizer = sr.Recognizer()
+        self.speech_backend = speech_backend or create_speech_backend()
+        self.keyword_spotter = keyword_spotter if speech_backend else create_keyword_spotter()
         try:
-            self.microphone = sr.Microphone()
+            self.microphone = audio_source or create_audio_source()
         except Exception as e:
             print(f"⚠️ Failed to initialize microphone: {e}")
             print("💡 Microphone unavailable — voice input will be disabled.")
             self.microphone = None
-        self.driver = None
+        # Chrome is launched by the first browser command, not by starting to listen
+        self.browser = BrowserSession(self.setup_selenium_driver, launch_on_demand=browser_session_enabled())
         self.listening = False
         self.command_queue = queue.Queue()
+        self.windows = window_registry or WindowRegistry(watch=True)
+        self.desktop = Win32Desktop()
+        self.text_input = TextInjector()
+        self.vision = ImagePreprocessor.from_env()
+        self.commands = CommandRegistry()
+        self.register_commands(self.commands)
+        self.fuzzy_matcher = FuzzyMatcher(self.commands.known_phrases())
        
         
         self.recognizer.energy_threshold = 300
@@ -67,8 +96,14 @@ class VoiceBrowserController:
         
         self.chrome_path = self._find_chrome_path()
         
+        # set up on first use: importing google-generativeai is the slowest part of startup
         self.gemini_model = None
-        self._initialize_gemini()
+        self.gemini = None
+        self._gemini_checked = False
+        # set by VoiceAssistant so long answers are read out as they stream in
+        self.speech = None
+        # page text is reused for a couple of minutes so repeated summaries skip the download
+        self.pages = ResponseCache(ttl=120, max_entries=32)
         
         print("🎤 Voice Browser Controller initialized!")
         print("📋 Available commands:")
@@ -93,9 +128,17 @@ class VoiceBrowserController:
         print("   • 'Pause video' - Pause video")
         print("   • 'Stop listening' - Exit the program")
     
+    def _gemini_ready(self):
+        if not self._gemini_checked:
+            self._gemini_checked = True
+            self._initialize_gemini()
+        return self.gemini_model is not None
+    
     def _initialize_gemini(self):
-        if not GEMINI_AVAILABLE:
-            print("⚠️ Gemini API not available. Install google-generativeai package.")
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            print("⚠️ google-generativeai not installed. Install with: pip install google-generativeai")
             return
         
         try:
@@ -108,6 +151,7 @@ class VoiceBrowserController:
             
             genai.configure(api_key=api_key)
             self.gemini_model = genai.GenerativeModel('gemini-2.0-flash')
+            self.gemini = CachedModel(self.gemini_model, ResponseCache.from_env())
             print("✅ Gemini API initialized successfully with gemini-2.0-flash!")
             print("💡 Gemini is used for screen analysis features (not word meanings)")
         except Exception as e:
@@ -135,18 +179,14 @@ class VoiceBrowserController:
         print("💡 Trying to use system default browser instead...")
         return None
     
+    @staticmethod
+    def _is_chrome_window(title, class_name):
+        return "chrome" in title.lower()
+    
     def find_chrome_window(self):
         """Find Chrome window handle"""
-        def enum_windows_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                window_text = win32gui.GetWindowText(hwnd)
-                if "Google Chrome" in window_text or "chrome" in window_text.lower():
-                    windows.append(hwnd)
-            return True
-        
-        windows = []
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        return windows[0] if windows else None
+        window = first(self.windows.find_title("chrome"))
+        return window.hwnd if window else None
     
     def focus_chrome_window(self):
         """Focus Chrome window using multiple reliable methods"""
@@ -156,28 +196,16 @@ class VoiceBrowserController:
             chrome_hwnd = self.find_chrome_window()
             if chrome_hwnd:
                 try:
-                    win32gui.ShowWindow(chrome_hwnd, win32con.SW_RESTORE)
-                    win32gui.ShowWindow(chrome_hwnd, win32con.SW_SHOW)
-                    win32gui.SetForegroundWindow(chrome_hwnd)
-                    time.sleep(1.0)
-                    print("✅ Chrome focused using window handle")
-                    return True
+                    if focus_window(self.desktop, chrome_hwnd):
+                        print("✅ Chrome focused using window handle")
+                        return True
                 except Exception as e:
                     print(f"Window API failed: {e}")
             
             print("🔄 Using Alt+Tab method...")
-            for i in range(3):
-                pyautogui.hotkey('alt', 'tab')
-                time.sleep(0.8)
-                
-                try:
-                    pyautogui.hotkey('ctrl', 'l')
-                    time.sleep(0.3)
-                    pyautogui.press('escape')
-                    print("✅ Chrome focused via Alt+Tab!")
-                    return True
-                except:
-                    continue
+            if cycle_to_window(self.desktop, self._is_chrome_window):
+                print("✅ Chrome focused via Alt+Tab!")
+                return True
             
             print("🖱️ Trying taskbar click...")
             screen_width, screen_height = pyautogui.size()
@@ -185,16 +213,9 @@ class VoiceBrowserController:
             
             for x in range(200, 800, 100):
                 pyautogui.click(x, taskbar_y)
-                time.sleep(0.5)
-                
-                try:
-                    pyautogui.hotkey('ctrl', 'l')
-                    time.sleep(0.3)
-                    pyautogui.press('escape')
+                if wait_for_foreground(self.desktop, self._is_chrome_window, timeout=0.5):
                     print("✅ Chrome focused via taskbar click!")
                     return True
-                except:
-                    continue
             
             print("⚠️ Could not focus Chrome window")
             return False
@@ -203,23 +224,33 @@ class VoiceBrowserController:
             print(f"⚠️ Focus method failed: {e}")
             return False
     
+    @property
+    def driver(self):
+        """Live WebDriver of the browser session, or None"""
+        return self.browser.driver
+    
     def setup_selenium_driver(self):
-        """Setup Selenium WebDriver for Chrome"""
+        """Setup Selenium WebDriver for Chrome; returns the driver or None"""
         try:
             chrome_options = Options()
             chrome_options.add_experimental_option("detach", True)
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_argument("--start-maximized")
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            # commands return once the DOM is ready instead of waiting for every image
+            chrome_options.page_load_strategy = "eager"
+            if self.chrome_path and os.path.exists(self.chrome_path):
+                chrome_options.binary_location = self.chrome_path
             
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(10)
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.implicitly_wait(10)
             print("✅ Selenium WebDriver initialized")
-            return True
+            return driver
             
         except Exception as e:
             print(f"❌ Failed to setup Selenium: {e}")
             print("📝 Using PyAutoGUI fallback for browser control")
-            return False
+            return None
     
     def listen_for_commands(self):
         """Listen for voice commands continuously"""
@@ -231,42 +262,167 @@ class VoiceBrowserController:
             print("🔧 Adjusted for ambient noise")
 
         self.listening = True
+        print("\n👂 Listening...")
 
-        while self.listening:
-            try:
-                with self.microphone as source:
-                    if not self.listening:
-                        break  
+        self.pipeline = VoicePipeline(self.microphone, self.speech_backend, self.recognizer, self._handle_heard,
+                                      spotter=self.keyword_spotter, on_heard=self._interrupt_speech)
+        stats = self.pipeline.run(lambda: self.listening)
+        if getattr(self.microphone, "exhausted", False):
+            print("🎞️ Recorded audio input finished")
+        print(f"📊 Heard {stats['recognised']} of {stats['segments']} phrases")
 
-                    if self.search_mode:
-                        print("\n🔍 Listening for search query...")
-                        audio = self.recognizer.listen(source, timeout=2, phrase_time_limit=10)
-                    elif self.find_mode:
-                        print("\n🔎 Listening for find query (will search inside the active window)...")
-                        audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=8)
-                    else:
-                        print("\n👂 Listening...")
-                        audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
+        print("🛑 Voice listening stopped gracefully.")
 
-                if not self.listening:
-                    break 
+    def _interrupt_speech(self, command, segment):
+        """Pipeline callback on the recognising thread: a new command cuts off the answer still being read"""
+        if self.speech:
+            self.speech.begin()
 
-                print("🔄 Processing speech...")
-                command = self.recognizer.recognize_google(audio).lower()
-                print(f"🗣️ Heard: '{command}'")
-                self.process_command(command)
+    def _handle_heard(self, command, segment):
+        """Pipeline callback: runs each recognised phrase in spoken order"""
+        if not self.listening:
+            return
 
-            except sr.WaitTimeoutError:
-                continue
-            except sr.UnknownValueError:
-                print("❓ Could not understand the command")
-            except sr.RequestError as e:
-                print(f"❌ Speech recognition error: {e}")
-            except Exception as e:
-                print(f"❌ Unexpected error: {e}")
+        command = command.lower()
+        print(f"🗣️ Heard: '{command}'")
+        if segment.latency is not None:
+            path = "⚡ keyword" if segment.spotted else self.speech_backend.name
+            print(f"⏱️ {path}: {segment.latency * 1000:.0f} ms from end of speech")
+        self.process_command(command)
+
+        if self.search_mode:
+            print("\n🔍 Listening for search query...")
+        elif self.find_mode:
+            print("\n🔎 Listening for find query (will search inside the active window)...")
+
+    def register_commands(self, registry):
+        """Declare browser commands and their trigger phrases/patterns"""
+        def add(name, handler, phrases=(), patterns=(), priority=0):
+            registry.register(name, handler, phrases, patterns, owner="browser", priority=priority)
+
+        # priority 1 marks commands that used to pre-empt system intents via browser keywords
+        add("open_drive", lambda m: self._open_drive_command(m.group(1)), patterns=[
+            r"open\s+(?:the\s+)?([a-z])\s*drive\b",
+            r"open\s+(?:the\s+)?drive\s+([a-z])\b",
+            r"open\s+(?:the\s+)?([a-z]):",
+            r"open\s+(?:the\s+)?([a-z])\s*$",
+        ])
+        add("open_chrome", lambda m: self.open_chrome(), phrases=["open chrome"], priority=1)
+        add("open_vs_code", lambda m: self.open_vs_code(),
+            phrases=["open vs code", "open vscode", "open visual studio code"])
+        add("maximize_vscode", lambda m: self.maximize_vscode(),
+            patterns=[r"\bmaximi[sz]e\b.*\b(?:vs\s+code|vscode|visual\s+studio\s+code)\b"])
+        add("minimize_vscode", lambda m: self.minimize_vscode(),
+            patterns=[r"\bminimi[sz]e\b.*\b(?:vs\s+code|vscode|visual\s+studio\s+code)\b"])
+        add("find_text", lambda m: self.find_in_active(m.group(1).strip()), patterns=[r"^(?:mini|find)\s+(.+)"])
+        add("find_in_active", lambda m: self._find_in_active_command(m.group(1).strip()), patterns=[
+            r"\b(?:find|search)\s+(?:in\s+)?(?:the\s+)?(?:active|this|current|tab)\b(?:\s+(?:tab|page)\b)?[\s:\-]*(.*)",
+        ], priority=1)
+        add("find_mode", lambda m: self._find_in_active_command(""), patterns=[r"^find$"])
+        add("search_mode", lambda m: self._search_mode_command(), patterns=[r"^search$"], priority=1)
+        add("search_web", lambda m: self.search_query(m.group(1)),
+            patterns=[r"^search\s+(?:for\s+)?(.+)", r"\bsearch\s+for\s+(.+)"], priority=1)
+        add("click", lambda m: self._click_command(m.string), patterns=[r"\bclick\b", r"\b(?:right|middle)-click\b"])
+        add("new_tab", lambda m: self.open_new_tab(), phrases=["open another tab", "open a new tab", "new tab"], priority=1)
+        add("close_tab", lambda m: self.close_tab(), phrases=["close tab"], priority=1)
+        add("go_back", lambda m: self.go_back(), phrases=["go back", "back"])
+        add("minimize_window", lambda m: self.minimize_window(self._window_target(m.string)),
+            patterns=[r"\bminimi[sz]e\b"])
+        add("maximize_window", lambda m: self.maximize_window(self._window_target(m.string)),
+            patterns=[r"\bmaximi[sz]e\b"])
+        add("scroll_down_more", lambda m: self.scroll_down_more(),
+            phrases=["scroll down more", "scroll more down"], priority=1)
+        add("scroll_up_more", lambda m: self.scroll_up_more(), phrases=["scroll up more", "scroll more up"], priority=1)
+        add("scroll_down", lambda m: self.scroll_down(), phrases=["scroll down"], priority=1)
+        add("scroll_up", lambda m: self.scroll_up(), phrases=["scroll up"], priority=1)
+        add("close_browser", lambda m: self.close_browser(), phrases=["close browser"], priority=1)
+        add("play_video", lambda m: self.play_video(), phrases=["play video", "play"], priority=1)
+        add("pause_video", lambda m: self.pause_video(), phrases=["pause video", "pause"], priority=1)
+        add("stop_listening", lambda m: self.stop_listening(), phrases=["stop listening", "exit"])
+        add("word_meaning", lambda m: self.search_word_meaning(re.sub(r'[^\w\s]+$', '', m.group(1).strip())),
+            patterns=[r"\bsearch\s+meaning\s+(?:of\s+)?(.+)", r"\bmeaning(?:\s+of)?\s+(.+)"], priority=1)
+        add("analyze_screen", lambda m: self.analyze_screen(),
+            phrases=["what's on my screen", "analyze screen", "what is on my screen"], priority=1)
+        add("analyze_window", lambda m: self.analyze_screen("window"),
+            phrases=["analyze this window", "analyze window", "what's in this window"], priority=1)
+        add("analyze_gaze", lambda m: self.analyze_screen("gaze"),
+            phrases=["what am i looking at", "analyze where i'm looking"], priority=1)
+        add("summarize_page", lambda m: self.summarize_current_page(),
+            phrases=["summarize", "summarise", "summarize this page", "summarise this page",
+                     "summarize the page", "summarise the page"], priority=1)
+        add("ask_about_screen", lambda m: self.ask_about_screen(m.group(1).strip()),
+            patterns=[r"^ask\s+(?:about\s+)?(.+)", r"\bask\s+about\s+(.+)"])
+
+    def _open_drive_command(self, letter):
+        drive_letter = letter.upper()
+        print(f"🔎 Detected drive open command for: {drive_letter}:")
+        self.open_drive(drive_letter)
+
+    def _find_in_active_command(self, query):
+        if query:
+            self.find_in_active(query)
+        else:
+            print("🎤 Find mode activated! Say the text to find in the active window...")
+            self.find_mode = True
+
+    def _search_mode_command(self):
+        print("🎤 Search mode activated! Say your search query now...")
+        self.search_mode = True
+
+    @staticmethod
+    def _window_target(command):
+        if "chrome" in command:
+            return "chrome"
+        if "cursor" in command:
+            return "cursor"
+        if "file explorer" in command or "explorer" in command:
+            return "explorer"
+        if "window" in command:
+            return "other"
+        return "active"
+
+    def _click_command(self, command):
+        try:
+            if 'double' in command:
+                m_coord = re.search(r'click(?: at)?\s*(\d+)\s*[ ,]\s*(\d+)', command)
+                if m_coord:
+                    x = int(m_coord.group(1)); y = int(m_coord.group(2))
+                    print(f"🖱️ Double-clicking at ({x},{y})")
+                    pyautogui.doubleClick(x=x, y=y)
+                else:
+                    print("🖱️ Double-clicking at current cursor position")
+                    pyautogui.doubleClick()
+                return
 
-        print("🛑 Voice listening stopped gracefully.")
+            if 'right' in command or 'right-click' in command or 'right click' in command:
+                m_coord = re.search(r'click(?: at)?\s*(\d+)\s*[ ,]\s*(\d+)', command)
+                if m_coord:
+                    x = int(m_coord.group(1)); y = int(m_coord.group(2))
+                    print(f"🖱️ Right-clicking at ({x},{y})")
+                    pyautogui.click(x=x, y=y, button='right')
+                else:
+                    print("🖱️ Right-clicking at current cursor position")
+                    pyautogui.click(button='right')
+                return
+
+            if 'middle' in command or 'middle-click' in command:
+                print("🖱️ Middle-clicking at current cursor position")
+                pyautogui.click(button='middle')
+                return
 
+            m_coord = re.search(r'click(?: at)?\s*(\d+)\s*[ ,]\s*(\d+)', command)
+            if m_coord:
+                x = int(m_coord.group(1)); y = int(m_coord.group(2))
+                print(f"🖱️ Clicking at ({x},{y})")
+                pyautogui.click(x=x, y=y)
+                return
+
+            print("🖱️ Clicking at current cursor position (default)")
+            self.click_at_cursor()
+        except pyautogui.FailSafeException as fe:
+            print(f"❌ PyAutoGUI failsafe triggered: {fe}")
+        except Exception as e:
+            print(f"❌ Click command failed: {e}")
     
     def process_command(self, command):
         """Process recognized voice command"""
@@ -284,198 +440,13 @@ class VoiceBrowserController:
                 self.find_mode = False
                 return
             
-            m_drive = (re.search(r'open\s+(?:the\s+)?([a-z])\s*drive', command) or
-                       re.search(r'open\s+(?:the\s+)?drive\s+([a-z])', command) or
-                       re.search(r'open\s+(?:the\s+)?([a-z]):', command) or
-                       re.search(r'open\s+(?:the\s+)?([a-z])\b', command))
-
-            if m_drive and 'open' in command:
-                drive_letter = m_drive.group(1).upper()
-                print(f"🔎 Detected drive open command for: {drive_letter}:")
-                self.open_drive(drive_letter)
-                return
-
-            if "open chrome" in command:
-                self.open_chrome()
-
-            if "open vs code" in command or "open vscode" in command or "open visual studio code" in command:
-                self.open_vs_code()
-
-            if ("maximize" in command or "maximise" in command) and ("vs code" in command or "vscode" in command or "visual studio code" in command):
-                self.maximize_vscode()
-                return
-
-            if ("minimize" in command or "minimise" in command) and ("vs code" in command or "vscode" in command or "visual studio code" in command):
-                self.minimize_vscode()
-                return
-
-            if command.startswith('mini '):
-                q = command.replace('mini ', '', 1).strip()
-                if q:
-                    self.find_in_active(q)
-                    return
-
-            if command.startswith('find '):
-                query = command.replace('find ', '', 1).strip()
-                if query:
-                    self.find_in_active(query)
-                    return
-
-            if any(phr in command for phr in ['find in active', 'search in active', 'search in active tab', 'find in active tab', 'find this page', 'search this page', 'find in tab', 'search in tab']):
-                m_find = re.search(r'(?:find|search).*?(?:in (?:the )?(?:active|this|current)(?: tab| page)?)[\s:\-]*(.*)', command)
-                if m_find and m_find.group(1).strip():
-                    self.find_in_active(m_find.group(1).strip())
-                    return
-                else:
-                    print("🎤 Find mode activated! Say the text to find in the active window...")
-                    self.find_mode = True
-                    return
-
-            if command == 'find':
-                print("🎤 Find mode activated! Say the text to find in the active window...")
-                self.find_mode = True
-                return
-            
-            elif "search" in command and len(command.split()) == 1:
-                print("🎤 Search mode activated! Say your search query now...")
-                self.search_mode = True
-                return
-            
-            elif command.startswith("search ") or "search for" in command:
-                if command.startswith("search for "):
-                    query = command.replace("search for ", "", 1)
-                else:
-                    query = command.replace("search ", "", 1)
-                
-                if query.strip():  
-                    self.search_query(query)
-                else:
-                    print("❓ No search query provided. Try: 'Search cats' or just say 'Search' first")
-            
-            elif 'click' in command:
-                try:
-                    if 'double' in command:
-                        m_coord = re.search(r'click(?: at)?\s*(\d+)\s*[ ,]\s*(\d+)', command)
-                        if m_coord:
-                            x = int(m_coord.group(1)); y = int(m_coord.group(2))
-                            print(f"🖱️ Double-clicking at ({x},{y})")
-                            pyautogui.doubleClick(x=x, y=y)
-                        else:
-                            print("🖱️ Double-clicking at current cursor position")
-                            pyautogui.doubleClick()
-                        return
-
-                    if 'right' in command or 'right-click' in command or 'right click' in command:
-                        m_coord = re.search(r'click(?: at)?\s*(\d+)\s*[ ,]\s*(\d+)', command)
-                        if m_coord:
-                            x = int(m_coord.group(1)); y = int(m_coord.group(2))
-                            print(f"🖱️ Right-clicking at ({x},{y})")
-                            pyautogui.click(x=x, y=y, button='right')
-                        else:
-                            print("🖱️ Right-clicking at current cursor position")
-                            pyautogui.click(button='right')
-                        return
-
-                    if 'middle' in command or 'middle-click' in command:
-                        print("🖱️ Middle-clicking at current cursor position")
-                        pyautogui.click(button='middle')
-                        return
-
-                    m_coord = re.search(r'click(?: at)?\s*(\d+)\s*[ ,]\s*(\d+)', command)
-                    if m_coord:
-                        x = int(m_coord.group(1)); y = int(m_coord.group(2))
-                        print(f"🖱️ Clicking at ({x},{y})")
-                        pyautogui.click(x=x, y=y)
-                        return
-
-                    print("🖱️ Clicking at current cursor position (default)")
-                    self.click_at_cursor()
-                except pyautogui.FailSafeException as fe:
-                    print(f"❌ PyAutoGUI failsafe triggered: {fe}")
-                except Exception as e:
-                    print(f"❌ Click command failed: {e}")
-            
-            elif "open another tab" in command or "new tab" in command:
-                self.open_new_tab()
-            
-            elif "close tab" in command:
-                self.close_tab()
-            
-            elif "go back" in command or "back" in command:
-                self.go_back()
-            
-            elif "minimize" in command or "minimise" in command:
-                if "chrome" in command:
-                    self.minimize_window("chrome")
-                elif "cursor" in command:
-                    self.minimize_window("cursor")
-                elif "file explorer" in command or "explorer" in command:
-                    self.minimize_window("explorer")
-                elif "window" in command:
-                    self.minimize_window("other")
-                else:
-                    self.minimize_window("active")
-            
-            elif "maximize" in command or "maximise" in command:
-                if "chrome" in command:
-                    self.maximize_window("chrome")
-                elif "cursor" in command:
-                    self.maximize_window("cursor")
-                elif "file explorer" in command or "explorer" in command:
-                    self.maximize_window("explorer")
-                elif "window" in command:
-                    self.maximize_window("other")
-                else:
-                    self.maximize_window("active")
-            
-            elif "scroll down more" in command or "scroll more down" in command:
-                self.scroll_down_more()
-            
-            elif "scroll up more" in command or "scroll more up" in command:
-                self.scroll_up_more()
-            
-            elif "scroll down" in command:
-                self.scroll_down()
-            
-            elif "scroll up" in command:
-                self.scroll_up()
-            
-            elif "close browser" in command:
-                self.close_browser()
-            
-            elif "play video" in command or "play" in command:
-                self.play_video()
-            
-            elif "pause video" in command or "pause" in command:
-                self.pause_video()
-            
-            elif "stop listening" in command or "exit" in command:
-                self.stop_listening()
-            
-            elif "search meaning" in command or "meaning of" in command:
-                word_match = re.search(r'(?:meaning of|meaning)\s+(.+)', command, re.IGNORECASE)
-                if word_match:
-                    word = word_match.group(1).strip()
-                    word = re.sub(r'[^\w\s]+$', '', word)
-                    self.search_word_meaning(word)
-                else:
-                    print("❓ Please specify a word. Example: 'Search meaning of artificial intelligence'")
-            
-            elif "what's on my screen" in command or "analyze screen" in command or "what is on my screen" in command:
-                self.analyze_screen()
-            
-            elif "summarize" in command or "summarise" in command:
-                self.summarize_current_page()
-            
-            elif command.startswith("ask") or "ask about" in command:
-                question_match = re.search(r'ask\s+(?:about\s+)?(.+)', command, re.IGNORECASE)
-                if question_match:
-                    question = question_match.group(1).strip()
-                    self.ask_about_screen(question)
-                else:
-                    print("❓ Please provide a question about your screen. Example: 'Ask what is this document about'")
-            
-            else:
+            handled, _ = self.commands.dispatch(command)
+            if not handled:
+                suggestion, score = self.fuzzy_matcher.match(command)
+                if suggestion:
+                    print(f"🔤 Heard '{command}', using closest command '{suggestion}' ({score:.0%} match)")
+                    handled, _ = self.commands.dispatch(suggestion)
+            if not handled:
                 print(f"❓ Unknown command: '{command}'")
                 print("💡 Try: 'Open Chrome', 'Search cats', 'What's on my screen?', etc.")
                 
@@ -487,6 +458,10 @@ class VoiceBrowserController:
         try:
             print("🌐 Opening Chrome...")
             
+            if self.browser.navigate(GOOGLE_HOME):
+                print("✅ Chrome opened with Google homepage!")
+                return
+            
             if self.chrome_path and os.path.exists(self.chrome_path):
                 print(f"🚀 Starting Chrome from: {self.chrome_path}")
                 subprocess.Popen([
@@ -502,7 +477,9 @@ class VoiceBrowserController:
                 return
             
             print("⏰ Waiting for Chrome to load...")
-            time.sleep(4)
+            if not wait_until(self.find_chrome_window, timeout=10.0):
+                print("⚠️ Chrome window did not appear")
+                return
             
             self.focus_chrome_window()
             
@@ -596,28 +573,27 @@ class VoiceBrowserController:
             print(f"⚠️ No console input available: {e}")
             print("💡 Continuing without manual confirmation.")
         
-        try:
-            pyautogui.hotkey('ctrl', 'l')
-            time.sleep(0.3)
-            pyautogui.press('escape')
+        if wait_for_foreground(self.desktop, self._is_chrome_window, timeout=0.5):
             print("✅ Chrome focus confirmed!")
             return True
-        except:
-            print("❌ Chrome still not focused")
-            return False
+        print("❌ Chrome still not focused")
+        return False
     
     def search_query(self, query):
         """Search for a query on Google in the current tab"""
         try:
             print(f"🔍 Searching for: '{query}'")
             
+            if self.browser.search(query):
+                print("✅ Search completed!")
+                return
+            
             print("🎯 Attempting automatic Chrome focus...")
             focused = False
             for attempt in range(2):
                 if self.focus_chrome_window():
                     focused = True
                     break
-                time.sleep(1)
             
             if not focused:
                 print("⚠️ Automatic Chrome focus failed!")
@@ -651,31 +627,23 @@ class VoiceBrowserController:
                     focused = True
                     break
                 print(f"Attempt {attempt + 1} failed, retrying...")
-                time.sleep(1)
             
             if not focused:
                 print("❌ Could not focus Chrome! Make sure Chrome is open.")
                 return
             
-            time.sleep(1.5)
-            
+            # keystrokes are queued to the focused window in order, so no pauses are needed between them
             print("📍 Focusing address bar...")
-            pyautogui.hotkey('ctrl', 'l')
-            time.sleep(1.0)
+            self.desktop.hotkey('ctrl', 'l')
             
             print("📍 Clearing address bar...")
-            pyautogui.hotkey('ctrl', 'a')
-            time.sleep(0.5)
+            self.desktop.hotkey('ctrl', 'a')
             
             print(f"📍 Typing: '{query}'")
-            for char in query:
-                pyautogui.typewrite(char)
-                time.sleep(0.08) 
-            
-            time.sleep(1.0)
+            self.text_input.type_text(query, "address_bar")
             
             print("📍 Pressing Enter...")
-            pyautogui.press('enter')
+            self.desktop.press('enter')
             
             print("✅ Search completed!")
             
@@ -689,7 +657,7 @@ class VoiceBrowserController:
             
             if self.driver:
                 try:
-                    time.sleep(2)
+                    wait_until(element_present(self.driver, By.CSS_SELECTOR, "#search, #rso"), timeout=5.0)
                     
                     selectors = [
                         f"#search .g:nth-child({result_number}) h3 a",  
@@ -741,16 +709,12 @@ class VoiceBrowserController:
         try:
             print(f"🖱️ Using PyAutoGUI to open result #{result_number}...")
             
-            pyautogui.press('home')
-            time.sleep(1)
+            self.desktop.press('home')
             
             tab_count = 7 + (result_number - 1) * 3
+            self.desktop.press('tab', presses=tab_count)
             
-            for i in range(tab_count):
-                pyautogui.press('tab')
-                time.sleep(0.1)
-            
-            pyautogui.press('enter')
+            self.desktop.press('enter')
             print(f"✅ Opened search result #{result_number} with PyAutoGUI!")
             
         except Exception as e:
@@ -781,11 +745,8 @@ class VoiceBrowserController:
         try:
             print("📂 Opening new tab...")
             
-            if self.driver:
-                self.driver.execute_script("window.open('');")
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-            else:
-                pyautogui.hotkey('ctrl', 't')
+            if not self.browser.new_tab():
+                self.desktop.hotkey('ctrl', 't')
             
             print("✅ New tab opened!")
             
@@ -797,11 +758,8 @@ class VoiceBrowserController:
         try:
             print("❌ Closing current tab...")
             
-            if self.driver and len(self.driver.window_handles) > 1:
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-            else:
-                pyautogui.hotkey('ctrl', 'w')
+            if not self.browser.close_tab():
+                self.desktop.hotkey('ctrl', 'w')
             
             print("✅ Tab closed!")
             
@@ -813,13 +771,11 @@ class VoiceBrowserController:
         try:
             print("⬅️ Going back to previous page...")
             
-            if self.driver:
-                self.driver.back()
+            if self.browser.back():
                 print("✅ Navigated back!")
             else:
                 if self.focus_chrome_window():
-                    time.sleep(0.5)
-                    pyautogui.hotkey('alt', 'left')
+                    self.desktop.hotkey('alt', 'left')
                     print("✅ Navigated back!")
                 else:
                     print("❌ Could not focus Chrome. Please ensure Chrome is open.")
@@ -843,68 +799,23 @@ class VoiceBrowserController:
             except Exception as e:
                 pass
             
-            def enum_windows_callback(hwnd, windows):
-                if win32gui.IsWindowVisible(hwnd):
-                    try:
-                        rect = win32gui.GetWindowRect(hwnd)
-                        left, top, right, bottom = rect
-                        if left <= cursor_x <= right and top <= cursor_y <= bottom:
-                            windows.append((hwnd, win32gui.GetWindowText(hwnd)))
-                    except:
-                        pass
-                return True
-            
-            windows = []
-            win32gui.EnumWindows(enum_windows_callback, windows)
-            
-            if windows:
-                return windows[0][0]
-            return None
+            window = self.windows.at(cursor_x, cursor_y)
+            return window.hwnd if window else None
         except Exception as e:
             print(f"⚠️ Error finding window under cursor: {e}")
             return None
     
     def find_file_explorer_window(self):
         """Find File Explorer window handle"""
-        def enum_windows_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                window_text = win32gui.GetWindowText(hwnd)
-                class_name = win32gui.GetClassName(hwnd)
-                if "explorer" in window_text.lower() or "CabinetWClass" in class_name or "ExploreWClass" in class_name:
-                    windows.append(hwnd)
-            return True
-        
-        windows = []
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        return windows[0] if windows else None
+        window = first(self.windows.find_title("explorer"), self.windows.by_class("CabinetWClass", "ExploreWClass"))
+        return window.hwnd if window else None
 
     def find_vscode_window(self):
-        """Find a Visual Studio Code window handle by title or class name"""
-        def enum_windows_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                try:
-                    window_text = win32gui.GetWindowText(hwnd)
-                    if not window_text:
-                        return True
-                    lower = window_text.lower()
-                    if 'visual studio code' in lower or 'vscode' in lower or ' - code' in lower:
-                        windows.append(hwnd)
-                        return True
-                    try:
-                        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-                        proc = psutil.Process(pid)
-                        pname = proc.name().lower()
-                        if 'code.exe' in pname or pname.startswith('code'):
-                            windows.append(hwnd)
-                    except Exception:
-                        pass
-                except:
-                    pass
-            return True
-
-        windows = []
-        win32gui.EnumWindows(enum_windows_callback, windows)
-        return windows[0] if windows else None
+        """Find a Visual Studio Code window handle by title or process name"""
+        by_process = [w for w in self.windows.by_process("code.exe", "code - insiders.exe") if w.title]
+        window = first(self.windows.find_title("visual studio code"), self.windows.find_title("vscode"),
+                       self.windows.find_title(" - code"), by_process)
+        return window.hwnd if window else None
 
     def maximize_vscode(self):
         """Maximize the Visual Studio Code window if found"""
@@ -916,9 +827,9 @@ class VoiceBrowserController:
                 return
 
             try:
-                win32gui.ShowWindow(hwnd, win32con.SW_MAXIMIZE)
+                self.desktop.maximize(hwnd)
                 win32gui.SetForegroundWindow(hwnd)
-                time.sleep(0.2)
+                wait_until(lambda: self.desktop.is_maximized(hwnd), timeout=0.5)
                 title = win32gui.GetWindowText(hwnd)
                 print(f"✅ VS Code maximized: {title}")
             except Exception as e:
@@ -937,8 +848,8 @@ class VoiceBrowserController:
                 return
 
             try:
-                win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
-                time.sleep(0.15)
+                self.desktop.minimize(hwnd)
+                wait_until(lambda: self.desktop.is_minimized(hwnd), timeout=0.5)
                 title = win32gui.GetWindowText(hwnd)
                 print(f"✅ VS Code minimized: {title}")
             except Exception as e:
@@ -956,35 +867,16 @@ class VoiceBrowserController:
     
     def find_other_window(self):
         """Find any window that is not Chrome or File Explorer"""
-        def enum_windows_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                try:
-                    window_text = win32gui.GetWindowText(hwnd)
-                    class_name = win32gui.GetClassName(hwnd)
-                    
-                    if "chrome" in window_text.lower() or "Google Chrome" in window_text:
-                        return True
-                    
-                    if "explorer" in window_text.lower() or "CabinetWClass" in class_name or "ExploreWClass" in class_name:
-                        return True
-                    
-                    if window_text == "" or "Desktop" in window_text:
-                        return True
-                    
-                    windows.append((hwnd, window_text))
-                except:
-                    pass
-            return True
-        
-        windows = []
-        win32gui.EnumWindows(enum_windows_callback, windows)
+        excluded = {w.hwnd for w in self.windows.find_title("chrome") + self.windows.find_title("explorer") +
+                    self.windows.by_class("CabinetWClass", "ExploreWClass")}
+        windows = [w.hwnd for w in self.windows.titled() if w.hwnd not in excluded and "Desktop" not in w.title]
         
         active_hwnd = self.get_active_window()
         if active_hwnd:
             active_text = win32gui.GetWindowText(active_hwnd)
             active_class = win32gui.GetClassName(active_hwnd)
             
-            if (active_hwnd not in [w[0] for w in windows] and 
+            if (active_hwnd not in windows and 
                 "chrome" not in active_text.lower() and 
                 "Google Chrome" not in active_text and
                 "explorer" not in active_text.lower() and
@@ -993,7 +885,7 @@ class VoiceBrowserController:
                 active_text != ""):
                 return active_hwnd
         
-        return windows[0][0] if windows else None
+        return windows[0] if windows else None
     
     def minimize_window(self, target="active"):
         """Minimize a window based on target type"""
@@ -1094,22 +986,18 @@ class VoiceBrowserController:
                 window_text = win32gui.GetWindowText(active_hwnd)
                 is_chrome = "chrome" in window_text.lower() or "Google Chrome" in window_text
                 
-                if is_chrome:
-                    for _ in range(3):
-                        pyautogui.press('pagedown')
-                        time.sleep(0.08)
+                if is_chrome and self.browser.owns_window(window_text) and self.browser.scroll(3):
+                    print("✅ Scrolled down in active window!")
+                elif is_chrome:
+                    self.desktop.press('pagedown', presses=3)
                     print("✅ Scrolled down in active window!")
                 else:
                     cursor_x, cursor_y = pyautogui.position()
-                    for _ in range(15):
-                        pyautogui.scroll(-5, x=cursor_x, y=cursor_y)
-                        time.sleep(0.015)
+                    pyautogui.scroll(-75, x=cursor_x, y=cursor_y)
                     print("✅ Scrolled down in active window!")
             else:
                 cursor_x, cursor_y = pyautogui.position()
-                for _ in range(15):
-                    pyautogui.scroll(-5, x=cursor_x, y=cursor_y)
-                    time.sleep(0.015)
+                pyautogui.scroll(-75, x=cursor_x, y=cursor_y)
                 print("✅ Scrolled down!")
                 
         except Exception as e:
@@ -1126,22 +1014,18 @@ class VoiceBrowserController:
                 window_text = win32gui.GetWindowText(active_hwnd)
                 is_chrome = "chrome" in window_text.lower() or "Google Chrome" in window_text
                 
-                if is_chrome:
-                    for _ in range(3):
-                        pyautogui.press('pageup')
-                        time.sleep(0.08)
+                if is_chrome and self.browser.owns_window(window_text) and self.browser.scroll(-3):
+                    print("✅ Scrolled up in active window!")
+                elif is_chrome:
+                    self.desktop.press('pageup', presses=3)
                     print("✅ Scrolled up in active window!")
                 else:
                     cursor_x, cursor_y = pyautogui.position()
-                    for _ in range(15):
-                        pyautogui.scroll(5, x=cursor_x, y=cursor_y)
-                        time.sleep(0.015)
+                    pyautogui.scroll(75, x=cursor_x, y=cursor_y)
                     print("✅ Scrolled up in active window!")
             else:
                 cursor_x, cursor_y = pyautogui.position()
-                for _ in range(15):
-                    pyautogui.scroll(5, x=cursor_x, y=cursor_y)
-                    time.sleep(0.015)
+                pyautogui.scroll(75, x=cursor_x, y=cursor_y)
                 print("✅ Scrolled up!")
                 
         except Exception as e:
@@ -1158,22 +1042,18 @@ class VoiceBrowserController:
                 window_text = win32gui.GetWindowText(active_hwnd)
                 is_chrome = "chrome" in window_text.lower() or "Google Chrome" in window_text
                 
-                if is_chrome:
-                    for _ in range(6):
-                        pyautogui.press('pagedown')
-                        time.sleep(0.08)
+                if is_chrome and self.browser.owns_window(window_text) and self.browser.scroll(6):
+                    print("✅ Scrolled down full page in active window!")
+                elif is_chrome:
+                    self.desktop.press('pagedown', presses=6)
                     print("✅ Scrolled down full page in active window!")
                 else:
                     cursor_x, cursor_y = pyautogui.position()
-                    for _ in range(30):
-                        pyautogui.scroll(-8, x=cursor_x, y=cursor_y)
-                        time.sleep(0.01)
+                    pyautogui.scroll(-240, x=cursor_x, y=cursor_y)
                     print("✅ Scrolled down full page in active window!")
             else:
                 cursor_x, cursor_y = pyautogui.position()
-                for _ in range(30):
-                    pyautogui.scroll(-8, x=cursor_x, y=cursor_y)
-                    time.sleep(0.01)
+                pyautogui.scroll(-240, x=cursor_x, y=cursor_y)
                 print("✅ Scrolled down full page!")
                 
         except Exception as e:
@@ -1190,22 +1070,18 @@ class VoiceBrowserController:
                 window_text = win32gui.GetWindowText(active_hwnd)
                 is_chrome = "chrome" in window_text.lower() or "Google Chrome" in window_text
                 
-                if is_chrome:
-                    for _ in range(6):
-                        pyautogui.press('pageup')
-                        time.sleep(0.08)
+                if is_chrome and self.browser.owns_window(window_text) and self.browser.scroll(-6):
+                    print("✅ Scrolled up full page in active window!")
+                elif is_chrome:
+                    self.desktop.press('pageup', presses=6)
                     print("✅ Scrolled up full page in active window!")
                 else:
                     cursor_x, cursor_y = pyautogui.position()
-                    for _ in range(30):
-                        pyautogui.scroll(8, x=cursor_x, y=cursor_y)
-                        time.sleep(0.01)
+                    pyautogui.scroll(240, x=cursor_x, y=cursor_y)
                     print("✅ Scrolled up full page in active window!")
             else:
                 cursor_x, cursor_y = pyautogui.position()
-                for _ in range(30):
-                    pyautogui.scroll(8, x=cursor_x, y=cursor_y)
-                    time.sleep(0.01)
+                pyautogui.scroll(240, x=cursor_x, y=cursor_y)
                 print("✅ Scrolled up full page!")
                 
         except Exception as e:
@@ -1216,11 +1092,8 @@ class VoiceBrowserController:
         try:
             print("🚪 Closing browser...")
             
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
-            else:
-                pyautogui.hotkey('alt', 'f4')
+            if not self.browser.quit():
+                self.desktop.hotkey('alt', 'f4')
             
             print("✅ Browser closed!")
             
@@ -1250,7 +1123,7 @@ class VoiceBrowserController:
                 except NoSuchElementException:
                     pass
             
-            pyautogui.press('space')
+            self.desktop.press('space')
             print("✅ Video play command sent (spacebar)!")
             
         except Exception as e:
@@ -1281,16 +1154,25 @@ class VoiceBrowserController:
                 except NoSuchElementException:
                     pass
             
-            pyautogui.press('space')
+            self.desktop.press('space')
             print("✅ Video pause command sent (spacebar)!")
             
         except Exception as e:
             print(f"❌ Failed to pause video: {e}")
     
-    def capture_screen(self):
-        """Capture screenshot of current screen"""
+    def capture_screen(self, region=None):
+        """Capture the screen, the active window or the area around the gaze point (`region`)"""
         try:
-            screenshot = pyautogui.screenshot()
+            region = region or self.vision.region
+            window_rect = None
+            if region == "window":
+                hwnd = self.windows.foreground()
+                window = self.windows.get(hwnd)
+                window_rect = window.rect if window else win32gui.GetWindowRect(hwnd)
+            # the cursor follows gaze when eye control is on
+            gaze_point = pyautogui.position() if region == "gaze" else None
+            box = region_box(region, pyautogui.size(), window_rect, gaze_point)
+            screenshot = pyautogui.screenshot(region=box) if box else pyautogui.screenshot()
             return screenshot
         except Exception as e:
             print(f"❌ Failed to capture screen: {e}")
@@ -1317,52 +1199,45 @@ class VoiceBrowserController:
             except Exception:
                 is_explorer = False
 
-            time.sleep(0.2)
-
             if is_explorer:
-                pyautogui.press('f3')
+                self.desktop.press('f3')
             else:
-                pyautogui.hotkey('ctrl', 'f')
+                self.desktop.hotkey('ctrl', 'f')
 
-            time.sleep(0.2)
+            self.text_input.type_text(query, "explorer_search" if is_explorer else "find_box")
 
-            for ch in query:
-                pyautogui.typewrite(ch)
-                time.sleep(0.01)
-
-            time.sleep(0.1)
-            pyautogui.press('enter')
+            self.desktop.press('enter')
 
             print("✅ Find completed in active window.")
         except Exception as e:
             print(f"❌ Failed to perform in-window find: {e}")
     
-    def analyze_screen(self):
+    def _prepare_screenshot(self, screenshot):
+        """Downscaled, encoded copy of the capture for upload"""
+        prepared = self.vision.prepare(screenshot)
+        print(f"📦 Uploading {describe(prepared)}")
+        return prepared.blob
+    
+    def analyze_screen(self, region=None):
         """Analyze current screen using Gemini API and provide description"""
-        if not self.gemini_model:
+        if not self._gemini_ready():
             print("❌ Gemini API not available. Please set GEMINI_API_KEY in .env file.")
             return
         
         try:
             print("📸 Capturing screen...")
-            screenshot = self.capture_screen()
+            screenshot = self.capture_screen(region)
             if not screenshot:
                 print("❌ Failed to capture screen")
                 return
             
             print("🔍 Analyzing screen with Gemini AI...")
             
-            img_bytes = BytesIO()
-            screenshot.save(img_bytes, format='PNG')
-            img_bytes.seek(0)
-            
             prompt = "Analyze this screenshot and describe what's visible on the screen in detail. Include information about windows, applications, text content, and any important elements."
             
-            response = self.gemini_model.generate_content([prompt, screenshot])
-            
             print("📋 Screen Analysis:")
             print("-" * 60)
-            print(response.text)
+            self._stream_answer(prompt, self._prepare_screenshot(screenshot))
             print("-" * 60)
             
         except Exception as e:
@@ -1370,15 +1245,22 @@ class VoiceBrowserController:
             import traceback
             traceback.print_exc()
     
-    def ask_about_screen(self, question):
+    def _stream_answer(self, prompt, image=None):
+        """Print (and speak, when a speech queue is attached) a Gemini answer as it streams in"""
+        text = speak_stream(self.gemini.stream_text(prompt, image), self.speech,
+                            on_text=lambda fragment: print(fragment, end="", flush=True))
+        print()
+        return text
+    
+    def ask_about_screen(self, question, region=None):
         """Ask a specific question about the current screen"""
-        if not self.gemini_model:
+        if not self._gemini_ready():
             print("❌ Gemini API not available. Please set GEMINI_API_KEY in .env file.")
             return
         
         try:
             print(f"📸 Capturing screen for question: '{question}'")
-            screenshot = self.capture_screen()
+            screenshot = self.capture_screen(region)
             if not screenshot:
                 print("❌ Failed to capture screen")
                 return
@@ -1387,11 +1269,9 @@ class VoiceBrowserController:
             
             prompt = f"Answer this question about the screenshot: {question}. Be specific and accurate based on what you can see in the image."
             
-            response = self.gemini_model.generate_content([prompt, screenshot])
-            
             print("💡 Answer:")
             print("-" * 60)
-            print(response.text)
+            self._stream_answer(prompt, self._prepare_screenshot(screenshot))
             print("-" * 60)
             
         except Exception as e:
@@ -1415,29 +1295,13 @@ class VoiceBrowserController:
                 print("❌ Could not focus Chrome window")
                 return None
             
-            time.sleep(0.5)
+            url = read_address_bar(self.desktop)
             
-            pyautogui.hotkey('ctrl', 'l') 
-            time.sleep(0.3)
-            pyautogui.hotkey('ctrl', 'a')  
-            time.sleep(0.2)
-            pyautogui.hotkey('ctrl', 'c') 
-            time.sleep(0.3)
-            pyautogui.press('escape') 
-            
-            try:
-                import win32clipboard
-                win32clipboard.OpenClipboard()
-                url = win32clipboard.GetClipboardData()
-                win32clipboard.CloseClipboard()
-                print(f"📍 Current URL: {url}")
-                return url
-            except ImportError:
-                print("⚠️ win32clipboard not available. Install pywin32 for clipboard access.")
-                return None
-            except Exception as e:
-                print(f"❌ Failed to get URL from clipboard: {e}")
+            if not url:
+                print("❌ Failed to get URL from clipboard: the clipboard did not change")
                 return None
+            print(f"📍 Current URL: {url}")
+            return url
                 
         except Exception as e:
             print(f"❌ Failed to get Chrome URL: {e}")
@@ -1445,7 +1309,7 @@ class VoiceBrowserController:
     
     def summarize_current_page(self):
         """Summarize the current webpage using Gemini API"""
-        if not self.gemini_model:
+        if not self._gemini_ready():
             print("❌ Gemini API not available. Please set GEMINI_API_KEY in .env file.")
             return
         
@@ -1465,48 +1329,23 @@ class VoiceBrowserController:
             print("⏳ This may take a moment...")
             
             try:
-                import requests
-                from bs4 import BeautifulSoup
+                try:
+                    from .web_page import fetch_page_text
+                except ImportError:
+                    from web_page import fetch_page_text
                 
                 print("📥 Fetching webpage content...")
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                response = requests.get(url, headers=headers, timeout=10)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                for script in soup(["script", "style", "nav", "header", "footer", "aside"]):
-                    script.decompose()
-                
-                text_content = soup.get_text()
-                lines = (line.strip() for line in text_content.splitlines())
-                chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-                text_content = ' '.join(chunk for chunk in chunks if chunk)
-                
-                if len(text_content) > 50000:
-                    text_content = text_content[:50000] + "... [content truncated]"
+                # an empty extraction (blocked or still-loading page) is not kept, so asking again refetches
+                text_content = self.pages.get_or_compute(ResponseCache.key("page", url), lambda: fetch_page_text(url),
+                                                         cacheable=bool)
                 
                 print(f"✅ Fetched {len(text_content)} characters of content")
                 
-                prompt = f"""Please analyze and summarize the following webpage content from {url}:
-
-{text_content}
-
-Provide a comprehensive summary including:
-- Main topic and purpose
-- Key points and important information
-- Any notable details or insights
-- Overall conclusion or takeaways
-
-Be thorough and accurate in your summary."""
-                
-                gemini_response = self.gemini_model.generate_content(prompt)
-                summary_text = gemini_response.text
+                # long pages are condensed section by section first, so nothing past a size limit is lost
+                prompt = PageSummarizer(self.gemini.generate_text).prompt_for(url, text_content)
                 
             except ImportError:
-                print("⚠️ requests/BeautifulSoup not available. Trying direct URL...")
+                print("⚠️ requests not available. Trying direct URL...")
                 prompt = f"""Please fetch and analyze the content from this URL: {url}
 
 Then provide a comprehensive summary of the document/page including:
@@ -1517,9 +1356,6 @@ Then provide a comprehensive summary of the document/page including:
 
 Be thorough and accurate in your summary."""
                 
-                gemini_response = self.gemini_model.generate_content(prompt)
-                summary_text = gemini_response.text
-                
             except Exception as fetch_error:
                 print(f"⚠️ Could not fetch webpage content: {fetch_error}")
                 print("💡 Trying to summarize using URL directly...")
@@ -1533,17 +1369,12 @@ Then provide a comprehensive summary of the document/page including:
 - Overall conclusion or takeaways
 
 Be thorough and accurate in your summary."""
-                
-                gemini_response = self.gemini_model.generate_content(prompt)
-                summary_text = gemini_response.text
-            
-            response_text = summary_text
             
             print("\n📋 Document Summary:")
             print("=" * 60)
             print(f"🌐 URL: {url}")
             print("-" * 60)
-            print(response_text)
+            self._stream_answer(prompt)
             print("=" * 60)
             
         except Exception as e:
@@ -1557,10 +1388,13 @@ Be thorough and accurate in your summary."""
         try:
             print(f"📚 Searching meaning of: '{word}'")
             
+            if self.browser.search(f"meaning of {word}"):
+                print(f"✅ Search completed for meaning of '{word}'")
+                return
+            
             if not self.find_chrome_window():
                 print("🌐 Opening Chrome...")
                 self.open_chrome()
-                time.sleep(3)
             
             if not self.focus_chrome_window():
                 print("⚠️ Could not focus Chrome. Please ensure Chrome is open.")
@@ -1580,9 +1414,7 @@ Be thorough and accurate in your summary."""
         print("🛑 Stopping voice command listener...")
         self.listening = False
         
-        if self.driver:
-            self.driver.quit()
-        
+        # the browser is left open: it holds the user's tabs, and "close browser" closes it
         print("👋 Voice Browser Controller stopped!")
     
     def run(self):
@@ -1606,11 +1438,6 @@ Be thorough and accurate in your summary."""
             if hasattr(self, "stop_listening_fn") and self.stop_listening_fn:
                     self.stop_listening_fn(wait_for_stop=False)
                     print("🎙️ Microphone listener stopped")
-
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
-                print("✅ Browser closed cleanly")
         except Exception as e:
             print(f"⚠️ Error during stop: {e}")
 
@@ -0,0 +1,142 @@
+"""
+Warm start for the voice assistant.
+Importing the voice stack (speech recognition, TTS, Selenium, win32,
+Gemini) and building the controllers takes seconds, and used to happen
+inside the /voice/start request. The imports and the SystemController
+(app and file indexes, window registry) are now prepared on a background
+thread when the server boots. /voice/start only creates a VoiceSession,
+which builds the assistant on its own thread and returns at once.
+"""
+
+import importlib
+import threading
+import time
+
+# imported in this order; a leading dot marks modules of this package.
+# google.generativeai is only imported on first use by the assistant, so it is loaded here ahead of time
+VOICE_MODULES = (
+    ".voice_assistant",
+    "google.generativeai",
+)
+
+
+def _import(name):
+    if name.startswith("."):
+        return importlib.import_module(name, __package__) if __package__ else importlib.import_module(name[1:])
+    return importlib.import_module(name)
+
+
+class VoiceWarmup:
+    """Imports the voice modules and builds the shared SystemController in the background.
+
+    `timings` maps each warmed step to its duration in seconds; steps that
+    failed (e.g. an optional package is missing) are listed in `errors`.
+    """
+
+    def __init__(self, modules=VOICE_MODULES, prebuild=True):
+        self.modules = modules
+        self.prebuild = prebuild
+        self.timings = {}
+        self.errors = {}
+        self.done = threading.Event()
+        self._system_controller = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin warming up on a daemon thread; later calls do nothing"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="voice-warmup", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            for name in self.modules:
+                self._step(name, lambda name=name: _import(name))
+            if self.prebuild:
+                self._step("SystemController", self._build_system_controller)
+        finally:
+            self.done.set()
+        print(f"🔥 Voice subsystem warmed up in {time.perf_counter() - started:.1f}s")
+
+    def _step(self, label, action):
+        step_started = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            self.errors[label] = e
+            print(f"⚠️ Voice warmup step {label} failed: {e}")
+        self.timings[label] = time.perf_counter() - step_started
+
+    def _build_system_controller(self):
+        self._system_controller = _import(".voice_assistant").SystemController()
+
+    def wait(self, timeout=None):
+        self.start()
+        return self.done.wait(timeout)
+
+    def create_assistant(self, **kwargs):
+        """A VoiceAssistant sharing the warmed SystemController; waits for the warmup to finish"""
+        self.wait()
+        return _import(".voice_assistant").VoiceAssistant(system_controller=self._system_controller, **kwargs)
+
+
+class VoiceSession:
+    """One run of the assistant, built and run by whichever thread calls `run()`.
+
+    `stop()` may come before the assistant exists; the build then finishes
+    and the assistant is stopped again without listening.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.assistant = None
+        self.error = None
+        self.startup_time = None
+        self.ready = threading.Event()
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            assistant = self.factory()
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            print(f"❌ Failed to start voice assistant: {e}")
+            return
+        with self._lock:
+            stopped = self._stopped
+            self.assistant = assistant
+        if stopped:
+            assistant.stop()
+            self.ready.set()
+            return
+        self.startup_time = time.perf_counter() - started
+        self.ready.set()
+        print(f"🎤 Voice assistant ready in {self.startup_time:.2f}s")
+        assistant.run()
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            assistant = self.assistant
+        if assistant is not None:
+            assistant.stop()
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def start_warmup():
+    """The process-wide VoiceWarmup, started on first call"""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            _warmup = VoiceWarmup()
+        return _warmup.start()
@@ -1,42 +1,172 @@
 import cv2
 import mediapipe as mp
 import math
-import numpy as np
 import threading
 import time
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+
+try:
+    from .camera_pipeline import CameraFrameSource, FrameRateGovernor, FrameWorkspace
+except ImportError:
+    from camera_pipeline import CameraFrameSource, FrameRateGovernor, FrameWorkspace
+
+try:
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+    PYCAW_AVAILABLE = True
+except ImportError:
+    PYCAW_AVAILABLE = False
 
 volume_running = False
 cap = None
 hands = None
-volume_interface = None
+volume_actuator = None
+audio_backend = None
+frame_governor = None
+show_preview = True
+
+PINCH_MIN, PINCH_MAX = 50, 300
 
 mp_hands = mp.solutions.hands
 mp_draw = mp.solutions.drawing_utils
 
-def init_audio():
-    global volume_interface
-    devices = AudioUtilities.GetSpeakers()
-    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-    volume_interface = interface.QueryInterface(IAudioEndpointVolume)
-    return volume_interface
 
-def start_volume_control():
-    global volume_running, cap, hands, volume_interface
+class PycawVolumeBackend:
+    """Windows master volume via pycaw (COM)"""
+
+    def __init__(self):
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        self.volume_interface = interface.QueryInterface(IAudioEndpointVolume)
+        self.min_db, self.max_db = self.volume_interface.GetVolumeRange()[:2]
+
+    def set_level(self, percent):
+        db = self.min_db + (self.max_db - self.min_db) * percent / 100.0
+        self.volume_interface.SetMasterVolumeLevel(db, None)
+
+
+class InMemoryVolumeBackend:
+    """No-op backend for platforms without pycaw; keeps the last level for inspection"""
+
+    def __init__(self, level=0.0):
+        self.level = level
+        self.calls = 0
+
+    def set_level(self, percent):
+        self.level = percent
+        self.calls += 1
+
+
+def create_audio_backend():
+    if PYCAW_AVAILABLE:
+        try:
+            return PycawVolumeBackend()
+        except Exception as e:
+            print(f"⚠️ pycaw unavailable, volume changes will not be applied: {e}")
+    return InMemoryVolumeBackend()
+
+
+class VolumeActuator:
+    """Applies target volume levels on its own thread, off the camera frame loop.
+
+    Targets are exponentially smoothed, changes smaller than `threshold` percent are
+    dropped and the backend is called at most `max_rate` times per second.
+    """
+
+    def __init__(self, backend, smoothing=0.5, threshold=2.0, max_rate=15.0):
+        self.backend = backend
+        self.smoothing = smoothing
+        self.threshold = threshold
+        self.min_interval = 1.0 / max_rate
+        self.target = None
+        self.current = None
+        self.applied = None
+        self.calls = 0
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def set_target(self, percent):
+        with self._condition:
+            self.target = max(0.0, min(100.0, percent))
+            self._condition.notify()
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _settled(self):
+        return (self.target is None or
+                (self.applied is not None and abs(self.target - self.applied) < self.threshold))
+
+    def _run(self):
+        last_call = 0.0
+        while True:
+            with self._condition:
+                while self._running and self._settled():
+                    self._condition.wait()
+                if not self._running:
+                    return
+                target = self.target
+
+            if self.current is None:
+                self.current = target
+            else:
+                self.current += self.smoothing * (target - self.current)
+            if abs(target - self.current) < self.threshold:
+                self.current = target
+
+            if self.applied is None or abs(self.current - self.applied) >= self.threshold:
+                try:
+                    self.backend.set_level(self.current)
+                    self.applied = self.current
+                    self.calls += 1
+                except Exception as e:
+                    print(f"⚠️ Volume backend error: {e}")
+                    self.applied = target
+
+            wait = self.min_interval - (time.time() - last_call)
+            if wait > 0:
+                time.sleep(wait)
+            last_call = time.time()
+
+
+def pinch_to_level(length):
+    """Map thumb-index distance in pixels to a 0-100 volume level"""
+    ratio = (length - PINCH_MIN) / (PINCH_MAX - PINCH_MIN)
+    return max(0.0, min(1.0, ratio)) * 100.0
+
+def start_volume_control(source=0):
+    global volume_running, cap, hands, volume_actuator, audio_backend
     if volume_running:
         return
     volume_running = True
 
-    cap = cv2.VideoCapture(0)
-    cap.set(3, 640)
-    cap.set(4, 480)
+    cap = CameraFrameSource(source, 640, 480)
+    if not cap.open():
+        print("❌ Could not open camera for volume control")
+        volume_running = False
+        cap.release()
+        cap = None
+        return
 
     hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1,
                            min_detection_confidence=0.7, min_tracking_confidence=0.5)
 
-    if volume_interface is None:
-        init_audio()
+    if audio_backend is None:
+        audio_backend = create_audio_backend()
+    volume_actuator = VolumeActuator(audio_backend)
+    volume_actuator.start()
 
     threading.Thread(target=run_volume_control, daemon=True).start()
 
@@ -45,47 +175,60 @@ def stop_volume_control():
     volume_running = False
     time.sleep(0.05)
 
+def get_power_metrics():
+    return frame_governor.get_metrics() if frame_governor else None
+
 def run_volume_control():
-    global volume_running, cap, hands, volume_interface
+    global volume_running, cap, hands, volume_actuator, frame_governor
     pTime = 0
     volBar, volPer = 400, 0
-    minVol, maxVol = volume_interface.GetVolumeRange()[0], volume_interface.GetVolumeRange()[1]
+    governor = frame_governor = FrameRateGovernor()
+    workspace = FrameWorkspace()
+    seq = 0
 
     while volume_running:
         if cap is None or not cap.isOpened():
-            time.sleep(0.01)
-            continue
+            break
 
-        ret, img = cap.read()
-        if not ret:
-            time.sleep(0.01)
+        governor.pace()
+        seq, img = cap.wait_frame(seq)
+        if img is None:
             continue
 
-        img = cv2.flip(img, 1)
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        # The pinch distance is the same mirrored or not, so pixels are only
+        # flipped when there is a preview to show.
+        if show_preview:
+            img = workspace.mirror(img)
+        if governor.idle:
+            img_rgb = workspace.to_rgb(workspace.downscale(img), "rgb_small")
+        else:
+            img_rgb = workspace.to_rgb(img)
         results = hands.process(img_rgb)
+        governor.mark_presence(bool(results.multi_hand_landmarks))
 
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
-                mp_draw.draw_landmarks(img, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+                if show_preview:
+                    mp_draw.draw_landmarks(img, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-                lm_list = [[i, int(lm.x*640), int(lm.y*480)] 
-                           for i, lm in enumerate(hand_landmarks.landmark)]
+                lm = hand_landmarks.landmark
 
-                if len(lm_list) >= 9:
-                    x1, y1 = lm_list[4][1], lm_list[4][2]
-                    x2, y2 = lm_list[8][1], lm_list[8][2]
-
-                    cv2.line(img, (x1, y1), (x2, y2), (255, 0, 0), 3)
-                    cv2.circle(img, (x1, y1), 10, (255, 0, 0), cv2.FILLED)
-                    cv2.circle(img, (x2, y2), 10, (255, 0, 0), cv2.FILLED)
+                if len(lm) >= 9:
+                    x1, y1 = int(lm[4].x*640), int(lm[4].y*480)
+                    x2, y2 = int(lm[8].x*640), int(lm[8].y*480)
 
                     length = math.hypot(x2 - x1, y2 - y1)
-                    vol = np.interp(length, [50, 300], [minVol, maxVol])
-                    volBar = np.interp(length, [50, 300], [400, 150])
-                    volPer = np.interp(length, [50, 300], [0, 100])
+                    volPer = pinch_to_level(length)
+                    volBar = 400 - volPer * 2.5
+                    volume_actuator.set_target(volPer)
+
+                    if show_preview:
+                        cv2.line(img, (x1, y1), (x2, y2), (255, 0, 0), 3)
+                        cv2.circle(img, (x1, y1), 10, (255, 0, 0), cv2.FILLED)
+                        cv2.circle(img, (x2, y2), 10, (255, 0, 0), cv2.FILLED)
 
-                    volume_interface.SetMasterVolumeLevel(vol, None)
+        if not show_preview:
+            continue
 
         cv2.putText(img, "Volume Control", (10, 30), cv2.FONT_HERSHEY_COMPLEX, 0.7, (0, 255, 0), 2)
         cv2.putText(img, "Pinch thumb and index to adjust volume", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
@@ -101,8 +244,6 @@ def run_volume_control():
             volume_running = False
             break
 
-        time.sleep(0.01)
-
     if cap:
         cap.release()
         cap = None
@@ -110,4 +251,7 @@ def run_volume_control():
     if hands:
         hands.close()
         hands = None
+    if volume_actuator:
+        volume_actuator.stop()
+        volume_actuator = None
     print("✓ Volume control stopped")
@@ -0,0 +1,342 @@
+"""
+Cached registry of top-level windows for the window commands.
+The visible windows are enumerated at most once per `ttl` seconds (or again
+after a window event when the backend can watch for them) and indexed by
+title word, class name and process name, so finding Chrome, VS Code or a
+window by title is a dictionary lookup instead of an `EnumWindows` pass.
+"""
+
+import re
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import ctypes
+    from ctypes import wintypes
+    import psutil
+    import win32gui
+    import win32process
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+# z is the position in the enumeration, 0 being the topmost window
+Window = namedtuple("Window", "hwnd title class_name process rect z")
+
+_WORD = re.compile(r"\w+")
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+EVENT_OBJECT_CREATE = 0x8000
+EVENT_OBJECT_DESTROY = 0x8001
+EVENT_OBJECT_SHOW = 0x8002
+EVENT_OBJECT_HIDE = 0x8003
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+EVENT_OBJECT_NAMECHANGE = 0x800C
+# (first, last) event ranges that invalidate the snapshot. Location and name
+# changes fire continuously (dragging, caret moves, ticking titles), so moves
+# and retitles are picked up by the ttl instead.
+WATCHED_EVENTS = ((EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND),
+                  (EVENT_OBJECT_CREATE, EVENT_OBJECT_HIDE))
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+WM_QUIT = 0x0012
+
+
+class Win32WindowBackend:
+    """Lists visible top-level windows with `EnumWindows`.
+
+    Process names are cached per pid and dropped once the pid no longer owns
+    a visible window, so a refresh only opens processes it has not seen.
+    """
+
+    def __init__(self):
+        self._process_names = {}
+
+    def enumerate(self):
+        handles = []
+        win32gui.EnumWindows(lambda hwnd, found: found.append(hwnd) or True, handles)
+        windows, pids = [], set()
+        for hwnd in handles:
+            try:
+                if not win32gui.IsWindowVisible(hwnd):
+                    continue
+                title = win32gui.GetWindowText(hwnd)
+                class_name = win32gui.GetClassName(hwnd)
+                rect = win32gui.GetWindowRect(hwnd)
+                _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            except Exception:
+                continue
+            pids.add(pid)
+            windows.append(Window(hwnd, title, class_name, self._process_name(pid), rect, len(windows)))
+        for pid in self._process_names.keys() - pids:
+            del self._process_names[pid]
+        return windows
+
+    def _process_name(self, pid):
+        name = self._process_names.get(pid)
+        if name is None:
+            try:
+                name = psutil.Process(pid).name().lower()
+            except Exception:
+                name = ""
+            self._process_names[pid] = name
+        return name
+
+    def foreground(self):
+        try:
+            return win32gui.GetForegroundWindow()
+        except Exception:
+            return None
+
+    def watch(self, on_change):
+        """Calls `on_change()` from a hook thread whenever a window is created, destroyed,
+        shown, hidden or brought to the front; returns a function that stops it"""
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        WinEventProc = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                          wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+
+        def handle_event(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            if id_object == OBJID_WINDOW and id_child == 0:
+                on_change()
+
+        callback = WinEventProc(handle_event)
+        started = threading.Event()
+        thread_id = []
+
+        def loop():
+            thread_id.append(kernel32.GetCurrentThreadId())
+            hooks = [user32.SetWinEventHook(first, last, 0, callback, 0, 0, WINEVENT_OUTOFCONTEXT)
+                     for first, last in WATCHED_EVENTS]
+            started.set()
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWinEvent(hook)
+
+        thread = threading.Thread(target=loop, daemon=True)
+        thread.start()
+        started.wait(1.0)
+
+        def stop():
+            if thread_id:
+                user32.PostThreadMessageW(thread_id[0], WM_QUIT, 0, 0)
+            thread.join(1.0)
+        return stop
+
+
+class FakeWindowBackend:
+    """In-memory backend for tests and benchmarks.
+
+    `windows` are (hwnd, title, class_name, process, rect) tuples, topmost first.
+    `delay` seconds are spent in every enumeration to model the cost of the
+    real window calls; `calls` counts enumerations.
+    """
+
+    def __init__(self, windows=(), foreground=None, delay=0.0):
+        self.windows = list(windows)
+        self.foreground_hwnd = foreground
+        self.delay = delay
+        self.calls = 0
+        self._listeners = []
+
+    def enumerate(self):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return [Window(*window, i) for i, window in enumerate(self.windows)]
+
+    def foreground(self):
+        return self.foreground_hwnd
+
+    def watch(self, on_change):
+        self._listeners.append(on_change)
+        return lambda: self._listeners.remove(on_change)
+
+    def set_windows(self, windows):
+        """Replace the window list and notify watchers, like a window event would"""
+        self.windows = list(windows)
+        for listener in list(self._listeners):
+            listener()
+
+
+class WindowRegistry:
+    """Serves window lookups from a cached, indexed snapshot.
+
+    The snapshot is rebuilt when it is older than `ttl` seconds. With
+    `watch=True` the backend's window events (open, close, show, hide,
+    foreground) mark it stale as well; the ttl still bounds how long a moved
+    or retitled window can go unnoticed. Listeners added
+    with `subscribe` are called with (added, removed, retitled) window lists
+    whenever a rebuild finds a difference.
+    """
+
+    def __init__(self, backend=None, ttl=0.5, watch=False):
+        self.backend = backend or Win32WindowBackend()
+        self.ttl = ttl
+        self._windows = []
+        self._by_hwnd = {}
+        self._by_word = {}
+        self._by_class = {}
+        self._by_process = {}
+        self._titles = []
+        self._built = None
+        self._stale = True
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._unwatch = None
+        if watch:
+            try:
+                self._unwatch = self.backend.watch(self.invalidate)
+            except Exception as e:
+                print(f"⚠️ Window events unavailable, using a {ttl}s cache: {e}")
+
+    def invalidate(self):
+        self._stale = True
+
+    def subscribe(self, listener):
+        self._listeners.append(listener)
+
+    def close(self):
+        if self._unwatch:
+            self._unwatch()
+            self._unwatch = None
+
+    def _snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._stale or self._built is None or now - self._built > self.ttl:
+                self._stale = False
+                self._rebuild(self.backend.enumerate())
+                self._built = now
+            return self._windows
+
+    def _rebuild(self, windows):
+        previous = self._by_hwnd
+        by_hwnd, by_word, by_class, by_process = {}, {}, {}, {}
+        for window in windows:
+            by_hwnd[window.hwnd] = window
+            for word in set(_WORD.findall(window.title.lower())):
+                by_word.setdefault(word, []).append(window)
+            by_class.setdefault(window.class_name, []).append(window)
+            by_process.setdefault(window.process, []).append(window)
+        self._windows = windows
+        self._titles = [(window.title.lower(), window) for window in windows if window.title]
+        self._by_hwnd, self._by_word, self._by_class, self._by_process = by_hwnd, by_word, by_class, by_process
+
+        if self._listeners and self._built is not None:
+            added = [w for hwnd, w in by_hwnd.items() if hwnd not in previous]
+            removed = [w for hwnd, w in previous.items() if hwnd not in by_hwnd]
+            retitled = [w for hwnd, w in by_hwnd.items() if hwnd in previous and previous[hwnd].title != w.title]
+            if added or removed or retitled:
+                for listener in list(self._listeners):
+                    try:
+                        listener(added, removed, retitled)
+                    except Exception as e:
+                        print(f"⚠️ Window listener failed: {e}")
+
+    def windows(self):
+        """Visible windows, topmost first"""
+        return list(self._snapshot())
+
+    def titled(self):
+        """Visible windows that have a title, topmost first"""
+        self._snapshot()
+        return [window for _, window in self._titles]
+
+    def get(self, hwnd):
+        self._snapshot()
+        return self._by_hwnd.get(hwnd)
+
+    def find_title(self, text):
+        """Windows whose title contains `text`; titles containing it as whole words come first"""
+        text = text.lower()
+        if not text.strip():
+            return []
+        self._snapshot()
+        words = _WORD.findall(text)
+        whole = None
+        for word in words:
+            hits = {window.hwnd for window in self._by_word.get(word, ())}
+            whole = hits if whole is None else whole & hits
+        whole = whole or set()
+        matches = [window for title, window in self._titles if text in title]
+        return sorted(matches, key=lambda window: (window.hwnd not in whole, window.z))
+
+    def by_class(self, *class_names):
+        self._snapshot()
+        return _merge(self._by_class.get(name, ()) for name in class_names)
+
+    def by_process(self, *process_names):
+        self._snapshot()
+        return _merge(self._by_process.get(name.lower(), ()) for name in process_names)
+
+    def at(self, x, y):
+        """Topmost window whose rectangle contains the point"""
+        for window in self._snapshot():
+            left, top, right, bottom = window.rect
+            if left <= x <= right and top <= y <= bottom:
+                return window
+        return None
+
+    def foreground(self):
+        return self.backend.foreground()
+
+
+def first(*groups):
+    """Topmost window across several lookups, or None"""
+    windows = [group[0] for group in groups if group]
+    return min(windows, key=lambda window: window.z) if windows else None
+
+
+def _merge(groups):
+    merged = {}
+    for group in groups:
+        for window in group:
+            merged[window.hwnd] = window
+    return sorted(merged.values(), key=lambda window: window.z)
+
+
+def _benchmark(windows=60, lookups=2000, enumerate_ms=2.0):
+    """Cached lookups against re-enumerating for every lookup, on a fake desktop"""
+    import random
+
+    rng = random.Random(7)
+    apps = [("Google Chrome", "Chrome_WidgetWin_1", "chrome.exe"),
+            ("Visual Studio Code", "Chrome_WidgetWin_1", "code.exe"),
+            ("File Explorer", "CabinetWClass", "explorer.exe"),
+            ("Notepad", "Notepad", "notepad.exe"),
+            ("Spotify", "Chrome_WidgetWin_0", "spotify.exe")]
+    desktop = []
+    for i in range(windows):
+        title, class_name, process = rng.choice(apps)
+        desktop.append((1000 + i, f"Document {i} - {title}", class_name, process, (i, i, i + 800, i + 600)))
+    queries = [lambda r: r.find_title("chrome"), lambda r: r.by_process("code.exe"),
+               lambda r: r.by_class("CabinetWClass"), lambda r: r.find_title("document 42"),
+               lambda r: r.at(400, 300)]
+
+    for label, ttl in (("no cache", -1.0), ("ttl 0.5s", 0.5)):
+        backend = FakeWindowBackend(desktop, delay=enumerate_ms / 1000.0)
+        registry = WindowRegistry(backend, ttl=ttl)
+        start = time.perf_counter()
+        for i in range(lookups):
+            queries[i % len(queries)](registry)
+        elapsed = time.perf_counter() - start
+        print(f"📊 {label:>8}: {lookups} lookups in {elapsed * 1000:7.1f} ms "
+              f"({elapsed / lookups * 1e6:7.1f} us each, {backend.calls} enumerations)")
+
+    backend = FakeWindowBackend(desktop)
+    registry = WindowRegistry(backend, ttl=60.0, watch=True)
+    registry.subscribe(lambda added, removed, retitled:
+                       print(f"🔔 {len(added)} opened, {len(removed)} closed, {len(retitled)} retitled"))
+    registry.windows()
+    backend.set_windows([(2000, "New Tab - Google Chrome", "Chrome_WidgetWin_1", "chrome.exe", (0, 0, 1, 1))] + desktop[1:])
+    print(f"🔎 Topmost Chrome after the change: {registry.find_title('chrome')[0].title}")
+
+
+if __name__ == "__main__":
+    _benchmark()
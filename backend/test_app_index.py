@@ -0,0 +1,39 @@
+"""
+Which executable the app index launches for a spoken app name. Run with pytest.
+"""
+
+import os
+
+from services.app_index import AppIndex
+
+
+def build_index(root, layout):
+    """AppIndex over `root` after creating `layout`, a list of relative executable paths"""
+    for relative in layout:
+        path = os.path.join(root, *relative.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "w").close()
+    index = AppIndex([str(root)])
+    index.refresh()
+    return index
+
+
+def test_installer_helpers_are_never_launched(tmp_path):
+    index = build_index(tmp_path, ["Audacity/unins000.exe", "Audacity/audacity.exe",
+                                   "Tool/setup.exe", "Tool/Uninstall.exe", "Tool/updater.exe"])
+    assert os.path.basename(index.find("audacity")) == "audacity.exe"
+    assert index.find("unins000") != os.path.join(tmp_path, "Audacity", "unins000.exe")
+    assert index.find("tool") is None
+
+
+def test_folder_name_prefers_the_executable_named_like_it(tmp_path):
+    index = build_index(tmp_path, ["Mozilla Firefox/crashreporter.exe", "Mozilla Firefox/firefox.exe",
+                                   "Mozilla Firefox/pingsender.exe", "VideoLAN/VLC/vlc.exe",
+                                   "VideoLAN/VLC/vlc-cache-gen.exe"])
+    assert os.path.basename(index.find("mozilla firefox")) == "firefox.exe"
+    assert os.path.basename(index.find("vlc")) == "vlc.exe"
+
+
+def test_folder_name_falls_back_to_the_shallowest_sibling(tmp_path):
+    index = build_index(tmp_path, ["Paint Studio/bin/tools/convert.exe", "Paint Studio/bin/studio64.exe"])
+    assert os.path.basename(index.find("bin")) == "studio64.exe"
@@ -0,0 +1,58 @@
+"""
+The voice pipeline on a synthetic multi-command recording with a fake
+recogniser that finishes out of order: every phrase must reach the
+command handler exactly once, in spoken order. Run with pytest.
+"""
+
+import time
+
+from services.audio_pipeline import OrderedDispatcher, VoicePipeline, _SyntheticBackend, _synthetic_source
+
+PHRASES = ["open chrome", "scroll down", "new tab", "go back", "close tab"]
+
+
+def run_pipeline(phrases, backend, command_time=0.2, workers=2):
+    heard = []
+
+    def on_command(text, segment):
+        heard.append(text)
+        time.sleep(command_time)
+
+    stats = VoicePipeline(_synthetic_source(phrases), backend, None, on_command, workers=workers).run()
+    return heard, stats
+
+
+def test_every_phrase_is_dispatched_in_order():
+    heard, stats = run_pipeline(PHRASES, _SyntheticBackend(PHRASES))
+    assert heard == PHRASES
+    assert (stats["segments"], stats["recognised"], stats["errors"]) == (len(PHRASES), len(PHRASES), 0)
+
+
+def test_unintelligible_phrase_does_not_hold_up_the_rest():
+    heard, stats = run_pipeline(PHRASES, _SyntheticBackend(PHRASES, unintelligible=["new tab"]), workers=3)
+    assert heard == [p for p in PHRASES if p != "new tab"]
+    assert stats["unrecognised"] == 1
+
+
+def test_recognition_error_does_not_hold_up_the_rest():
+    class FailingBackend(_SyntheticBackend):
+        def recognize(self, recognizer, segment):
+            text = super().recognize(recognizer, segment)
+            if text == "scroll down":
+                raise RuntimeError("recogniser crashed")
+            return text
+
+    heard, stats = run_pipeline(PHRASES, FailingBackend(PHRASES))
+    assert heard == [p for p in PHRASES if p != "scroll down"]
+    assert stats["errors"] == 1
+
+
+def test_dispatcher_holds_results_until_earlier_segments_arrive():
+    delivered = []
+    dispatcher = OrderedDispatcher(lambda text, segment: delivered.append(text))
+    dispatcher.start()
+    for seq in (2, 0, 3, 1):
+        dispatcher.put(seq, f"command {seq}", None)
+    dispatcher.close(4)
+    dispatcher.join(1.0)
+    assert delivered == ["command 0", "command 1", "command 2", "command 3"]
@@ -0,0 +1,137 @@
+"""
+HttpClient against a local server that counts connections, bytes sent and
+304 answers: pooled connections, revalidation from the disk cache, and
+bodies cut off at max_bytes. Run with pytest.
+"""
+
+import gzip
+import hashlib
+import http.server
+import socketserver
+import threading
+
+import pytest
+
+from services.http_client import HttpClient
+
+PAGE = ("<html><body>" + "".join(f"<p>Paragraph {i} says {hashlib.md5(str(i).encode()).hexdigest()}.</p>"
+                                 for i in range(2000)) + "</body></html>").encode("utf-8")
+ETAG = '"' + hashlib.md5(PAGE).hexdigest() + '"'
+
+
+class CountingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), CountingHandler)
+        self.stats = {"connections": 0, "requests": 0, "bytes": 0, "not_modified": 0}
+        self.lock = threading.Lock()
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.stats[name] += amount
+
+
+class CountingHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.count("connections")
+
+    def do_GET(self):
+        self.server.count("requests")
+        if self.path == "/huge":
+            return self._huge()
+        if self.headers.get("If-None-Match") == ETAG:
+            self.server.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        gzipped = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = gzip.compress(PAGE) if gzipped else PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", ETAG)
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.server.count("bytes", len(body))
+        self.wfile.write(body)
+
+    def _huge(self):
+        # no Content-Length: the body only ends when the client hangs up
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", ETAG)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        try:
+            for _ in range(1000):
+                self.wfile.write(PAGE)
+                self.server.count("bytes", len(PAGE))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = CountingServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_repeat_fetches_share_one_pooled_connection(server):
+    client = HttpClient(None)
+    for _ in range(5):
+        assert client.get(server.url + "/page").read() == PAGE
+    assert server.stats["connections"] == 1
+    assert server.stats["requests"] == 5
+
+
+def test_unchanged_page_is_revalidated_and_served_from_disk(server, tmp_path):
+    client = HttpClient(str(tmp_path))
+    first = client.get(server.url + "/page")
+    assert first.read() == PAGE and not first.from_cache
+    sent = server.stats["bytes"]
+
+    for _ in range(3):
+        again = client.get(server.url + "/page")
+        assert again.read() == PAGE
+        assert again.from_cache
+    assert server.stats["not_modified"] == 3
+    assert server.stats["bytes"] == sent
+
+    # a fresh client (e.g. after a restart) revalidates against the same disk cache
+    assert HttpClient(str(tmp_path)).get(server.url + "/page").from_cache
+
+
+def test_body_is_cut_off_at_max_bytes(server):
+    client = HttpClient(None, max_bytes=256 * 1024)
+    with client.get(server.url + "/huge") as response:
+        size = sum(len(chunk) for chunk in response.iter_bytes())
+    assert size == 256 * 1024
+    assert response.truncated
+
+
+def test_truncated_body_is_not_cached(server, tmp_path):
+    client = HttpClient(str(tmp_path), max_bytes=1024)
+    response = client.get(server.url + "/page")
+    assert len(response.read()) == 1024
+    assert response.truncated
+    assert list(tmp_path.iterdir()) == []
+
+    again = client.get(server.url + "/page")
+    assert not again.from_cache
+    again.read()
+    assert server.stats["not_modified"] == 0
@@ -0,0 +1,128 @@
+"""
+ResponseCache and CachedModel against a stand-in model: hits and misses,
+request coalescing, TTL expiry and the on-disk copy. Run with pytest.
+"""
+
+import threading
+import time
+
+from services.response_cache import CachedModel, ResponseCache
+
+
+class StandInModel:
+    """Answers "answer #N" after `latency` seconds, counting calls"""
+
+    def __init__(self, latency=0.0, chunks=None):
+        self.latency = latency
+        self.chunks = chunks
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, content, stream=False):
+        with self._lock:
+            self.calls += 1
+            calls = self.calls
+        time.sleep(self.latency)
+        if stream:
+            return [type("Chunk", (), {"text": text})() for text in (self.chunks or [f"answer #{calls}"])]
+        return type("Response", (), {"text": f"answer #{calls}"})()
+
+
+def test_repeated_prompt_is_a_hit():
+    model = StandInModel()
+    gemini = CachedModel(model, ResponseCache())
+    assert gemini.generate_text("describe the screen") == "answer #1"
+    assert gemini.generate_text("describe the screen") == "answer #1"
+    assert gemini.generate_text("summarize the page") == "answer #2"
+    assert (model.calls, gemini.cache.hits, gemini.cache.misses) == (2, 1, 2)
+
+
+def test_concurrent_callers_share_one_model_call():
+    model = StandInModel(latency=0.2)
+    gemini = CachedModel(model, ResponseCache())
+    answers = []
+    threads = [threading.Thread(target=lambda: answers.append(gemini.generate_text("same question")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert model.calls == 1
+    assert answers == ["answer #1"] * 8
+    assert (gemini.cache.misses, gemini.cache.coalesced) == (1, 7)
+
+
+def test_entries_expire_after_ttl():
+    model = StandInModel()
+    gemini = CachedModel(model, ResponseCache(ttl=0.05))
+    gemini.generate_text("question")
+    time.sleep(0.1)
+    assert gemini.generate_text("question") == "answer #2"
+
+
+def test_streamed_answers_are_cached_unless_empty():
+    cache = ResponseCache()
+    gemini = CachedModel(StandInModel(chunks=["Hello ", "there."]), cache)
+    assert list(gemini.stream_text("greet")) == ["Hello ", "there."]
+    assert list(gemini.stream_text("greet")) == ["Hello there."]
+    assert cache.hits == 1
+
+    empty = CachedModel(StandInModel(chunks=[""]), ResponseCache())
+    assert list(empty.stream_text("blocked")) == []
+    list(empty.stream_text("blocked"))
+    assert empty.model.calls == 2
+
+
+def test_cache_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = ResponseCache(path, save_delay=60)
+    CachedModel(StandInModel(), cache).generate_text("question")
+    assert not (tmp_path / "cache.json").exists()
+    cache.flush()
+
+    model = StandInModel()
+    assert CachedModel(model, ResponseCache(path)).generate_text("question") == "answer #1"
+    assert model.calls == 0
+
+
+def test_saves_are_debounced(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = ResponseCache(str(path), save_delay=0.1)
+    for i in range(20):
+        cache.put(ResponseCache.key(i), i)
+    assert not path.exists()
+    time.sleep(0.4)
+    assert len(ResponseCache(str(path))._entries) == 20
+
+
+def test_overlapping_saves_do_not_clash(tmp_path, capsys):
+    cache = ResponseCache(str(tmp_path / "cache.json"), save_delay=60)
+
+    def writer(n):
+        for i in range(25):
+            cache.put(ResponseCache.key(n, i), i)
+            cache.save()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert "Could not save" not in capsys.readouterr().out
+    assert len(ResponseCache(str(tmp_path / "cache.json"))._entries) == 100
+    assert [p.name for p in tmp_path.iterdir()] == ["cache.json"]
+
+
+def test_uncacheable_results_are_recomputed():
+    pages = ResponseCache()
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return "" if len(fetched) == 1 else "page text"
+
+    key = ResponseCache.key("page", "https://example.com/")
+    assert pages.get_or_compute(key, fetch, cacheable=bool) == ""
+    assert pages.get_or_compute(key, fetch, cacheable=bool) == "page text"
+    assert pages.get_or_compute(key, fetch, cacheable=bool) == "page text"
+    assert len(fetched) == 2
@@ -0,0 +1,69 @@
+"""
+Which hand poses capture a screenshot, and which earlier capture a new
+one is compared against for deduplication. Run with pytest.
+"""
+
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("pyautogui")
+from PIL import Image, ImageDraw
+
+from services import screenshot_control
+from services.screenshot_control import GESTURE_MODES, GestureHold, detect_gesture, save_capture
+
+FIST = [0, 0, 0, 0, 0]
+PALM = [1, 1, 1, 1, 1]
+THREE = [0, 1, 1, 1, 0]
+
+
+def capturing(frames, hold_frames=3):
+    """Capture modes a run of finger readings would trigger, frame by frame"""
+    hold = GestureHold(hold_frames)
+    triggered = []
+    for fingers in frames:
+        gesture = detect_gesture(fingers)
+        held = hold.update(gesture if gesture in GESTURE_MODES else None)
+        triggered.append(GESTURE_MODES[held] if held else None)
+    return triggered
+
+
+def test_resting_fist_never_captures():
+    assert capturing([FIST] * 20) == [None] * 20
+
+
+def test_window_capture_uses_three_fingers():
+    assert capturing([THREE] * 3)[-1] == "window"
+
+
+def test_gesture_must_be_held():
+    assert capturing([PALM, PALM, FIST, PALM, PALM, PALM]) == [None, None, None, None, None, "full"]
+
+
+def screen(boxes):
+    image = Image.new("RGB", (320, 200), "white")
+    draw = ImageDraw.Draw(image)
+    for box in boxes:
+        draw.rectangle(box, fill="black")
+    return image
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(screenshot_control, "screenshots_folder", str(tmp_path))
+    monkeypatch.setattr(screenshot_control, "deduplicators", {})
+    return tmp_path
+
+
+def test_duplicates_are_checked_within_a_mode(folder):
+    full = save_capture(screen([(0, 0, 160, 100)]), "full")
+    assert save_capture(screen([(0, 0, 160, 100)]), "full") == full
+
+
+def test_modes_do_not_deduplicate_against_each_other(folder):
+    full = save_capture(screen([(0, 0, 160, 100)]), "full")
+    gaze = save_capture(screen([(0, 0, 160, 100)]), "gaze")
+    assert gaze != full
+    # the gaze capture did not replace the full-screen one as the comparison point
+    assert save_capture(screen([(0, 0, 160, 100)]), "full") == full
+    assert len(list(folder.glob("*.png"))) == 2
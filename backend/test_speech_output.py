@@ -0,0 +1,85 @@
+"""
+Streamed answers read out through SpeechQueue, driven by the real voice
+pipeline: a command heard while the previous answer is still streaming in
+must cut that answer off, even though the previous command is still
+holding the dispatcher. Run with pytest.
+"""
+
+import threading
+import time
+
+from services.audio_pipeline import VoicePipeline, _synthetic_source, pcm_samples
+from services.speech_output import SpeechQueue, speak_stream
+
+FRAGMENT_DELAY = 0.05
+FRAGMENTS = 200
+
+
+class RecordingVoice:
+    def __init__(self):
+        self.spoken = []
+
+    def speak(self, text, cancelled=lambda: False):
+        self.spoken.append(text)
+        time.sleep(0.01)
+
+
+class PhraseBackend:
+    """Decodes the phrase index from the burst amplitude of `_synthetic_source`;
+    later phrases take longer, so they are recognised while earlier ones run"""
+
+    def __init__(self, phrases, delay=0.5):
+        self.phrases = phrases
+        self.delay = delay
+
+    def recognize(self, recognizer, segment):
+        index = int(round(max(map(abs, pcm_samples(segment.frame_data, 2))) / 3000.0)) - 1
+        time.sleep(self.delay * index)
+        return self.phrases[index]
+
+
+def slow_answer(closed):
+    try:
+        for i in range(FRAGMENTS):
+            time.sleep(FRAGMENT_DELAY)
+            yield f"Sentence {i}. "
+    finally:
+        closed.set()
+
+
+def test_next_command_cuts_off_a_streaming_answer():
+    phrases = ["what is on my screen", "stop"]
+    speech = SpeechQueue(RecordingVoice())
+    closed = threading.Event()
+    events = {}
+    handled = []
+
+    def on_heard(text, segment):
+        events.setdefault(text, time.perf_counter())
+        speech.begin()
+
+    def on_command(text, segment):
+        handled.append(text)
+        if text == phrases[0]:
+            events["answer"] = speak_stream(slow_answer(closed), speech)
+            events["answered"] = time.perf_counter()
+
+    pipeline = VoicePipeline(_synthetic_source(phrases), PhraseBackend(phrases), None, on_command,
+                             on_heard=on_heard)
+    pipeline.run()
+
+    assert handled == phrases
+    assert closed.is_set()
+    # cut off at the next fragment after "stop" was recognised, not after the whole stream
+    assert events["answered"] - events["stop"] < FRAGMENT_DELAY + 0.1
+    assert len(events["answer"].split(". ")) < FRAGMENTS / 2
+    speech.wait(1.0)
+    assert len(speech.voice.spoken) < FRAGMENTS / 2
+
+
+def test_stream_is_read_to_the_end_without_interruption():
+    speech = SpeechQueue(RecordingVoice())
+    text = speak_stream((f"Part {i}. " for i in range(5)), speech)
+    assert text == "".join(f"Part {i}. " for i in range(5))
+    speech.wait(1.0)
+    assert speech.voice.spoken == [f"Part {i}." for i in range(5)]
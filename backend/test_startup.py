@@ -0,0 +1,151 @@
+"""
+Startup profile for the server and the voice subsystem: what gets
+imported, how long it takes, and how fast /voice/start answers.
+
+Run with pytest, or directly for a report of the heaviest imports:
+    python test_startup.py
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+# packages /voice/start used to import inside the request
+HEAVY_MODULES = ("speech_recognition", "pyttsx3", "selenium", "google.generativeai",
+                 "PIL", "win32gui", "psutil", "dotenv", "pyautogui")
+# ML, vision and audio stacks the server used to import at boot
+BOOT_HEAVY_MODULES = HEAVY_MODULES + ("tensorflow", "absl", "mediapipe", "cv2", "numpy",
+                                      "pycaw", "comtypes", "scipy", "sklearn", "pandas")
+START_BUDGET = 0.1
+
+
+def import_profile(statement):
+    """Run `statement` under `python -X importtime`.
+
+    Returns (ok, modules, top) where `modules` is every module name
+    imported and `top` lists (seconds, name) of the top-level imports,
+    slowest first.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=BACKEND_DIR, capture_output=True, text=True)
+    modules, top = set(), []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)", line)
+        if not match:
+            continue
+        modules.add(match.group(3))
+        if len(match.group(2)) == 1:
+            top.append((int(match.group(1)) / 1e6, match.group(3)))
+    top.sort(reverse=True)
+    return result.returncode == 0, modules, top
+
+
+def heavy_imports(modules, heavy=HEAVY_MODULES):
+    return sorted(name for name in modules if any(name == m or name.startswith(m + ".") for m in heavy))
+
+
+class FakeAssistant:
+    def __init__(self):
+        self.stopped = threading.Event()
+        self.ran = False
+
+    def run(self):
+        self.ran = True
+        self.stopped.wait(5)
+
+    def stop(self):
+        self.stopped.set()
+
+
+class SlowWarmup:
+    """Stands in for VoiceWarmup with a cold, slow assistant build"""
+
+    def __init__(self, build_time=1.0):
+        self.build_time = build_time
+        self.done = threading.Event()
+        self.assistants = []
+
+    def start(self):
+        return self
+
+    def create_assistant(self, **kwargs):
+        time.sleep(self.build_time)
+        self.assistants.append(FakeAssistant())
+        return self.assistants[-1]
+
+
+def test_server_boot_imports_nothing_heavy():
+    ok, modules, _ = import_profile("import app")
+    assert ok
+    assert heavy_imports(modules, BOOT_HEAVY_MODULES) == []
+
+
+def test_warmup_module_imports_nothing_heavy():
+    ok, modules, _ = import_profile("import services.voice_warmup")
+    assert ok
+    assert heavy_imports(modules) == []
+
+
+def test_session_stopped_before_ready_never_listens():
+    from services.voice_warmup import VoiceSession
+
+    warmup = SlowWarmup(build_time=0.2)
+    session = VoiceSession(warmup.create_assistant)
+    thread = threading.Thread(target=session.run, daemon=True)
+    thread.start()
+    session.stop()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert session.ready.is_set()
+    assert not warmup.assistants[0].ran
+
+
+def test_voice_start_returns_within_budget(monkeypatch):
+    try:
+        from flask import Flask
+        from routes import control
+    except ImportError as e:
+        pytest.skip(f"control routes not importable here: {e}")
+    from services import voice_warmup
+
+    warmup = SlowWarmup()
+    monkeypatch.setattr(voice_warmup, "_warmup", warmup)
+    app = Flask(__name__)
+    app.register_blueprint(control.bp, url_prefix="/control")
+    client = app.test_client()
+    try:
+        start = time.perf_counter()
+        response = client.post("/control/voice/start")
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200
+        assert response.get_json()["voice_active"]
+        assert elapsed < START_BUDGET, f"/voice/start took {elapsed * 1000:.0f} ms"
+        session = control.controllers["voice"]
+        assert session.ready.wait(3)
+        assert session.assistant is warmup.assistants[0]
+    finally:
+        client.post("/control/voice/stop")
+
+
+def _report(top_n=10):
+    for statement in ("import app", "import services.voice_warmup", "import services.voice_assistant"):
+        started = time.perf_counter()
+        ok, modules, top = import_profile(statement)
+        elapsed = time.perf_counter() - started
+        print(f"\n📦 {statement}: {len(modules)} modules, {elapsed * 1000:.0f} ms including interpreter start")
+        if not ok:
+            print("   ❌ not importable in this environment")
+        for seconds, name in top[:top_n]:
+            print(f"   {seconds * 1000:8.1f} ms  {name}")
+        heavy = heavy_imports(modules, BOOT_HEAVY_MODULES)
+        print(f"   {'⚠️ heavy: ' + ', '.join(sorted({m.split('.')[0] for m in heavy})) if heavy else '✅ no heavy modules'}")
+
+
+if __name__ == "__main__":
+    _report()
@@ -0,0 +1,94 @@
+"""
+Desktop actions of the voice commands on a scripted desktop that reacts
+after LATENCY seconds: they must finish shortly after the desktop does,
+not after the fixed sleeps they used to take. Run with pytest.
+"""
+
+import time
+
+import pytest
+
+from services.ui_wait import (FakeDesktop, cycle_to_window, focus_window, open_from_start_menu,
+                              read_address_bar, show_desktop)
+
+LATENCY = 0.05
+# polling overhead allowed on top of the desktop's own reaction time, per wait
+SLACK = 0.05
+CHROME, EDITOR, DESKTOP, START = 1, 2, 3, 4
+WINDOWS = {CHROME: ("Inbox - Google Chrome", "Chrome_WidgetWin_1"), EDITOR: ("notes.txt - Notepad", "Notepad"),
+           DESKTOP: ("", "WorkerW"), START: ("Start", "Windows.UI.Core.CoreWindow")}
+
+
+def fake_desktop(foreground=EDITOR):
+    return FakeDesktop(WINDOWS, foreground=foreground, latency=LATENCY, desktop_hwnd=DESKTOP,
+                       selection="https://example.com/", start_hwnd=START)
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def is_chrome(title, class_name):
+    return "chrome" in title.lower()
+
+
+def test_focus_window():
+    desktop = fake_desktop()
+    focused, elapsed = timed(lambda: focus_window(desktop, CHROME))
+    assert focused
+    assert elapsed < LATENCY + SLACK
+
+
+def test_alt_tab_fallback():
+    desktop = fake_desktop(foreground=CHROME)
+    desktop.activate(EDITOR)
+    time.sleep(LATENCY)
+    hwnd, elapsed = timed(lambda: cycle_to_window(desktop, is_chrome))
+    assert hwnd == CHROME
+    assert desktop.keys == ["alt+tab"]
+    assert elapsed < LATENCY + SLACK
+
+
+def test_read_address_bar():
+    desktop = fake_desktop(foreground=CHROME)
+    url, elapsed = timed(lambda: read_address_bar(desktop))
+    assert url == "https://example.com/"
+    assert desktop.keys == ["ctrl+l", "ctrl+a", "ctrl+c", "escape"]
+    # used to sleep 1.3 s
+    assert elapsed < LATENCY + 2 * SLACK
+
+
+def test_open_from_start_menu():
+    desktop = fake_desktop()
+    typed = []
+    _, elapsed = timed(lambda: open_from_start_menu(desktop, typed.append, "recycle bin", results_delay=0.1))
+    assert typed == ["recycle bin"]
+    assert desktop.keys == ["win+d", "win", "enter"]
+    assert elapsed < 0.1 + 2 * (LATENCY + SLACK)
+
+
+def test_show_desktop():
+    desktop = fake_desktop()
+    shown, elapsed = timed(lambda: show_desktop(desktop))
+    assert shown
+    assert elapsed < LATENCY + SLACK
+
+
+def test_system_controller_commands_use_the_desktop_backend():
+    pytest.importorskip("win32gui")
+    pytest.importorskip("pyautogui")
+    from services.system_control import SystemController
+
+    controller = SystemController.__new__(SystemController)
+    controller.desktop = fake_desktop()
+    typed = []
+    controller.text_input = type("Typist", (), {"type_text": lambda self, text, target: typed.append(text)})()
+    result, elapsed = timed(lambda: controller.open_desktop_icon("recycle bin"))
+    assert result.startswith("✅")
+    assert typed == ["recycle bin"]
+    assert controller.desktop.keys == ["win+d", "win", "enter"]
+    assert elapsed < 0.5 + 2 * (LATENCY + SLACK)
+    assert controller.refresh_desktop().startswith("✅")
+    assert controller.desktop.keys[-2:] == ["win+d", "f5"]
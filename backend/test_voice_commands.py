@@ -0,0 +1,86 @@
+"""
+Routing of spoken commands: which command a phrase reaches through the
+command registry, what the fuzzy fallback is allowed to guess, and when
+the keyword spotter may dispatch before the phrase has ended.
+
+Built from the system intents alone, so it runs without the Windows and
+browser stacks. Run with pytest.
+"""
+
+import pytest
+
+from services.command_registry import CommandRegistry
+from services.fuzzy_matcher import FuzzyMatcher
+from services.intent_router import IntentRouter, POWER_INTENTS
+from services.keyword_spotter import KeywordMatcher
+
+
+def system_registry():
+    """Registry holding the system intents and a go_back browser command; handlers return their intent"""
+    registry = CommandRegistry()
+    registry.register("go_back", lambda m: ("go_back", {}), phrases=["go back", "back"], owner="browser")
+    IntentRouter().register_commands(registry, lambda intent_type, params: (intent_type, params))
+    return registry
+
+
+def routed_intent(registry, command):
+    _, result = registry.dispatch(command)
+    return result[0] if result else None
+
+
+@pytest.mark.parametrize("command", ["restart chrome", "restart the browser", "shut down chrome",
+                                     "power off the video", "reboot youtube", "sleep tab"])
+def test_browser_phrases_never_reach_power_intents(command):
+    assert routed_intent(system_registry(), command) not in POWER_INTENTS
+
+
+@pytest.mark.parametrize("command, intent", [
+    ("shut down", "shutdown"), ("shutdown the computer", "shutdown"), ("power off", "shutdown"),
+    ("turn off the laptop", "shutdown"), ("restart", "restart"), ("reboot the pc", "restart"),
+    ("sleep", "sleep"), ("put the computer to sleep", "sleep"), ("lock the screen", "lock_screen"),
+])
+def test_whole_power_commands_still_route(command, intent):
+    assert routed_intent(system_registry(), command) == intent
+
+
+def test_power_command_delay_is_kept():
+    _, (intent, params) = system_registry().dispatch("shut down in 5 minutes")
+    assert (intent, params) == ("shutdown", {"delay": 300})
+
+
+def test_single_word_phrase_must_be_the_whole_command():
+    registry = system_registry()
+    assert routed_intent(registry, "back") == "go_back"
+    assert routed_intent(registry, "go back") == "go_back"
+    assert routed_intent(registry, "the back door") is None
+
+
+@pytest.mark.parametrize("heard", ["flower off", "shut town", "rest art", "reboots", "sheep", "lock green"])
+def test_fuzzy_fallback_never_guesses_a_power_intent(heard):
+    registry = system_registry()
+    suggestion, _ = FuzzyMatcher(registry.known_phrases()).match(heard)
+    assert suggestion is None or routed_intent(registry, suggestion) not in POWER_INTENTS
+
+
+def test_fuzzy_fallback_still_corrects_other_commands():
+    registry = system_registry()
+    suggestion, _ = FuzzyMatcher(registry.known_phrases()).match("battery levl")
+    assert routed_intent(registry, suggestion) == "battery_status"
+
+
+def test_parameterised_click_is_not_cut_off_by_the_keyword_spotter():
+    matcher = KeywordMatcher()
+    # "click at 300 400" under the keyword grammar: "click", then words outside the vocabulary
+    assert matcher.partial("click") is None
+    assert matcher.endpoint("click") is None
+    assert matcher.final("[unk] [unk] [unk]") is None
+
+
+def test_keyword_spotter_timing():
+    matcher = KeywordMatcher()
+    assert matcher.partial("close tab") == "close tab"
+    assert matcher.partial("scroll down") is None
+    assert matcher.endpoint("scroll down") == "scroll down"
+    matcher.reset()
+    assert matcher.partial("click") is None
+    assert matcher.final("click") == "click"
@@ -0,0 +1,63 @@
+"""
+Which parts of a page the streaming extractor keeps for the page summary:
+page chrome and menus go, the article stays, also when it sits inside a
+<form> or has its own <header>. Run with pytest.
+"""
+
+from services.web_page import TextExtractor, extract_text
+
+ARTICLE = "<p>" + "The council approved the new cycling lanes after a long debate. " * 3 + "</p>"
+MENU = "<ul>" + "".join(f'<li><a href="/s/{i}">Section {i}</a></li>' for i in range(20)) + "</ul>"
+
+
+def test_aspnet_form_wrapper_keeps_the_body():
+    text = extract_text(f"<html><body><form id='aspnetForm'><div>{ARTICLE}</div></form></body></html>")
+    assert "cycling lanes" in text
+
+
+def test_chrome_inside_a_form_wrapper_is_still_dropped():
+    html = (f"<body><form><header><p>Site tagline here</p></header><div>{ARTICLE}</div>"
+            f"<footer><p>Copyright 2024</p></footer></form></body>")
+    text = extract_text(html)
+    assert "cycling lanes" in text
+    assert "tagline" not in text and "Copyright" not in text
+
+
+def test_article_header_keeps_the_headline():
+    html = (f"<body><article><header><h1>Council backs cycle lanes</h1><p>By A. Reporter</p></header>"
+            f"{ARTICLE * 10}</article></body>")
+    text = extract_text(html)
+    assert text.splitlines()[0] == "Council backs cycle lanes"
+    assert "By A. Reporter" in text
+
+
+def test_search_form_inside_the_article_does_not_end_the_page_form():
+    html = (f"<body><form><header><p>Site tagline here</p></header><main><form><label>Search</label></form>"
+            f"{ARTICLE}</main><footer><p>Copyright 2024</p></footer></form></body>")
+    text = extract_text(html)
+    assert "Search" in text and "cycling lanes" in text
+    assert "Copyright" not in text
+
+
+def test_page_chrome_and_menus_are_dropped():
+    html = (f"<body><header><p>Site tagline here</p><nav>{MENU}</nav></header><div>{ARTICLE}</div>"
+            f"<aside>{MENU}</aside><div>{MENU}</div><form><p>Subscribe to our newsletter</p></form>"
+            f"<footer><p>Copyright 2024</p></footer><script>var tracking = 1;</script></body>")
+    text = extract_text(html)
+    assert "cycling lanes" in text
+    for chrome in ("tagline", "Section", "newsletter", "Copyright", "tracking"):
+        assert chrome not in text
+
+
+def test_marked_content_wins_over_the_rest():
+    html = f"<body><div><p>Unrelated teaser text.</p></div><main>{ARTICLE * 10}</main></body>"
+    assert "teaser" not in extract_text(html)
+
+
+def test_html_can_arrive_in_pieces():
+    html = f"<body><form><div>{ARTICLE}</div></form><p>Tail paragraph.</p></body>"
+    extractor = TextExtractor()
+    for start in range(0, len(html), 7):
+        extractor.feed(html[start:start + 7])
+    extractor.close()
+    assert extractor.text == extract_text(html)
@@ -0,0 +1,74 @@
+"""
+WindowRegistry on a fake desktop: when the snapshot is rebuilt, what the
+window events invalidate, and how lookups rank windows. Run with pytest.
+"""
+
+import time
+
+from services.window_registry import (EVENT_OBJECT_CREATE, EVENT_OBJECT_DESTROY, EVENT_OBJECT_HIDE,
+                                      EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_SHOW,
+                                      EVENT_SYSTEM_FOREGROUND, WATCHED_EVENTS, FakeWindowBackend, WindowRegistry,
+                                      first)
+
+DESKTOP = [(1, "Inbox - Google Chrome", "Chrome_WidgetWin_1", "chrome.exe", (0, 0, 800, 600)),
+           (2, "main.py - Visual Studio Code", "Chrome_WidgetWin_1", "code.exe", (100, 100, 1200, 900)),
+           (3, "Downloads", "CabinetWClass", "explorer.exe", (0, 0, 1920, 1080)),
+           (4, "Chromecast setup - Notepad", "Notepad", "notepad.exe", (50, 50, 400, 400))]
+
+
+def watched(event):
+    return any(low <= event <= high for low, high in WATCHED_EVENTS)
+
+
+def test_hook_skips_high_frequency_events():
+    for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_CREATE, EVENT_OBJECT_DESTROY, EVENT_OBJECT_SHOW,
+                  EVENT_OBJECT_HIDE):
+        assert watched(event)
+    assert not watched(EVENT_OBJECT_LOCATIONCHANGE)
+    assert not watched(EVENT_OBJECT_NAMECHANGE)
+
+
+def test_lookups_share_one_enumeration_within_ttl():
+    backend = FakeWindowBackend(DESKTOP)
+    registry = WindowRegistry(backend, ttl=0.1)
+    registry.find_title("chrome")
+    registry.by_process("code.exe")
+    registry.at(10, 10)
+    assert backend.calls == 1
+    time.sleep(0.15)
+    registry.windows()
+    assert backend.calls == 2
+
+
+def test_window_event_invalidates_the_snapshot():
+    backend = FakeWindowBackend(DESKTOP)
+    registry = WindowRegistry(backend, ttl=60.0, watch=True)
+    changes = []
+    registry.subscribe(lambda added, removed, retitled: changes.append(
+        ([w.hwnd for w in added], [w.hwnd for w in removed], [w.hwnd for w in retitled])))
+    assert registry.find_title("chrome")[0].hwnd == 1
+
+    backend.set_windows([(5, "New Tab - Google Chrome", "Chrome_WidgetWin_1", "chrome.exe", (0, 0, 1, 1)),
+                         (2, "app.py - Visual Studio Code", *DESKTOP[1][2:])] + DESKTOP[2:])
+    assert registry.find_title("chrome")[0].hwnd == 5
+    assert changes == [([5], [1], [2])]
+
+    registry.close()
+    backend.set_windows(DESKTOP)
+    assert registry.find_title("chrome")[0].hwnd == 5
+
+
+def test_whole_word_title_matches_rank_first():
+    registry = WindowRegistry(FakeWindowBackend(DESKTOP))
+    assert [w.hwnd for w in registry.find_title("chrome")] == [1, 4]
+    assert [w.hwnd for w in registry.find_title("Chromecast")] == [4]
+    assert registry.find_title("   ") == []
+
+
+def test_class_process_and_point_lookups():
+    registry = WindowRegistry(FakeWindowBackend(DESKTOP))
+    assert [w.hwnd for w in registry.by_class("Chrome_WidgetWin_1", "Notepad")] == [1, 2, 4]
+    assert [w.hwnd for w in registry.by_process("CODE.EXE")] == [2]
+    assert registry.at(1000, 800).hwnd == 2
+    assert registry.at(5000, 5000) is None
+    assert first(registry.by_process("explorer.exe"), registry.by_class("Notepad")).hwnd == 3